@@ -0,0 +1,87 @@
+"""
+Benchmarks encode time and output size of each GIF preset on reference clips.
+
+Reference clips are generated locally with ffmpeg's lavfi `testsrc2` source.
+Run from the project root:
+
+    python -m benchmarks.bench_gif_presets [--repeat 3] [--backend ffmpeg]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import ffmpeg
+
+from src.algorithms.video_to_gif_functions import video_to_gif
+from src.algorithms.video_to_gif_presets import GIF_PRESETS
+
+REFERENCE_CLIPS = {
+    "360p_5s": {"size": "640x360", "rate": 30, "duration": 5},
+    "720p_5s": {"size": "1280x720", "rate": 30, "duration": 5},
+}
+
+
+def make_reference_clip(output_path: Path, size: str, rate: int, duration: float):
+    source = ffmpeg.input(
+        f"testsrc2=size={size}:rate={rate}:duration={duration}", format="lavfi"
+    )
+    ffmpeg.run(
+        ffmpeg.output(source, str(output_path), vcodec="libx264", pix_fmt="yuv420p"),
+        overwrite_output=True,
+        quiet=True,
+    )
+
+
+def bench_preset(
+    clip_path: Path, output_path: Path, preset: str, repeat: int, backend: str
+) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        if not video_to_gif(
+            str(clip_path),
+            str(output_path),
+            duration=3,
+            fps=15,
+            resize_factor=0.5,
+            backend=backend,
+            preset=preset,
+        ):
+            raise RuntimeError(f"Conversion failed for preset '{preset}'")
+        timings.append(time.perf_counter() - start)
+    return {
+        "seconds": statistics.median(timings),
+        "bytes": output_path.stat().st_size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backend", default="ffmpeg")
+    args = parser.parse_args()
+
+    print(f"{'clip':<10} {'preset':<10} {'time (s)':>10} {'size (KB)':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for clip_name, clip in REFERENCE_CLIPS.items():
+            clip_path = Path(temp_dir) / f"{clip_name}.mp4"
+            make_reference_clip(clip_path, **clip)
+            for preset in GIF_PRESETS:
+                result = bench_preset(
+                    clip_path,
+                    Path(temp_dir) / f"{clip_name}_{preset}.gif",
+                    preset,
+                    args.repeat,
+                    args.backend,
+                )
+                print(
+                    f"{clip_name:<10} {preset:<10} {result['seconds']:>10.2f} "
+                    f"{result['bytes'] / 1024:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
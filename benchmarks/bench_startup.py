@@ -0,0 +1,69 @@
+"""
+Measures each tool's import time and memory, in a fresh interpreter per tool.
+
+Run from the project root:
+
+    python -m benchmarks.bench_startup
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Runs in src/, like main.py. Peak RSS is in KiB (Linux).
+_MEASURE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import taipy.gui.builder
+from pages import load_tool_pages
+load_tool_pages([tool for tool in sys.argv[1].split(",") if tool])
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def measure(tools: list[str]) -> dict:
+    """Imports the page registry and the given tools in a new process"""
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE, ",".join(tools)],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.parse_args()
+
+    sys.path.insert(0, str(SRC_DIR))
+    from pages import TOOLS
+
+    # Taipy itself is always loaded: tools are compared to this baseline
+    baseline = measure([])
+    print(f"{'tools':<20} {'seconds':>8} {'peak RSS (MiB)':>15}")
+    _print_row("none (Taipy only)", baseline, None)
+    for tools in [[tool] for tool in TOOLS] + [list(TOOLS)]:
+        name = tools[0] if len(tools) == 1 else "all"
+        _print_row(name, measure(tools), baseline)
+
+
+def _print_row(name: str, report: dict, baseline: dict | None):
+    seconds = f"{report['seconds']:.2f}"
+    rss = f"{report['rss_kib'] / 1024:.1f}"
+    if baseline is not None:
+        seconds = f"+{report['seconds'] - baseline['seconds']:.2f}"
+        rss = f"+{(report['rss_kib'] - baseline['rss_kib']) / 1024:.1f}"
+    print(f"{name:<20} {seconds:>8} {rss:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Times each stage of the GIF, QR code and UUID pipelines on synthetic inputs.
+
+Videos are generated locally with ffmpeg's lavfi `testsrc` source. Results are
+written as JSON, and can be compared to a baseline to flag regressions. Run from
+the project root:
+
+    python -m benchmarks.bench_suite --output baseline.json
+    python -m benchmarks.bench_suite --compare baseline.json [--threshold 0.2]
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+import ffmpeg
+
+from src.algorithms import video_to_gif_functions as gif
+from src.algorithms.gif_optimizer import optimize_gif
+from src.algorithms.qr_code_functions import create_qr_code
+from src.algorithms.uuid_bulk import BULK_UUID_TYPES, iter_uuid_batches
+from src.algorithms.video_to_gif_presets import DEFAULT_GIF_PRESET, get_preset
+
+LOGO_PATH = Path(__file__).parent.parent / "src" / "img" / "logo.png"
+
+VIDEO_CASES = {
+    "360p_2s_10fps": {"size": "640x360", "duration": 2, "fps": 10},
+    "360p_5s_24fps": {"size": "640x360", "duration": 5, "fps": 24},
+    "720p_2s_10fps": {"size": "1280x720", "duration": 2, "fps": 10},
+    "720p_5s_24fps": {"size": "1280x720", "duration": 5, "fps": 24},
+    "1080p_2s_10fps": {"size": "1920x1080", "duration": 2, "fps": 10},
+}
+QR_MESSAGE_LENGTHS = (10, 100, 500, 1000)
+UUID_BATCH_SIZE = 200_000
+# Slowdowns smaller than this are timer noise, whatever their ratio
+NOISE_SECONDS = 0.002
+
+
+def bench_video(clip_path: Path, output_path: Path, fps: int, repeat: int) -> dict:
+    """
+    Times the probe, palette and encode steps of the ffmpeg backend, and the
+    lossless optimization of the GIF
+    """
+    preset = get_preset(DEFAULT_GIF_PRESET)
+    optimized_path = output_path.with_suffix(".optimized.gif")
+    probe, palette, encode, optimize = [], [], [], []
+    for _ in range(repeat):
+        probe.append(_time(gif._get_clip_info, str(clip_path)))
+        start = time.perf_counter()
+        palette_path = gif._generate_palette(str(clip_path), 0, None, 0.5, preset)
+        palette.append(time.perf_counter() - start)
+        encode.append(
+            _time(
+                gif._create_gif,
+                str(clip_path),
+                str(output_path),
+                0,
+                None,
+                fps,
+                0.5,
+                palette_path,
+                preset,
+            )
+        )
+        palette_path.unlink()
+        optimize.append(_time(optimize_gif, str(output_path), str(optimized_path)))
+    return {
+        "probe": _summary(probe),
+        "palette": _summary(palette),
+        "encode": _summary(encode, bytes=output_path.stat().st_size),
+        "optimize": _summary(optimize, bytes=optimized_path.stat().st_size),
+    }
+
+
+def bench_qr(message: str, logo: bool, output_path: Path, repeat: int) -> dict:
+    """Times the rendering of the PNG in memory, then its write to disk"""
+    render, save = [], []
+    for _ in range(repeat):
+        buffer = io.BytesIO()
+        render.append(
+            _time(create_qr_code, message, buffer, LOGO_PATH if logo else None)
+        )
+        save.append(_time(output_path.write_bytes, buffer.getvalue()))
+    return {
+        "render": _summary(render, bytes=len(buffer.getvalue())),
+        "save": _summary(save),
+    }
+
+
+def bench_uuid(uuid_type: str, count: int, repeat: int) -> dict:
+    timings = [
+        _time(lambda: sum(1 for _ in iter_uuid_batches(uuid_type, count)))
+        for _ in range(repeat)
+    ]
+    return {"generate": _summary(timings, count=count)}
+
+
+def run_suite(repeat: int, quick: bool = False) -> dict:
+    results = {}
+    video_cases = dict(list(VIDEO_CASES.items())[:1]) if quick else VIDEO_CASES
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        for name, case in video_cases.items():
+            clip_path = temp_dir / f"{name}.mp4"
+            make_test_clip(clip_path, **case)
+            stages = bench_video(
+                clip_path, temp_dir / f"{name}.gif", case["fps"], repeat
+            )
+            _add_results(results, f"video/{name}", stages)
+        for length in QR_MESSAGE_LENGTHS:
+            for logo in (False, True):
+                stages = bench_qr("x" * length, logo, temp_dir / "qr.png", repeat)
+                name = f"qr/{length}_chars{'_logo' if logo else ''}"
+                _add_results(results, name, stages)
+    count = UUID_BATCH_SIZE // 10 if quick else UUID_BATCH_SIZE
+    for uuid_type in BULK_UUID_TYPES:
+        _add_results(
+            results, f"uuid/v{uuid_type}", bench_uuid(uuid_type, count, repeat)
+        )
+    return {
+        "meta": {
+            "date": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Stages more than `threshold` (0.2 is 20%) slower than in the baseline"""
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        ratio = result["seconds"] / previous["seconds"]
+        slowdown = result["seconds"] - previous["seconds"]
+        if ratio > 1 + threshold and slowdown > NOISE_SECONDS:
+            regressions.append(
+                f"{name}: {previous['seconds']:.4f} s -> {result['seconds']:.4f} s "
+                f"(+{ratio - 1:.0%})"
+            )
+    return regressions
+
+
+def make_test_clip(output_path: Path, size: str, duration: float, fps: int):
+    source = ffmpeg.input(
+        f"testsrc=size={size}:rate={fps}:duration={duration}", format="lavfi"
+    )
+    ffmpeg.run(
+        ffmpeg.output(source, str(output_path), vcodec="libx264", pix_fmt="yuv420p"),
+        overwrite_output=True,
+        quiet=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="Smallest cases only")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    current = run_suite(args.repeat, args.quick)
+    print(f"{'stage':<36} {'median (s)':>12} {'min (s)':>10}")
+    for name, result in current["results"].items():
+        print(f"{name:<36} {result['seconds']:>12.4f} {result['min']:>10.4f}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare_results(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regression over {args.threshold:.0%}", file=sys.stderr)
+
+
+def _time(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def _summary(timings: list[float], **extra) -> dict:
+    return {"seconds": statistics.median(timings), "min": min(timings), **extra}
+
+
+def _add_results(results: dict, prefix: str, stages: dict):
+    for stage, result in stages.items():
+        results[f"{prefix}/{stage}"] = result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Measures the throughput of bulk UUID generation, in UUIDs/second per version.
+
+Run from the project root:
+
+    python -m benchmarks.bench_uuid_bulk [--count 1000000]
+"""
+
+import argparse
+
+from src.algorithms.uuid_bulk import BULK_UUID_TYPES, measure_throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'version':<8} {'UUIDs/s':>12}")
+    for uuid_type in BULK_UUID_TYPES:
+        throughput = measure_throughput(uuid_type, args.count)
+        print(f"{uuid_type:<8} {throughput:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Simulates concurrent GUI sessions calling the tool callbacks, offline.
+
+Each session runs the real page callbacks in its own thread, with a FakeState in
+place of Taipy's State, and picks its next action from a weighted mix of tools.
+For each number of sessions, reports the latency percentiles and throughput of
+each callback, the CPU used (ffmpeg included) and the memory. Run from the
+project root:
+
+    python -m benchmarks.load_test --sessions 1,4,16 --mix uuid=10,qr=5,video=1
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from taipy.gui import Gui
+
+from benchmarks.bench_suite import make_test_clip
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Same defaults as the state variables in main.py
+INITIAL_STATE = {
+    "uuid_type": "4",
+    "selected_uuid": "",
+    "name_for_uuid": "",
+    "uuid_namespace": "DNS",
+    "custom_namespace": "",
+    "qr_code_input": "",
+    "transparent_background": False,
+    "dark_color": "black",
+    "light_color": "white",
+    "add_logo": True,
+    "qr_scale": 8,
+    "qr_border": 4,
+    "image_path": None,
+    "content": None,
+    "content_path": None,
+    "file_size": " - ",
+    "file_name": " - ",
+    "video_is_selected": False,
+    "start_time": 0,
+    "duration": 1,
+    "fps": 5,
+    "resize_factor": 0.5,
+    "gif_preset": "fast",
+    "gif_optimize": False,
+    "gif_tolerance": 0,
+    "video_duration": 0,
+    "gif_is_ready": False,
+    "content_download": None,
+    "gif_preview": None,
+    "video_width": 0,
+    "video_height": 0,
+    "keyframe": None,
+    "region_preview": None,
+    "crop_enabled": False,
+    "crop_x": 0,
+    "crop_y": 0,
+    "crop_width": 0,
+    "crop_height": 0,
+    "rotation": "0",
+    "clip_is_ready": False,
+}
+
+
+class FakeState:
+    """
+    Stands in for a Taipy State: holds the variables of one session, and
+    records the notifications instead of sending them to a browser
+    """
+
+    _gui = None  # Set to a Gui instance: Taipy's actions check its type
+
+    def __init__(self, session_id: str, variables: dict):
+        self.__dict__.update(variables)
+        self._session_id = session_id
+        self.notifications = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def _invoke_on_gui(self, method, *args):
+        if method.__name__ == "_get_client_id":
+            return self._session_id
+        if method.__name__ == "_notify":
+            self.notifications.append((args[0], args[1]))
+        return None
+
+
+def run_scenario(
+    sessions: int, actions: int, mix: dict, clip_path: Path, seed: int = 0
+) -> dict:
+    """Runs `actions` actions in each of `sessions` concurrent sessions"""
+    latencies = defaultdict(list)
+    rejected = defaultdict(int)
+    lock = threading.Lock()
+
+    def run_session(index: int):
+        rng = random.Random(seed + index)
+        state = FakeState(f"load-test-{index}", INITIAL_STATE)
+        for action in range(actions):
+            tool = rng.choices(list(mix), weights=list(mix.values()))[0]
+            for name, callback in _prepare_action(tool, state, clip_path, action, rng):
+                start = time.perf_counter()
+                callback(state)
+                elapsed = time.perf_counter() - start
+                busy = _pop_busy_notification(state)
+                with lock:
+                    if busy:
+                        rejected[name] += 1
+                    else:
+                        latencies[name].append(elapsed)
+                if busy:
+                    break
+        if state.video_is_selected:
+            release_video(state.content)
+        release_session(state._session_id)
+
+    usage_before = _cpu_seconds()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(run_session, range(sessions)))
+    wall = time.perf_counter() - start
+    cpu = _cpu_seconds() - usage_before
+    return {
+        "sessions": sessions,
+        "seconds": wall,
+        "cpu_percent": 100 * cpu / wall,
+        "rss_mib": _current_rss_mib(),
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "callbacks": {
+            name: _latency_summary(latencies[name], rejected[name], wall)
+            for name in sorted(set(latencies) | set(rejected))
+        },
+    }
+
+
+def _prepare_action(tool: str, state: FakeState, clip_path: Path, action, rng):
+    """The (name, callback) steps of one action, with their inputs set"""
+    if tool == "uuid":
+        state.uuid_type = rng.choice(["1", "4", "6", "7"])
+        return [("select_uuid", select_uuid)]
+    if tool == "qr":
+        state.qr_code_input = f"https://example.com/{rng.randbytes(24).hex()}"
+        return [("make_qr_code", make_qr_code)]
+    # A rejected conversion leaves its video selected, as in the app
+    if state.video_is_selected:
+        release_video(state.content)
+    # Each upload is a new file: select_video moves it to the upload store
+    upload_path = clip_path.with_name(f"{state._session_id}-{action}.mp4")
+    shutil.copyfile(clip_path, upload_path)
+    state.content = str(upload_path)
+    return [("select_video", select_video), ("convert_to_gif", convert_to_gif)]
+
+
+def _pop_busy_notification(state: FakeState) -> bool:
+    busy = any(message.startswith("Server busy") for _, message in state.notifications)
+    state.notifications.clear()
+    return busy
+
+
+def _latency_summary(latencies: list[float], rejected: int, wall: float) -> dict:
+    summary = {"calls": len(latencies), "rejected": rejected}
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        summary.update(p50=percentiles[49], p95=percentiles[94], p99=percentiles[98])
+    elif latencies:
+        summary.update(p50=latencies[0], p95=latencies[0], p99=latencies[0])
+    summary["per_second"] = len(latencies) / wall
+    return summary
+
+
+def _cpu_seconds() -> float:
+    """User and system time of this process and its finished children (ffmpeg)"""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _current_rss_mib() -> float:
+    resident_pages = int(Path("/proc/self/statm").read_text().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024**2
+
+
+def _parse_mix(text: str) -> dict:
+    mix = {}
+    for item in text.split(","):
+        tool, _, weight = item.partition("=")
+        if tool not in ("uuid", "qr", "video"):
+            raise argparse.ArgumentTypeError(
+                f"Unsupported tool: {tool}. Supported tools: uuid, qr, video"
+            )
+        mix[tool] = float(weight or 1)
+    return mix
+
+
+def _print_scenario(result: dict):
+    print(
+        f"\n{result['sessions']} sessions: {result['seconds']:.1f} s, "
+        f"CPU {result['cpu_percent']:.0f}%, RSS {result['rss_mib']:.0f} MiB "
+        f"(peak {result['peak_rss_mib']:.0f} MiB)"
+    )
+    print(
+        f"{'callback':<16} {'calls':>6} {'rejected':>9} {'per s':>7} "
+        f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}"
+    )
+    for name, summary in result["callbacks"].items():
+        percentiles = "".join(
+            f" {summary[p] * 1000:>9.1f}" if p in summary else f" {'-':>9}"
+            for p in ("p50", "p95", "p99")
+        )
+        print(
+            f"{name:<16} {summary['calls']:>6} {summary['rejected']:>9} "
+            f"{summary['per_second']:>7.1f}{percentiles}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", default="1,4,16", help="Comma-separated")
+    parser.add_argument("--actions", type=int, default=20, help="Per session")
+    parser.add_argument("--mix", type=_parse_mix, default="uuid=10,qr=5,video=1")
+    parser.add_argument(
+        "--no-admission",
+        action="store_true",
+        help="Disable admission control, to measure the raw capacity",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    # Callbacks use paths relative to src/, like main.py
+    os.chdir(SRC_DIR)
+    sys.path.insert(0, str(SRC_DIR))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ["TAIPY_TOOLS_STORE"] = str(Path(temp_dir) / "store.sqlite3")
+        _import_callbacks(args.no_admission)
+        FakeState._gui = Gui()
+        clip_path = Path(temp_dir) / "clip.mp4"
+        make_test_clip(clip_path, size="640x360", duration=2, fps=24)
+        results = []
+        for sessions in map(int, args.sessions.split(",")):
+            result = run_scenario(
+                sessions, args.actions, args.mix, clip_path, args.seed
+            )
+            _print_scenario(result)
+            results.append(result)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+def _import_callbacks(no_admission: bool):
+    # Imported from src/, like the app, once the shared store is set
+    global select_uuid, make_qr_code, select_video, convert_to_gif
+    global release_session, release_video
+    from algorithms.admission_control import admission
+    from algorithms.artifact_storage import release_session
+    from algorithms.video_ingest import release_video
+    from algorithms.video_to_gif_state_functions import convert_to_gif, select_video
+    from pages.qr_codes import make_qr_code
+    from pages.uuid_generator import select_uuid
+
+    # The package exports the decorator under its module's name
+    decorator_module = importlib.import_module("taipy_utilities.taipy_callback")
+    # Off-thread callbacks still run on their pool, but the session waits for
+    # their result: the latency covers the whole call
+    decorator_module.invoke_long_callback = _wait_long_callback
+    if no_admission:
+        admission.admit = lambda session, tool: nullcontext()
+
+
+def _wait_long_callback(state, function, args, status_function, status_args):
+    """Taipy's invoke_long_callback, without a browser to call back"""
+    status_function(state, True, *status_args, function(*args))
+
+
+if __name__ == "__main__":
+    main()
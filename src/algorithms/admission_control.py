@@ -0,0 +1,107 @@
+# Admission control for the GUI callbacks. Each session gets a token bucket per
+# tool, and the running callbacks of all sessions share a load budget, weighted
+# by what each tool costs. Work that doesn't fit is rejected with a "retry in
+# N s" hint instead of being queued.
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+TOOL_LIMITS = {
+    # cost: share of the load budget while running
+    # rate, burst: tokens per second and bucket size, for each session
+    # retry_after: typical duration, the hint when the load budget is used
+    "uuid": {"cost": 1, "rate": 2.0, "burst": 10, "retry_after": 1},
+    "uuid_bulk": {"cost": 4, "rate": 0.2, "burst": 2, "retry_after": 5},
+    "qr": {"cost": 2, "rate": 1.0, "burst": 5, "retry_after": 1},
+    "video": {"cost": 10, "rate": 0.1, "burst": 2, "retry_after": 10},
+}
+
+DEFAULT_MAX_LOAD = 40
+
+
+class ServerBusyError(Exception):
+    def __init__(self, retry_after: float):
+        self.retry_after = math.ceil(retry_after)
+        super().__init__(f"Server busy, retry in {self.retry_after} s")
+
+
+class TokenBucket:
+    """Allows `burst` calls at once, then `rate` calls per second"""
+
+    def __init__(self, rate: float, burst: int, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._clock = clock
+        self._updated_at = clock()
+
+    def take(self) -> float:
+        """Takes a token: returns 0, or the seconds to wait for the next one"""
+        now = self._clock()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Admits a session's call to a tool if its token bucket allows it and the
+    server load stays under `max_load`. A call is always admitted on an idle
+    server, even if it costs more than `max_load`
+    """
+
+    def __init__(self, max_load: int, clock=time.monotonic):
+        self.max_load = max_load
+        self.load = 0
+        self._clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def admit(self, session: str | None, tool: str):
+        """Runs the `with` block as an admitted call, or raises ServerBusyError"""
+        limits = get_tool_limits(tool)
+        with self._lock:
+            if self.load and self.load + limits["cost"] > self.max_load:
+                raise ServerBusyError(limits["retry_after"])
+            bucket = self._buckets.get((session, tool))
+            if bucket is None:
+                bucket = TokenBucket(limits["rate"], limits["burst"], self._clock)
+                self._buckets[(session, tool)] = bucket
+            wait = bucket.take()
+            if wait:
+                raise ServerBusyError(wait)
+            self.load += limits["cost"]
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.load -= limits["cost"]
+
+    def forget_session(self, session: str):
+        """Drops the token buckets of a session that ended"""
+        with self._lock:
+            for key in [key for key in self._buckets if key[0] == session]:
+                del self._buckets[key]
+
+
+admission = AdmissionController(
+    int(os.environ.get("TAIPY_TOOLS_MAX_LOAD", DEFAULT_MAX_LOAD))
+)
+
+
+def get_tool_limits(tool: str) -> dict:
+    try:
+        return TOOL_LIMITS[tool]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported tool: {tool}. Supported tools: {', '.join(TOOL_LIMITS)}"
+        ) from None
@@ -0,0 +1,241 @@
+# Lifecycle of the files the tools write for users to download. Each artifact is
+# recorded in the shared store with its owner session, size and creation time,
+# and is deleted when its session ends, when it's older than the TTL, or when the
+# artifacts take more than the quota (oldest first).
+#
+# Small artifacts (QR codes, short GIFs) skip the disk: they're kept in this
+# process's memory and served by the /api/artifacts route. That route must then
+# reach this process: with several workers, whichever one gets the request
+# answers it, so every artifact goes to disk.
+
+import mimetypes
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .shared_store import get_shared_store
+
+ARTIFACT_DIR = "./deposit_files/artifacts"
+DEFAULT_STORAGE_QUOTA = 2 * 1024**3
+DEFAULT_ARTIFACT_TTL = 60 * 60
+DEFAULT_EVICTION_INTERVAL = 60
+
+# Served by http_api's artifact_endpoint
+ARTIFACT_URL = "/api/artifacts/"
+MEMORY_ARTIFACT_MAX_SIZE = 1024**2
+DEFAULT_MEMORY_BUDGET = 64 * 1024**2
+
+_eviction_lock = threading.Lock()
+_eviction_thread = None
+
+
+class MemoryArtifacts:
+    """
+    Artifacts held in memory, up to `max_bytes` in total. When full, new
+    artifacts are refused (and go to disk) rather than evicting ones in use
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._artifacts = {}
+        self._lock = threading.Lock()
+
+    def put(self, name: str, data: bytes, owner: str | None) -> bool:
+        with self._lock:
+            if self.size + len(data) > self.max_bytes:
+                return False
+            self._artifacts[name] = (data, owner, time.time())
+            self.size += len(data)
+        return True
+
+    def get(self, name: str) -> bytes | None:
+        artifact = self._artifacts.get(name)
+        return None if artifact is None else artifact[0]
+
+    def owned_bytes(self, owner: str) -> int:
+        with self._lock:
+            return sum(
+                len(data)
+                for data, artifact_owner, _ in self._artifacts.values()
+                if artifact_owner == owner
+            )
+
+    def remove(
+        self, owner: str | None = None, created_before: float | None = None
+    ) -> int:
+        """Removes the artifacts of `owner`, or those created before a time"""
+        with self._lock:
+            names = [
+                name
+                for name, (_, artifact_owner, created_at) in self._artifacts.items()
+                if (owner is None or artifact_owner == owner)
+                and (created_before is None or created_at < created_before)
+            ]
+            for name in names:
+                self.size -= len(self._artifacts.pop(name)[0])
+        return len(names)
+
+
+def memory_budget() -> int:
+    """TAIPY_TOOLS_MEMORY_BUDGET, or 0 if WEB_CONCURRENCY runs several workers"""
+    if int(os.environ.get("WEB_CONCURRENCY", "1")) > 1:
+        return 0
+    return int(os.environ.get("TAIPY_TOOLS_MEMORY_BUDGET", DEFAULT_MEMORY_BUDGET))
+
+
+memory_artifacts = MemoryArtifacts(memory_budget())
+
+
+def save_artifact(data: bytes, suffix: str, owner: str | None = None) -> str:
+    """
+    Keeps a generated artifact, in memory if it's small enough, else on disk.
+
+    Returns:
+        str: An /api/artifacts URL or a file path, both usable by `tgb.image` and
+        `tgb.file_download`
+    """
+    if len(data) <= MEMORY_ARTIFACT_MAX_SIZE:
+        name = f"{_random_name()}{suffix}"
+        if memory_artifacts.put(name, data, owner):
+            return f"{ARTIFACT_URL}{name}"
+    path = new_artifact_path(suffix)
+    Path(path).write_bytes(data)
+    return track_artifact(path, owner)
+
+
+def keep_artifact(path: str, owner: str | None = None) -> str:
+    """Same as `save_artifact`, for an artifact already written to `path`"""
+    if Path(path).stat().st_size <= MEMORY_ARTIFACT_MAX_SIZE:
+        name = f"{_random_name()}{Path(path).suffix}"
+        if memory_artifacts.put(name, Path(path).read_bytes(), owner):
+            Path(path).unlink()
+            return f"{ARTIFACT_URL}{name}"
+    return track_artifact(path, owner)
+
+
+def get_memory_artifact(name: str) -> tuple[bytes, str] | None:
+    """The data and MIME type of an artifact kept in memory, if still there"""
+    data = memory_artifacts.get(name)
+    if data is None:
+        return None
+    mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    return data, mimetype
+
+
+def new_artifact_path(suffix: str, artifact_dir: str | None = None) -> str:
+    """
+    Returns a new, unique path for an artifact, in one of 256 subdirectories:
+    each one stays small enough to list quickly
+    """
+    name = _random_name()
+    shard = f"{artifact_dir or ARTIFACT_DIR}/{name[:2]}"
+    Path(shard).mkdir(parents=True, exist_ok=True)
+    return f"{shard}/{name}{suffix}"
+
+
+def track_artifact(path: str, owner: str | None = None) -> str:
+    """Records an artifact written to `path`, then enforces the storage quota"""
+    get_shared_store().add_artifact(path, owner, Path(path).stat().st_size)
+    enforce_quota(keep=path)
+    return path
+
+
+def release_session(owner: str) -> int:
+    """Deletes the artifacts of a session that ended"""
+    return reclaim_session(owner)["artifacts"]
+
+
+def reclaim_session(owner: str) -> dict:
+    """
+    Deletes the artifacts of a session, like `release_session`.
+
+    Returns:
+        dict: "artifacts" deleted, and the "memory_bytes" and "disk_bytes" freed
+    """
+    memory_bytes = memory_artifacts.owned_bytes(owner)
+    artifacts = get_shared_store().list_artifacts(owner=owner)
+    return {
+        "artifacts": memory_artifacts.remove(owner=owner) + _delete(artifacts),
+        "memory_bytes": memory_bytes,
+        "disk_bytes": sum(size for _, size in artifacts),
+    }
+
+
+def evict_expired(ttl: float | None = None) -> int:
+    """Deletes the artifacts older than `ttl` seconds (TAIPY_TOOLS_ARTIFACT_TTL)"""
+    if ttl is None:
+        ttl = _get_env_number("TAIPY_TOOLS_ARTIFACT_TTL", DEFAULT_ARTIFACT_TTL)
+    created_before = time.time() - ttl
+    removed = memory_artifacts.remove(created_before=created_before)
+    artifacts = get_shared_store().list_artifacts(created_before=created_before)
+    return removed + _delete(artifacts)
+
+
+def enforce_quota(quota: int | None = None, keep: str | None = None) -> int:
+    """
+    Deletes the oldest artifacts until they take at most `quota` bytes
+    (TAIPY_TOOLS_STORAGE_QUOTA). The `keep` artifact is never deleted
+    """
+    if quota is None:
+        quota = _get_env_number("TAIPY_TOOLS_STORAGE_QUOTA", DEFAULT_STORAGE_QUOTA)
+    store = get_shared_store()
+    excess = store.artifact_bytes() - quota
+    evicted = []
+    for path, size in store.list_artifacts():
+        if excess <= 0:
+            break
+        if path != keep:
+            evicted.append((path, size))
+            excess -= size
+    return _delete(evicted)
+
+
+def start_eviction(interval: float = DEFAULT_EVICTION_INTERVAL):
+    """
+    Evicts expired artifacts, and fails the jobs of workers that exited, every
+    `interval` seconds, in a daemon thread
+    """
+    global _eviction_thread
+    with _eviction_lock:
+        if _eviction_thread is None:
+            _eviction_thread = threading.Thread(
+                target=_evict_forever, args=(interval,), daemon=True
+            )
+            _eviction_thread.start()
+
+
+def _evict_forever(interval: float):
+    while True:
+        try:
+            evict_expired()
+            enforce_quota()
+            get_shared_store().fail_dead_jobs()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Artifact eviction failed: {e}")
+        time.sleep(interval)
+
+
+def _delete(artifacts: list[tuple[str, int]]) -> int:
+    paths = [path for path, _ in artifacts]
+    for path in paths:
+        Path(path).unlink(missing_ok=True)
+    get_shared_store().remove_artifacts(paths)
+    return len(paths)
+
+
+def _get_env_number(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number of bytes or seconds") from None
+
+
+def _random_name() -> str:
+    # Like a UUID4's hex, without loading uuid_utils for tools that don't use it
+    return os.urandom(16).hex()
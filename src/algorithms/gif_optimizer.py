@@ -0,0 +1,221 @@
+# Post-encoding optimizer for animated GIFs. Each frame is compared with what's
+# already displayed: only the bounding box of the changed pixels is stored, and
+# the unchanged pixels inside it become transparent, which LZW compresses into
+# long runs. Frames without changes are merged into the previous one.
+#
+# With a `tolerance`, pixels within that distance of the displayed color also
+# count as unchanged: a lossy mode that trades small color errors for size.
+# LZW itself is Pillow's encoder, run on each frame's rectangle.
+
+import io
+import struct
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+MAX_COLORS = 256
+# Graphic control extension "do not dispose": the next frame draws over this one
+_DISPOSAL_KEEP = 1
+
+
+def optimize_gif(
+    input_path: str, output_path: str | None = None, tolerance: int = 0
+) -> dict:
+    """
+    Rewrites a GIF with inter-frame transparency and frames cropped to their
+    changes. `tolerance` (0-255) is the largest color difference, per channel,
+    still treated as unchanged. The original is kept if it was smaller, or if
+    its frames don't fit a single 256-color palette.
+
+    Returns:
+        dict: "input_bytes", "output_bytes", "reduction" (a fraction of the
+        input size), "frames" kept, "merged_frames", "applied" (False if the
+        original was kept) and "seconds"
+    """
+    if not 0 <= tolerance <= 255:
+        raise ValueError(f"GIF optimizer tolerance must be 0-255, got {tolerance}")
+    start = time.perf_counter()
+    input_path = Path(input_path)
+    output_path = Path(output_path or input_path)
+    original = input_path.read_bytes()
+    with Image.open(input_path) as gif:
+        frames, merged = gif.n_frames, 0
+        optimized = original
+        if (palette := _global_palette(gif)) is not None:
+            optimized, frames, merged = _encode(gif, palette, tolerance)
+    applied = len(optimized) < len(original)
+    if not applied:
+        optimized, frames, merged = original, frames + merged, 0
+    if applied or output_path != input_path:
+        output_path.write_bytes(optimized)
+    return {
+        "input_bytes": len(original),
+        "output_bytes": len(optimized),
+        "reduction": 1 - len(optimized) / len(original),
+        "frames": frames,
+        "merged_frames": merged,
+        "applied": applied,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _global_palette(gif: Image.Image) -> np.ndarray | None:
+    """
+    The colors of every frame, as sorted 0xRRGGBB keys, or None if there are
+    more than a palette holds
+    """
+    colors = np.empty(0, dtype=np.uint32)
+    for frame in ImageSequence.Iterator(gif):
+        colors = np.union1d(colors, np.unique(_color_keys(_rgb(frame))))
+        if len(colors) > MAX_COLORS:
+            return None
+    return colors
+
+
+def _encode(
+    gif: Image.Image, palette: np.ndarray, tolerance: int
+) -> tuple[bytes, int, int]:
+    palette_rgb = np.stack(
+        [(palette >> 16) & 0xFF, (palette >> 8) & 0xFF, palette & 0xFF], axis=-1
+    ).astype(np.int16)
+    # Smallest color table with room for a transparent index: the fewer its
+    # colors, the shorter the LZW codes
+    table_size = min(MAX_COLORS, 2 ** max(1, len(palette).bit_length()))
+    # A global index left free is transparent in every frame
+    shared_transparency = len(palette) if len(palette) < table_size else None
+    frames = []  # [left, top, transparency, image data, duration] of each frame
+    canvas = None  # Palette indices on display once the previous frame is drawn
+    for frame in ImageSequence.Iterator(gif):
+        rgb = _rgb(frame)
+        indices = np.searchsorted(palette, _color_keys(rgb)).astype(np.uint8)
+        duration = frame.info.get("duration", 0)
+        if canvas is None:
+            canvas = indices
+            frames.append([0, 0, None, _lzw_data(indices, table_size), duration])
+            continue
+        difference = np.abs(rgb.astype(np.int16) - palette_rgb[canvas]).max(axis=-1)
+        changed = difference > tolerance
+        if not changed.any():
+            frames[-1][4] += duration
+            continue
+        rows = np.flatnonzero(changed.any(axis=1))
+        columns = np.flatnonzero(changed.any(axis=0))
+        box = (
+            slice(rows[0], rows[-1] + 1),
+            slice(columns[0], columns[-1] + 1),
+        )
+        canvas[changed] = indices[changed]
+        frames.append(
+            [
+                columns[0],
+                rows[0],
+                *_smallest_rectangle(
+                    canvas[box], changed[box], table_size, shared_transparency
+                ),
+                duration,
+            ]
+        )
+    output = [_header(gif, palette, table_size)]
+    for left, top, transparency, data, duration in frames:
+        height, width = data[1]
+        output.append(_frame(left, top, width, height, transparency, duration))
+        output.append(data[0])
+    output.append(b"\x3b")
+    return b"".join(output), len(frames), gif.n_frames - len(frames)
+
+
+def _smallest_rectangle(
+    rectangle: np.ndarray,
+    changed: np.ndarray,
+    table_size: int,
+    transparency: int | None,
+) -> tuple[int | None, tuple[bytes, tuple[int, int]]]:
+    """
+    Encodes a frame's rectangle as is, and with its unchanged pixels made
+    transparent: returns the smaller of the two
+    """
+    opaque = _lzw_data(rectangle, table_size)
+    if transparency is None:
+        # Every global index is a color: borrow one that the changes don't use
+        unused = np.setdiff1d(np.arange(table_size), rectangle[changed])
+        if not len(unused):
+            return None, opaque
+        transparency = int(unused[0])
+    transparent = _lzw_data(np.where(changed, rectangle, transparency), table_size)
+    if len(transparent[0]) < len(opaque[0]):
+        return transparency, transparent
+    return None, opaque
+
+
+def _lzw_data(indices: np.ndarray, table_size: int) -> tuple[bytes, tuple[int, int]]:
+    """LZW-compressed image data of palette indices, with their height and width"""
+    image = Image.fromarray(indices.astype(np.uint8), mode="P")
+    image.putpalette(bytes(3 * table_size))
+    encoded = io.BytesIO()
+    image.save(encoded, format="GIF", optimize=False, interlace=False)
+    return _image_data(encoded.getvalue()), indices.shape
+
+
+def _image_data(gif: bytes) -> bytes:
+    """The LZW minimum code size and data sub-blocks of a single-frame GIF"""
+    position = 13
+    if gif[10] & 0x80:  # Global color table
+        position += 3 << ((gif[10] & 0x07) + 1)
+    while gif[position] == 0x21:  # Extensions: label, then sub-blocks
+        position += 2
+        while gif[position]:
+            position += gif[position] + 1
+        position += 1
+    flags = gif[position + 9]
+    position += 10
+    if flags & 0x80:  # Local color table
+        position += 3 << ((flags & 0x07) + 1)
+    end = position + 1
+    while gif[end]:
+        end += gif[end] + 1
+    return gif[position : end + 1]
+
+
+def _header(gif: Image.Image, palette: np.ndarray, table_size: int) -> bytes:
+    colors = b"".join(int(color).to_bytes(3, "big") for color in palette)
+    colors = colors.ljust(3 * table_size, b"\x00")
+    # Global color table of 2 ** (n + 1) colors, 8 bits per primary color
+    flags = 0xF0 | (table_size.bit_length() - 2)
+    screen = struct.pack("<HHBBB", gif.width, gif.height, flags, 0, 0)
+    loop = gif.info.get("loop", 0)
+    application = b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00"
+    return b"GIF89a" + screen + colors + application
+
+
+def _frame(
+    left: int,
+    top: int,
+    width: int,
+    height: int,
+    transparency: int | None,
+    duration: int,
+) -> bytes:
+    flags = _DISPOSAL_KEEP << 2 | (transparency is not None)
+    control = struct.pack(
+        "<BBBBHBB",
+        0x21,
+        0xF9,
+        4,
+        flags,
+        round(duration / 10),
+        transparency or 0,
+        0,
+    )
+    descriptor = struct.pack("<BHHHHB", 0x2C, left, top, width, height, 0)
+    return control + descriptor
+
+
+def _rgb(frame: Image.Image) -> np.ndarray:
+    return np.asarray(frame.convert("RGB"))
+
+
+def _color_keys(rgb: np.ndarray) -> np.ndarray:
+    rgb = rgb.astype(np.uint32)
+    return rgb[..., 0] << 16 | rgb[..., 1] << 8 | rgb[..., 2]
@@ -0,0 +1,228 @@
+# REST endpoints for machine clients, mounted on the GUI's Flask server. They
+# call the algorithms directly, without a Taipy State, and return results in the
+# response body instead of writing them to deposit_files. The GUI also uses
+# /api/artifacts to serve the artifacts kept in memory.
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import threading
+import zipfile
+from pathlib import Path
+
+from flask import Blueprint, Response, abort, jsonify, request
+
+from .artifact_storage import get_memory_artifact
+from .shared_store import get_shared_store
+
+MAX_BATCH_SIZE = 1000
+MAX_QR_SCALE = 20
+MAX_QR_BORDER = 10
+LOGO_PATH = "./img/logo.png"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+# Set once the worker has built its pages and can serve the GUI
+_ready = threading.Event()
+# Name -> {"ok": bool, "detail": str}, run once by mark_ready
+_startup_checks = {}
+
+
+def mark_ready(require_ffmpeg: bool = True):
+    """Checks the ffmpeg binaries (for the video tool) and the logo, once"""
+    _startup_checks.update(run_startup_checks(require_ffmpeg))
+    _ready.set()
+
+
+def run_startup_checks(require_ffmpeg: bool = True) -> dict[str, dict]:
+    checks = {"logo": _check_png(LOGO_PATH)}
+    if require_ffmpeg:
+        checks["ffmpeg"] = _check_binary("ffmpeg")
+        checks["ffprobe"] = _check_binary("ffprobe")
+    return checks
+
+
+@api.errorhandler(ValueError)
+def _bad_request(error):
+    return jsonify(error=str(error)), 400
+
+
+@api.get("/health")
+def health_endpoint():
+    """200 when this worker is ready and the shared store is usable, else 503"""
+    store_ok = get_shared_store().ping()
+    ready = _ready.is_set() and store_ok
+    body = {
+        "status": "ok" if ready else "unavailable",
+        "ready": _ready.is_set(),
+        "shared_store": store_ok,
+        "pid": os.getpid(),
+    }
+    return jsonify(body), 200 if ready else 503
+
+
+@api.get("/ready")
+def ready_endpoint():
+    """200 when the health check passes and so did the startup checks, else 503"""
+    checks = {
+        **_startup_checks,
+        "shared_store": {"ok": get_shared_store().ping(), "detail": ""},
+    }
+    ready = _ready.is_set() and all(check["ok"] for check in checks.values())
+    body = {
+        "status": "ok" if ready else "unavailable",
+        "ready": _ready.is_set(),
+        "checks": checks,
+        "pid": os.getpid(),
+    }
+    return jsonify(body), 200 if ready else 503
+
+
+@api.get("/uuid")
+def uuid_endpoint():
+    """GET /api/uuid?type=7&count=10 (`name` and `namespace` for types 3 and 5)"""
+    # Loaded on first use, like the QR code functions: the UUID tool may be off
+    from .uuid_bulk import iter_uuid_batches
+    from .uuid_functions import get_uuid
+
+    uuid_type = request.args.get("type", "4")
+    count = _get_int(request.args, "count", 1, 1, MAX_BATCH_SIZE)
+    if count > 1:
+        # Name-based types are rejected here: use /api/uuid/names instead
+        return jsonify(uuids="".join(iter_uuid_batches(uuid_type, count)).split())
+    uuid = get_uuid(
+        uuid_type,
+        request.args.get("name", ""),
+        request.args.get("namespace", "DNS"),
+    )
+    return jsonify(uuids=[str(uuid)])
+
+
+@api.post("/uuid/names")
+def name_uuids_endpoint():
+    """POST {"type": "5", "namespace": "DNS", "names": [...]}: one UUID per name"""
+    from .uuid_names import hash_names
+
+    body = _get_json()
+    names = _get_list(body, "names")
+    uuids = hash_names(
+        str(body.get("type", "5")), body.get("namespace", "DNS"), map(str, names)
+    )
+    return jsonify(uuids=uuids)
+
+
+@api.post("/qr")
+def qr_endpoint():
+    """POST {"message": "...", <options>}: returns the QR code as PNG"""
+    body = _get_json()
+    png = _render_qr_code(str(body.get("message", "")), _get_qr_options(body))
+    return Response(png, mimetype="image/png")
+
+
+@api.post("/qr/batch")
+def qr_batch_endpoint():
+    """POST {"messages": [...], <options>}: returns a ZIP file with one PNG each"""
+    body = _get_json()
+    messages = _get_list(body, "messages")
+    options = _get_qr_options(body)
+    archive_buffer = io.BytesIO()
+    # PNGs are already compressed: store them as they are
+    with zipfile.ZipFile(archive_buffer, "w", compression=zipfile.ZIP_STORED) as zf:
+        for index, message in enumerate(messages, start=1):
+            zf.writestr(f"{index:04d}.png", _render_qr_code(str(message), options))
+    return Response(
+        archive_buffer.getvalue(),
+        mimetype="application/zip",
+        headers={"Content-Disposition": "attachment; filename=qr_codes.zip"},
+    )
+
+
+@api.get("/artifacts/<name>")
+def artifact_endpoint(name: str):
+    """An artifact kept in memory by this worker, for the GUI"""
+    artifact = get_memory_artifact(name)
+    if artifact is None:
+        abort(404)
+    data, mimetype = artifact
+    return Response(data, mimetype=mimetype)
+
+
+def _render_qr_code(message: str, options: dict) -> bytes:
+    from .qr_code_functions import render_qr_code  # Loads segno and PIL on first use
+
+    # Same message and options, same PNG: cached for every worker
+    key = hashlib.sha256(
+        json.dumps([message, options], sort_keys=True).encode()
+    ).hexdigest()
+    return get_shared_store().get_or_compute(
+        "qr", key, lambda: render_qr_code(message, **options)
+    )
+
+
+def _check_binary(name: str) -> dict:
+    path = shutil.which(name)
+    if path is None:
+        return {"ok": False, "detail": f"{name} not found in PATH"}
+    try:
+        result = subprocess.run(
+            [path, "-version"], capture_output=True, timeout=10, check=False
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return {"ok": False, "detail": f"{path}: {e}"}
+    if result.returncode:
+        return {"ok": False, "detail": f"{path} exited with {result.returncode}"}
+    # "ffmpeg version 6.1.1 Copyright (c) ..."
+    version = result.stdout.decode(errors="replace").split("\n")[0]
+    return {"ok": True, "detail": version}
+
+
+def _check_png(path: str) -> dict:
+    try:
+        with Path(path).open("rb") as image_file:
+            signature = image_file.read(len(PNG_SIGNATURE))
+    except OSError as e:
+        return {"ok": False, "detail": str(e)}
+    if signature != PNG_SIGNATURE:
+        return {"ok": False, "detail": f"{path} is not a PNG file"}
+    return {"ok": True, "detail": path}
+
+
+def _get_json() -> dict:
+    body = request.get_json(silent=True)
+    if isinstance(body, dict):
+        return body
+    raise ValueError("Request body must be a JSON object")
+
+
+def _get_list(body: dict, key: str) -> list:
+    values = body.get(key)
+    if not isinstance(values, list) or not values:
+        raise ValueError(f"'{key}' must be a non-empty list")
+    if len(values) > MAX_BATCH_SIZE:
+        raise ValueError(f"'{key}' can hold at most {MAX_BATCH_SIZE} items")
+    return values
+
+
+def _get_qr_options(body: dict) -> dict:
+    return {
+        "add_logo": bool(body.get("add_logo", False)),
+        "dark_color": str(body.get("dark_color", "black")),
+        "light_color": str(body.get("light_color", "white")),
+        "transparent_background": bool(body.get("transparent_background", False)),
+        "qr_scale": _get_int(body, "scale", 8, 1, MAX_QR_SCALE),
+        "qr_border": _get_int(body, "border", 4, 0, MAX_QR_BORDER),
+    }
+
+
+def _get_int(values, key: str, default: int, minimum: int, maximum: int) -> int:
+    try:
+        value = int(values.get(key, default))
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' must be an integer") from None
+    if not minimum <= value <= maximum:
+        raise ValueError(f"'{key}' must be between {minimum} and {maximum}")
+    return value
@@ -0,0 +1,148 @@
+# Operational metrics of a worker, for the admin page: callback latencies, cache
+# hit ratios, jobs, load, disk usage, its ffmpeg processes and the space freed
+# from idle sessions. Latencies, cache counts, load and freed space are those of
+# this worker. Jobs and artifacts come from the shared store, so they cover every
+# worker.
+
+import os
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+
+from .admission_control import admission
+from .artifact_storage import memory_artifacts
+from .shared_store import get_shared_store
+
+DEPOSIT_DIR = "./deposit_files"
+# Latency percentiles are computed over the last calls of each callback
+LATENCY_WINDOW = 1000
+FFMPEG_PROCESS_NAMES = ("ffmpeg", "ffprobe")
+
+_latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+_gauges = Counter()
+_lock = threading.Lock()
+
+
+def record_latency(callback: str, seconds: float):
+    with _lock:
+        _latencies[callback].append(seconds)
+
+
+def add_to_gauge(name: str, delta: int):
+    """Moves a gauge, such as the number of batch videos waiting, up or down"""
+    with _lock:
+        _gauges[name] += delta
+
+
+def latency_percentiles() -> dict[str, dict]:
+    """Calls, p50, p95 and p99 in seconds of each callback, over the last calls"""
+    with _lock:
+        latencies = {callback: list(calls) for callback, calls in _latencies.items()}
+    summaries = {}
+    for callback, calls in sorted(latencies.items()):
+        if len(calls) >= 2:
+            p50, p95, p99 = _percentiles(calls)
+        else:
+            p50 = p95 = p99 = calls[0]
+        summaries[callback] = {"calls": len(calls), "p50": p50, "p95": p95, "p99": p99}
+    return summaries
+
+
+def disk_usage(path: str | Path = DEPOSIT_DIR) -> int:
+    """Bytes used by the files under `path`"""
+    total = 0
+    for file_path in Path(path).rglob("*"):
+        try:
+            if file_path.is_file():
+                total += file_path.stat().st_size
+        except OSError:  # Deleted by the eviction thread in the meantime
+            continue
+    return total
+
+
+def ffmpeg_processes() -> list[dict]:
+    """
+    CPU and memory of each ffmpeg and ffprobe process that this worker started,
+    itself or from its process pools (Linux only)
+    """
+    proc = Path("/proc")
+    if not (proc / "uptime").exists():
+        return []
+    clock_ticks = os.sysconf("SC_CLK_TCK")
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    uptime = float((proc / "uptime").read_text().split()[0])
+    # PID -> (name, fields after the name) of every process on the host
+    stats = {}
+    for stat_path in proc.glob("[0-9]*/stat"):
+        try:
+            stat = stat_path.read_text()
+        except OSError:  # The process ended
+            continue
+        # The name is in parentheses, and may itself hold spaces or parentheses
+        name = stat[stat.index("(") + 1 : stat.rindex(")")]
+        stats[int(stat_path.parent.name)] = (name, stat[stat.rindex(")") + 2 :].split())
+    processes = []
+    for pid, (name, fields) in stats.items():
+        if name not in FFMPEG_PROCESS_NAMES or not _descends_from(
+            pid, os.getpid(), stats
+        ):
+            continue
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / clock_ticks
+        age = uptime - int(fields[19]) / clock_ticks
+        processes.append(
+            {
+                "pid": pid,
+                "parent_pid": int(fields[1]),
+                "name": name,
+                "seconds": age,
+                "cpu_percent": 100 * cpu_seconds / age if age > 0 else 0.0,
+                "rss_mib": int(fields[21]) * page_size / 1024**2,
+            }
+        )
+    return processes
+
+
+def collect_metrics(sessions: int | None = None) -> dict:
+    """Every metric of this worker, `sessions` being its number of GUI sessions"""
+    store = get_shared_store()
+    with _lock:
+        gauges = dict(_gauges)
+    return {
+        "pid": os.getpid(),
+        "collected_at": time.time(),
+        "sessions": sessions,
+        "load": admission.load,
+        "max_load": admission.max_load,
+        "running_jobs": store.count_running_jobs(),
+        "batch_videos_waiting": gauges.get("batch_videos_waiting", 0),
+        "callbacks": latency_percentiles(),
+        "caches": store.cache_hit_ratios(),
+        "disk": {
+            "deposit_files": disk_usage(),
+            "artifacts": store.artifact_bytes(),
+            "memory_artifacts": memory_artifacts.size,
+        },
+        "ffmpeg": ffmpeg_processes(),
+        # Idle and ended sessions whose uploads and artifacts were deleted
+        "freed_sessions": {
+            "sessions": gauges.get("freed_sessions", 0),
+            "memory_bytes": gauges.get("freed_memory_bytes", 0),
+            "disk_bytes": gauges.get("freed_disk_bytes", 0),
+        },
+    }
+
+
+def _percentiles(calls: list[float]) -> tuple[float, float, float]:
+    percentiles = statistics.quantiles(calls, n=100, method="inclusive")
+    return percentiles[49], percentiles[94], percentiles[98]
+
+
+def _descends_from(pid: int, ancestor: int, stats: dict) -> bool:
+    # Follows the parent PIDs up to init, whose parent (0) has no stat
+    while pid in stats:
+        pid = int(stats[pid][1][1])
+        if pid == ancestor:
+            return True
+    return False
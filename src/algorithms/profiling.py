@@ -0,0 +1,149 @@
+# On-demand profiling of the GUI callbacks. Once enabled, for a sampled fraction
+# of calls or for named callbacks, a call runs under cProfile and tracemalloc.
+# Its stats are written to deposit_files/profiles: a .prof file for pstats or
+# snakeviz, and a .txt summary with the slowest functions and top allocations.
+# While disabled, callbacks only read the `enabled` flag.
+
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_DIR = "./deposit_files/profiles"
+# Older profiles are deleted past this number
+MAX_PROFILES = 100
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 5
+
+enabled = False
+_sample_rate = 0.0
+_callbacks = frozenset()
+_profile_dir = PROFILE_DIR
+# cProfile and tracemalloc are process-wide: one profiled call at a time
+_profile_lock = threading.Lock()
+
+
+def enable_profiling(
+    sample_rate: float = 0.0,
+    callbacks: list[str] | tuple[str, ...] = (),
+    profile_dir: str | Path | None = None,
+):
+    """Profiles a `sample_rate` fraction of all calls, and every call of `callbacks`"""
+    global enabled, _sample_rate, _callbacks, _profile_dir
+    if not 0 <= sample_rate <= 1:
+        raise ValueError(f"Sample rate must be between 0 and 1, not {sample_rate}")
+    _sample_rate = sample_rate
+    _callbacks = frozenset(callbacks)
+    _profile_dir = str(profile_dir or PROFILE_DIR)
+    enabled = bool(_sample_rate or _callbacks)
+
+
+def disable_profiling():
+    global enabled
+    enabled = False
+
+
+def get_profiling_settings() -> dict:
+    return {
+        "enabled": enabled,
+        "sample_rate": _sample_rate,
+        "callbacks": sorted(_callbacks),
+        "profile_dir": _profile_dir,
+    }
+
+
+def should_profile(callback: str) -> bool:
+    return enabled and (callback in _callbacks or random.random() < _sample_rate)
+
+
+@contextmanager
+def profile(callback: str):
+    """
+    Runs the `with` block under cProfile and tracemalloc, then writes its stats.
+    If another call is being profiled, the block runs without profiling
+    """
+    if not _profile_lock.acquire(blocking=False):
+        yield None
+        return
+    try:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            seconds = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if not was_tracing:
+                tracemalloc.stop()
+            _write_profile(callback, profiler, seconds, peak, before, after)
+    finally:
+        _profile_lock.release()
+
+
+def list_profiles(profile_dir: str | Path | None = None) -> list[Path]:
+    """Profile summaries, oldest first"""
+    return sorted(Path(profile_dir or _profile_dir).glob("*.txt"))
+
+
+def _write_profile(callback, profiler, seconds, peak, before, after) -> Path:
+    profile_dir = Path(_profile_dir)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    # Timestamp first, to the millisecond, so that names sort by age
+    now = time.time()
+    milliseconds = int(now * 1000) % 1000
+    stem = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{milliseconds:03d}"
+    stem += f"-{callback}-{os.getpid()}-{os.urandom(2).hex()}"
+    profiler.dump_stats(profile_dir / f"{stem}.prof")
+
+    functions = io.StringIO()
+    stats = pstats.Stats(profiler, stream=functions)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+    allocations = after.filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    ).compare_to(before, "lineno")
+    lines = [
+        f"Callback: {callback}",
+        f"Duration: {seconds:.3f} s",
+        f"Peak traced memory: {peak / 1024**2:.1f} MiB",
+        "",
+        f"Top {TOP_ALLOCATIONS} allocations of the call still held at its end:",
+        *(str(allocation) for allocation in allocations[:TOP_ALLOCATIONS]),
+        "",
+        functions.getvalue(),
+    ]
+    summary_path = profile_dir / f"{stem}.txt"
+    summary_path.write_text("\n".join(lines), encoding="utf-8")
+    _delete_old_profiles(profile_dir)
+    return summary_path
+
+
+def _delete_old_profiles(profile_dir: Path):
+    for summary_path in list_profiles(profile_dir)[:-MAX_PROFILES]:
+        summary_path.unlink(missing_ok=True)
+        summary_path.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def _enable_from_environment():
+    sample_rate = float(os.environ.get("TAIPY_TOOLS_PROFILE_RATE", "0"))
+    callbacks = os.environ.get("TAIPY_TOOLS_PROFILE_CALLBACKS", "")
+    enable_profiling(
+        sample_rate, [name.strip() for name in callbacks.split(",") if name.strip()]
+    )
+
+
+_enable_from_environment()
@@ -1,9 +1,12 @@
+import io
+from functools import lru_cache
 from pathlib import Path
 
 import segno
-import uuid_utils as uuid
 from PIL import Image
 
+from .artifact_storage import save_artifact
+
 
 def generate_qr_code(
     message: str,
@@ -13,29 +16,49 @@ def generate_qr_code(
     transparent_background: bool,
     qr_scale: int,
     qr_border: int,
+    owner: str | None = None,
 ) -> str:
-    """Pure business logic - raises standard exceptions"""
-    if len(message) > 1500:
-        raise ValueError("Text too long")  # Standard Python!
+    """
+    Pure business logic - raises standard exceptions
 
-    if not message.strip():
-        raise ValueError("Message cannot be empty")  # Standard Python!
+    Returns:
+        str: The artifact URL, or its file path if it didn't fit in memory
+    """
+    png = render_qr_code(
+        message,
+        add_logo=add_logo,
+        dark_color=dark_color,
+        light_color=light_color,
+        transparent_background=transparent_background,
+        qr_scale=qr_scale,
+        qr_border=qr_border,
+    )
+    return save_artifact(png, ".png", owner)
 
-    file_output_name = f"./deposit_files/{uuid.uuid4()}.png"
-    image_path = "./img/logo.png" if add_logo else None
 
+def render_qr_code(
+    message: str,
+    add_logo: bool = False,
+    dark_color: str = "black",
+    light_color: str = "white",
+    transparent_background: bool = False,
+    qr_scale: int = 8,
+    qr_border: int = 4,
+) -> bytes:
+    """Same as `generate_qr_code`, but returns the PNG bytes instead of a file"""
+    _validate_message(message)
+    output = io.BytesIO()
     create_qr_code(
         data=message,
-        output_path=file_output_name,
-        center_image_path=image_path,
+        output_path=output,
+        center_image_path="./img/logo.png" if add_logo else None,
         dark_color=dark_color,
         light_color=light_color,
         transparent_background=transparent_background,
         scale=qr_scale,
         border=qr_border,
     )
-
-    return file_output_name
+    return output.getvalue()
 
 
 def create_qr_code(
@@ -53,7 +76,8 @@ def create_qr_code(
 
     Args:
         data (str): The text/data to encode in the QR code
-        output_path (str): Path where the QR code image will be saved
+        output_path (str | BinaryIO): Path or binary file object where the PNG
+            image will be saved
         center_image_path (str, optional): Path to image to place in center of QR code
         dark_color (str): Color for dark areas (default: "black")
         light_color (str): Color for light areas (default: "white")
@@ -63,7 +87,7 @@ def create_qr_code(
         border (int): Border size around QR code (default: 4)
 
     Returns:
-        str: Path to the generated QR code image
+        str | BinaryIO: `output_path`
     """
     qr = segno.make(data, error="H")
 
@@ -79,49 +103,58 @@ def create_qr_code(
         )
         return output_path
 
-    temp_path = Path("temp_qr.png")
-    try:
-        _save_qr_to_temp(
-            qr,
-            temp_path,
-            scale,
-            border,
-            dark_color,
-            transparent_background,
-            light_color,
-        )
+    # Compose in memory: no temporary file shared between concurrent calls
+    qr_buffer = io.BytesIO()
+    _save_qr_direct(
+        qr,
+        qr_buffer,
+        scale,
+        border,
+        dark_color,
+        transparent_background,
+        light_color,
+    )
 
-        qr_img = Image.open(temp_path)
-        center_img = _prepare_center_image(
-            center_image_path,
-            qr_img.size,
-        )
+    qr_img = Image.open(qr_buffer)
+    center_img = _prepare_center_image(
+        center_image_path,
+        qr_img.size,
+    )
 
-        final_img = _add_center_image(qr_img, center_img)
-        final_img.save(output_path)
-    finally:
-        _cleanup_temp_file(temp_path)
+    final_img = _add_center_image(qr_img, center_img)
+    final_img.save(output_path, format="PNG")
     return output_path
 
 
-def _save_qr_direct(
-    qr, output_path, scale, border, dark_color, transparent_background, light_color
-):
-    """Save QR code directly without temp file."""
-    background = None if transparent_background else light_color
-    qr.save(output_path, scale=scale, border=border, dark=dark_color, light=background)
+def _validate_message(message: str):
+    if len(message) > 1500:
+        raise ValueError("Text too long")  # Standard Python!
+
+    if not message.strip():
+        raise ValueError("Message cannot be empty")  # Standard Python!
 
 
-def _save_qr_to_temp(
-    qr, temp_path, scale, border, dark_color, transparent_background, light_color
+def _save_qr_direct(
+    qr, output_path, scale, border, dark_color, transparent_background, light_color
 ):
-    """Save QR code to temporary file."""
+    """Save QR code as PNG to a path or a binary file object."""
     background = None if transparent_background else light_color
-    qr.save(temp_path, scale=scale, border=border, dark=dark_color, light=background)
+    qr.save(
+        output_path,
+        kind="png",
+        scale=scale,
+        border=border,
+        dark=dark_color,
+        light=background,
+    )
 
 
+@lru_cache(maxsize=32)
 def _prepare_center_image(center_image_path, qr_size):
-    """Prepare center image with proper sizing, preserving original colors."""
+    """Prepare center image with proper sizing, preserving original colors.
+
+    Cached: the logo is read and resized once for each QR code size.
+    """
     center_img = Image.open(center_image_path)
     if center_img.mode != "RGBA":
         center_img = center_img.convert("RGBA")
@@ -156,9 +189,3 @@ def _calculate_center_position(qr_size, center_size):
 
 def _center(outer_dimension, inner_dimension):
     return (outer_dimension - inner_dimension) // 2
-
-
-def _cleanup_temp_file(temp_path):
-    """Clean up temporary file."""
-    if temp_path.exists():
-        temp_path.unlink()
@@ -0,0 +1,124 @@
+# Activity of this worker's GUI sessions: when each one last acted, and the
+# uploads it holds. Sessions idle for longer than TAIPY_TOOLS_SESSION_IDLE_TIMEOUT
+# have their uploads and artifacts freed by the reaper (see
+# taipy_utilities/session_reaper.py), like sessions that ended.
+
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from .artifact_storage import reclaim_session
+from .metrics import add_to_gauge
+
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+
+class SessionActivity:
+    """
+    Tracks the last activity of each session. A session with a call in progress
+    is never idle, however long the call takes
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._last_seen = {}
+        self._running = Counter()
+        self._uploads = {}
+        self._lock = threading.Lock()
+
+    def touch(self, session: str | None):
+        if session is None:
+            return
+        with self._lock:
+            self._last_seen[session] = self._clock()
+
+    @contextmanager
+    def running(self, session: str | None):
+        """Marks the `with` block as a call of `session` in progress"""
+        self.touch(session)
+        with self._lock:
+            self._running[session] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._running[session] -= 1
+                if not self._running[session]:
+                    del self._running[session]
+            self.touch(session)
+
+    def add_upload(self, session: str | None, path: str | Path):
+        """Records an upload of `session`, to release if it goes idle or ends"""
+        if session is None:
+            return
+        with self._lock:
+            self._last_seen[session] = self._clock()
+            self._uploads.setdefault(session, set()).add(str(path))
+
+    def remove_upload(self, session: str | None, path: str | Path):
+        """Stops tracking an upload that the session released itself"""
+        with self._lock:
+            self._uploads.get(session, set()).discard(str(path))
+
+    def idle_sessions(self, idle_timeout: float) -> list[str]:
+        """Sessions without activity for `idle_timeout` seconds, nor calls running"""
+        idle_since = self._clock() - idle_timeout
+        with self._lock:
+            return [
+                session
+                for session, last_seen in self._last_seen.items()
+                if last_seen < idle_since and session not in self._running
+            ]
+
+    def forget(self, session: str) -> list[str]:
+        """Stops tracking a session: returns the uploads it still held"""
+        with self._lock:
+            self._last_seen.pop(session, None)
+            return sorted(self._uploads.pop(session, ()))
+
+
+activity = SessionActivity()
+
+
+def free_session(session: str, other_uploads: tuple[str, ...] = ()) -> dict:
+    """
+    Deletes the uploads and artifacts of an idle or ended session, and the
+    `other_uploads`, such as name lists, that weren't ingested as videos.
+
+    Returns:
+        dict: "uploads" and "artifacts" deleted, and the "memory_bytes" and
+        "disk_bytes" they freed
+    """
+    freed = reclaim_session(session)
+    uploads = activity.forget(session)
+    if uploads:
+        # Only the video tool records uploads: other tools never load it
+        from .video_ingest import release_video
+
+        freed["disk_bytes"] += sum(release_video(path) for path in uploads)
+    other_paths = [Path(path) for path in other_uploads if Path(path).is_file()]
+    for path in other_paths:
+        freed["disk_bytes"] += path.stat().st_size
+        path.unlink()
+    freed["uploads"] = len(uploads) + len(other_paths)
+    if uploads or freed["artifacts"]:
+        add_to_gauge("freed_sessions", 1)
+        add_to_gauge("freed_memory_bytes", freed["memory_bytes"])
+        add_to_gauge("freed_disk_bytes", freed["disk_bytes"])
+    return freed
+
+
+def get_idle_timeout() -> float:
+    """Seconds without activity before a session is freed"""
+    value = os.environ.get("TAIPY_TOOLS_SESSION_IDLE_TIMEOUT")
+    if value is None:
+        return DEFAULT_IDLE_TIMEOUT
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(
+            "TAIPY_TOOLS_SESSION_IDLE_TIMEOUT must be a number of seconds"
+        ) from None
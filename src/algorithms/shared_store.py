@@ -0,0 +1,265 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+
+SHARED_STORE_PATH = "./deposit_files/shared_store.sqlite3"
+DEFAULT_CACHE_TTL = 24 * 60 * 60
+# Error of the jobs whose worker exited before finishing them
+DEAD_WORKER_ERROR = "The worker running this job exited."
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    pid INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    host TEXT
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    owner TEXT,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_by_owner ON artifacts (owner);
+CREATE INDEX IF NOT EXISTS artifacts_by_age ON artifacts (created_at);
+"""
+
+
+class SharedStore:
+    """
+    Cache, job and artifact tables in a SQLite file, shared by every server worker.
+
+    Each thread of each process gets its own connection. WAL mode lets workers
+    read while another one writes.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        # Hits and misses of this process, by (namespace, "hits" or "misses")
+        self._cache_counts = Counter()
+        self._counts_lock = threading.Lock()
+        with self._connect() as connection:
+            connection.executescript(_SCHEMA)
+            # Stores created before jobs recorded their host
+            connection.execute("BEGIN IMMEDIATE")
+            columns = connection.execute("PRAGMA table_info(jobs)").fetchall()
+            if "host" not in (column[1] for column in columns):
+                connection.execute("ALTER TABLE jobs ADD COLUMN host TEXT")
+
+    def cache_get(self, namespace: str, key: str) -> bytes | None:
+        row = self._connect().execute(
+            "SELECT value FROM cache "
+            "WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (namespace, key, time.time()),
+        )
+        value = row.fetchone()
+        with self._counts_lock:
+            self._cache_counts[namespace, "misses" if value is None else "hits"] += 1
+        return None if value is None else value[0]
+
+    def cache_set(
+        self, namespace: str, key: str, value: bytes, ttl: float = DEFAULT_CACHE_TTL
+    ):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (namespace, key, value, time.time() + ttl),
+            )
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], bytes],
+        ttl: float = DEFAULT_CACHE_TTL,
+    ) -> bytes:
+        """Returns the cached value, or computes and caches it"""
+        value = self.cache_get(namespace, key)
+        if value is None:
+            value = compute()
+            self.cache_set(namespace, key, value, ttl)
+        return value
+
+    def cache_hit_ratios(self) -> dict[str, dict]:
+        """Hits, misses and hit ratio of each namespace, in this process"""
+        with self._counts_lock:
+            counts = dict(self._cache_counts)
+        ratios = {}
+        for namespace in sorted({namespace for namespace, _ in counts}):
+            hits = counts.get((namespace, "hits"), 0)
+            misses = counts.get((namespace, "misses"), 0)
+            ratios[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "ratio": hits / (hits + misses),
+            }
+        return ratios
+
+    def purge_expired(self) -> int:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "DELETE FROM cache WHERE expires_at <= ?", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def start_job(self, kind: str, description: str = "") -> str:
+        # Not uuid_utils: its random generator repeats in forked workers
+        job_id = str(uuid.uuid4())
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO jobs "
+                "(id, kind, description, status, pid, started_at, host) "
+                "VALUES (?, ?, ?, 'running', ?, ?, ?)",
+                (job_id, kind, description, os.getpid(), time.time(), _HOST),
+            )
+        return job_id
+
+    def finish_job(self, job_id: str, error: str | None = None):
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                ("failed" if error else "done", error, time.time(), job_id),
+            )
+
+    def fail_dead_jobs(self) -> int:
+        """
+        Fails the running jobs of this host whose process exited: returns how
+        many. Other hosts' jobs are left to them. Linux only, since it reads /proc.
+        """
+        if not Path("/proc/uptime").exists():
+            return 0
+        rows = self._connect().execute(
+            "SELECT id, pid, started_at FROM jobs "
+            "WHERE status = 'running' AND host = ?",
+            (_HOST,),
+        )
+        dead = [
+            job_id
+            for job_id, pid, started_at in rows.fetchall()
+            if not _started_before(pid, started_at)
+        ]
+        with self._connect() as connection:
+            connection.executemany(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                ((DEAD_WORKER_ERROR, time.time(), job_id) for job_id in dead),
+            )
+        return len(dead)
+
+    def count_jobs(self) -> dict[str, int]:
+        """Number of jobs for each status, across all workers"""
+        rows = self._connect().execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+        )
+        return dict(rows.fetchall())
+
+    def count_running_jobs(self) -> dict[str, int]:
+        """Number of running jobs of each kind, across all workers"""
+        rows = self._connect().execute(
+            "SELECT kind, COUNT(*) FROM jobs WHERE status = 'running' GROUP BY kind"
+        )
+        return dict(rows.fetchall())
+
+    def add_artifact(self, path: str, owner: str | None, size: int):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?)",
+                (path, owner, size, time.time()),
+            )
+
+    def list_artifacts(
+        self, owner: str | None = None, created_before: float | None = None
+    ) -> list[tuple[str, int]]:
+        """(path, size) of the matching artifacts, oldest first"""
+        query = "SELECT path, size FROM artifacts WHERE 1"
+        parameters = []
+        if owner is not None:
+            query += " AND owner = ?"
+            parameters.append(owner)
+        if created_before is not None:
+            query += " AND created_at < ?"
+            parameters.append(created_before)
+        rows = self._connect().execute(query + " ORDER BY created_at", parameters)
+        return rows.fetchall()
+
+    def artifact_bytes(self) -> int:
+        row = self._connect().execute("SELECT COALESCE(SUM(size), 0) FROM artifacts")
+        return row.fetchone()[0]
+
+    def remove_artifacts(self, paths: list[str]):
+        with self._connect() as connection:
+            connection.executemany(
+                "DELETE FROM artifacts WHERE path = ?", ((path,) for path in paths)
+            )
+
+    def ping(self) -> bool:
+        """Checks that the store can be read and written"""
+        try:
+            with self._connect() as connection:
+                connection.execute("SELECT COUNT(*) FROM jobs").fetchone()
+                connection.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections can't be shared with forked processes or other threads
+        if getattr(self._local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+# Jobs are failed only by the host whose process IDs they record
+_HOST = socket.gethostname()
+
+
+def get_shared_store() -> SharedStore:
+    """The store at TAIPY_TOOLS_STORE, or at deposit_files/shared_store.sqlite3"""
+    path = os.environ.get("TAIPY_TOOLS_STORE", SHARED_STORE_PATH)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = SharedStore(path)
+        return _stores[path]
+
+
+def _started_before(pid: int, timestamp: float) -> bool:
+    """
+    Whether process `pid` runs and already ran at `timestamp`: a process that
+    started later only reused the PID
+    """
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+        uptime = float(Path("/proc/uptime").read_text().split()[0])
+    except OSError:
+        return False
+    # Fields after the command name, which may contain spaces: starttime is 22nd
+    start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+    started_at = time.time() - uptime + start_ticks / os.sysconf("SC_CLK_TCK")
+    # Both clocks are read to the hundredth of a second
+    return started_at <= timestamp + 1
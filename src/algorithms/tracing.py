@@ -0,0 +1,116 @@
+# Structured tracing of the video pipeline. Each step runs in a span that records
+# its duration, its attributes (sizes, frames, ffmpeg exit status...) and whether
+# it failed. Finished spans go to a sink: an in-memory ring buffer by default, or
+# a JSON lines file set with TAIPY_TOOLS_TRACE_FILE.
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+DEFAULT_RING_BUFFER_SIZE = 1000
+
+
+class RingBufferSink:
+    """Keeps the last `size` spans in memory"""
+
+    def __init__(self, size: int = DEFAULT_RING_BUFFER_SIZE):
+        self.spans = deque(maxlen=size)
+
+    def emit(self, span: dict):
+        self.spans.append(span)
+
+    def get_trace(self, trace_id: str) -> list[dict]:
+        return [span for span in self.spans if span["trace_id"] == trace_id]
+
+
+class JsonLinesSink:
+    """Appends each span to a file, as one JSON object per line"""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def emit(self, span: dict):
+        line = json.dumps(span, default=str) + "\n"
+        with self._lock, self.path.open("a", encoding="utf-8") as trace_file:
+            trace_file.write(line)
+
+
+class Span:
+    def __init__(self, name: str, parent: "Span | None", attributes: dict):
+        self.name = name
+        # os.urandom rather than uuid_utils: IDs must differ in forked workers
+        self.trace_id = parent.trace_id if parent else os.urandom(8).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, error: str):
+        """Marks the span as failed, for errors handled without raising"""
+        self.error = error
+
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_sink = None
+_sink_lock = threading.Lock()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Runs the `with` block in a new span, child of the current one"""
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.fail(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        get_sink().emit(
+            {
+                "trace_id": current.trace_id,
+                "span_id": current.span_id,
+                "parent_id": current.parent_id,
+                "name": name,
+                "started_at": started_at,
+                "duration_ms": (time.perf_counter() - start) * 1000,
+                "status": "error" if current.error else "ok",
+                "error": current.error,
+                "pid": os.getpid(),
+                "attributes": current.attributes,
+            }
+        )
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def get_sink():
+    """The sink set with `set_sink`, else the one configured by the environment"""
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            trace_file = os.environ.get("TAIPY_TOOLS_TRACE_FILE")
+            _sink = JsonLinesSink(trace_file) if trace_file else RingBufferSink()
+        return _sink
+
+
+def set_sink(sink):
+    """Sends the next spans to `sink`: any object with an `emit(span)` method"""
+    global _sink
+    with _sink_lock:
+        _sink = sink
@@ -0,0 +1,89 @@
+import time
+from collections.abc import Callable, Iterator
+from itertools import repeat
+from pathlib import Path
+
+import uuid_utils as uuid
+
+from .uuid_monotonic import uuid6_batch, uuid7_batch
+
+BULK_UUID_TYPES = ("1", "4", "6", "7")
+BULK_FILE_FORMATS = ("txt", "csv")
+MAX_BULK_COUNT = 10_000_000
+BATCH_SIZE = 10_000
+
+
+def _repeat_batch(generate: Callable) -> Callable[[int], list]:
+    return lambda size: [generate() for _ in repeat(None, size)]
+
+
+# Each generator returns a list of `size` UUIDs. Versions 6 and 7 come from the
+# monotonic generator, which reads the clock once per batch.
+_GENERATORS = {
+    "1": _repeat_batch(uuid.uuid1),
+    "4": _repeat_batch(uuid.uuid4),
+    "6": uuid6_batch,
+    "7": uuid7_batch,
+}
+
+
+def iter_uuid_batches(
+    uuid_type: str, count: int, batch_size: int = BATCH_SIZE
+) -> Iterator[str]:
+    """Yields `count` UUIDs as newline-terminated text, `batch_size` at a time"""
+    generate_batch = _get_generator(uuid_type)
+    _validate_count(count)
+    return _generate_batches(generate_batch, count, batch_size)
+
+
+def write_uuid_file(
+    output_path: str, uuid_type: str, count: int, file_format: str = "txt"
+) -> str:
+    """Streams `count` UUIDs to a TXT or CSV file, with bounded memory"""
+    if file_format not in BULK_FILE_FORMATS:
+        raise ValueError(
+            f"Unsupported file format: {file_format}. "
+            f"Supported formats: {', '.join(BULK_FILE_FORMATS)}"
+        )
+    batches = iter_uuid_batches(uuid_type, count)
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with Path(output_path).open("w", encoding="ascii", newline="") as output_file:
+        if file_format == "csv":
+            output_file.write("uuid\n")
+        output_file.writelines(batches)
+    return output_path
+
+
+def measure_throughput(uuid_type: str, count: int = 100_000) -> float:
+    """Returns the batch path's throughput for one UUID version, in UUIDs/second"""
+    start = time.perf_counter()
+    for _ in iter_uuid_batches(uuid_type, count):
+        pass
+    return count / (time.perf_counter() - start)
+
+
+def _get_generator(uuid_type: str):
+    if uuid_type in ("3", "5"):
+        raise ValueError(
+            "UUID versions 3 and 5 are name-based: bulk generation would repeat "
+            "the same UUID."
+        )
+    if uuid_type not in _GENERATORS:
+        raise ValueError(
+            f"Unsupported UUID type: {uuid_type}. "
+            f"Supported types: {', '.join(BULK_UUID_TYPES)}"
+        )
+    return _GENERATORS[uuid_type]
+
+
+def _generate_batches(
+    generate_batch: Callable, count: int, batch_size: int
+) -> Iterator[str]:
+    for batch_start in range(0, count, batch_size):
+        size = min(batch_size, count - batch_start)
+        yield "\n".join(map(str, generate_batch(size))) + "\n"
+
+
+def _validate_count(count: int):
+    if not 0 < count <= MAX_BULK_COUNT:
+        raise ValueError(f"Number of UUIDs must be between 1 and {MAX_BULK_COUNT:,}")
@@ -1,20 +1,23 @@
 import uuid_utils as uuid
 
+from .uuid_monotonic import uuid6, uuid7
+from .uuid_names import get_namespace
 
-def get_uuid(uuid_type, name=""):
+
+def get_uuid(uuid_type, name="", namespace="DNS"):
     match uuid_type:
         case "1":
             return uuid.uuid1()
         case "3":
-            return uuid.uuid3(uuid.NAMESPACE_DNS, name=name)
+            return uuid.uuid3(get_namespace(namespace), name=name)
         case "4":
             return uuid.uuid4()
         case "5":
-            return uuid.uuid5(uuid.NAMESPACE_DNS, name=name)
+            return uuid.uuid5(get_namespace(namespace), name=name)
         case "6":
-            return uuid.uuid6()
+            return uuid6()
         case "7":
-            return uuid.uuid7()
+            return uuid7()
         case "":
             raise ValueError("UUID value is empty")
         case _:
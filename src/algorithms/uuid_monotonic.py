@@ -0,0 +1,186 @@
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import uuid_utils as uuid
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows: worker IDs come from the process ID
+    fcntl = None
+
+WORKER_ID_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+# One lock file per worker ID, held by the process that uses it
+WORKER_ID_DIR = Path(tempfile.gettempdir()) / "taipy-tools-worker-ids"
+
+# UUIDv7 layout: 48 bits unix_ts_ms | ver | 12 bits counter (high) | var |
+# 18 bits counter (low) | 12 bits worker ID | 32 random bits
+_V7_COUNTER_BITS = 30
+_V7_MAX_COUNTER = (1 << _V7_COUNTER_BITS) - 1
+
+# UUIDv6 timestamps count 100 ns intervals since the Gregorian epoch (1582-10-15)
+_GREGORIAN_OFFSET = 0x01B21DD213814000
+
+
+class MonotonicUUIDGenerator:
+    """
+    Generates strictly increasing UUIDv7 or UUIDv6 in one process.
+
+    UUIDv7 keeps a counter in the sub-millisecond bits, UUIDv6 advances its
+    100 ns timestamp for each UUID. The worker ID is part of every UUID, so
+    processes with different worker IDs never collide, and their UUIDs still
+    sort by time (see default_worker_id). Batches read the clock and the random
+    source only once.
+    """
+
+    def __init__(self, version: int = 7, worker_id: int | None = None):
+        if version not in (6, 7):
+            raise ValueError(f"Unsupported UUID version: {version}. Supported: 6, 7")
+        if worker_id is None:
+            worker_id = default_worker_id()
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"Worker ID must be between 0 and {MAX_WORKER_ID}")
+        self.version = version
+        self.worker_id = worker_id
+        self._lock = threading.Lock()
+        self._last_timestamp = 0
+        self._counter = 0
+        # UUIDv6 node: random, with the worker ID in bits 28-39 and the multicast
+        # bit set, as RFC 9562 requires for nodes that aren't MAC addresses
+        random_node = int.from_bytes(os.urandom(6)) & ~(MAX_WORKER_ID << 28)
+        self._v6_node = random_node | worker_id << 28 | 1 << 40
+        self._v6_clock_seq = int.from_bytes(os.urandom(2)) & 0x3FFF
+
+    def __call__(self) -> uuid.UUID:
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, count: int) -> list[uuid.UUID]:
+        if self.version == 7:
+            return self._generate_v7(count)
+        return self._generate_v6(count)
+
+    def _generate_v7(self, count: int) -> list[uuid.UUID]:
+        random_bits = memoryview(os.urandom(4 * count)).cast("I")
+        worker_bits = self.worker_id << 32
+        uuids = []
+        with self._lock:
+            timestamp = max(time.time_ns() // 1_000_000, self._last_timestamp)
+            counter = self._counter + 1 if timestamp == self._last_timestamp else 0
+            for random_value in random_bits:
+                if counter > _V7_MAX_COUNTER:
+                    # Counter exhausted for this millisecond: borrow the next one
+                    timestamp += 1
+                    counter = 0
+                uuids.append(
+                    uuid.UUID(
+                        int=timestamp << 80
+                        | 0x7 << 76
+                        | (counter >> 18) << 64
+                        | 0b10 << 62
+                        | (counter & 0x3FFFF) << 44
+                        | worker_bits
+                        | random_value
+                    )
+                )
+                counter += 1
+            self._last_timestamp = timestamp
+            self._counter = counter - 1
+        return uuids
+
+    def _generate_v6(self, count: int) -> list[uuid.UUID]:
+        clock_bits = 0b10 << 62 | self._v6_clock_seq << 48 | self._v6_node
+        uuids = []
+        with self._lock:
+            now = time.time_ns() // 100 + _GREGORIAN_OFFSET
+            first_timestamp = max(now, self._last_timestamp + 1)
+            for timestamp in range(first_timestamp, first_timestamp + count):
+                uuids.append(
+                    uuid.UUID(
+                        int=(timestamp >> 12) << 80
+                        | 0x6 << 76
+                        | (timestamp & 0xFFF) << 64
+                        | clock_bits
+                    )
+                )
+            self._last_timestamp = first_timestamp + count - 1
+        return uuids
+
+
+def default_worker_id() -> int:
+    """
+    A worker ID that no other running process holds: the first free one from
+    TAIPY_TOOLS_WORKER_ID (0 by default). This process keeps it until it exits.
+    Only processes that share the lock directory (TAIPY_TOOLS_WORKER_ID_DIR, or
+    one in the temporary directory) see each other's IDs.
+    """
+    with _lease_lock:
+        if "worker_id" not in _lease:
+            first = int(os.environ.get("TAIPY_TOOLS_WORKER_ID", "0"))
+            if not 0 <= first <= MAX_WORKER_ID:
+                raise ValueError(f"Worker ID must be between 0 and {MAX_WORKER_ID}")
+            _lease["worker_id"] = _claim_worker_id(first)
+        return _lease["worker_id"]
+
+
+def uuid6() -> uuid.UUID:
+    return _get_generator(6)()
+
+
+def uuid7() -> uuid.UUID:
+    return _get_generator(7)()
+
+
+def uuid6_batch(count: int) -> list[uuid.UUID]:
+    return _get_generator(6).generate_batch(count)
+
+
+def uuid7_batch(count: int) -> list[uuid.UUID]:
+    return _get_generator(7).generate_batch(count)
+
+
+_generators = {}
+_generators_lock = threading.Lock()
+# This process's worker ID, and the lock file descriptor that reserves it
+_lease = {}
+_lease_lock = threading.Lock()
+
+
+def _get_generator(version: int) -> MonotonicUUIDGenerator:
+    with _generators_lock:
+        if version not in _generators:
+            _generators[version] = MonotonicUUIDGenerator(version)
+        return _generators[version]
+
+
+def _claim_worker_id(first: int) -> int:
+    if fcntl is None:
+        return os.getpid() & MAX_WORKER_ID
+    directory = Path(os.environ.get("TAIPY_TOOLS_WORKER_ID_DIR", WORKER_ID_DIR))
+    directory.mkdir(parents=True, exist_ok=True)
+    for offset in range(MAX_WORKER_ID + 1):
+        worker_id = (first + offset) & MAX_WORKER_ID
+        lock_fd = os.open(directory / f"{worker_id}.lock", os.O_WRONLY | os.O_CREAT)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(lock_fd)
+            continue
+        # The lock is released when the process exits, even if it crashes
+        _lease["lock_fd"] = lock_fd
+        return worker_id
+    raise RuntimeError(f"All {MAX_WORKER_ID + 1} worker IDs are in use in {directory}")
+
+
+def _forget_parent_state():
+    # A forked worker must not reuse its parent's worker ID and counters. Closing
+    # the inherited descriptor keeps the lock: the parent's copy still holds it.
+    _generators.clear()
+    if "lock_fd" in _lease:
+        os.close(_lease["lock_fd"])
+    _lease.clear()
+
+
+os.register_at_fork(after_in_child=_forget_parent_state)
@@ -0,0 +1,154 @@
+import csv
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import batched, chain
+from pathlib import Path
+from typing import TextIO
+
+import uuid_utils as uuid
+
+NAME_BASED_UUID_TYPES = ("3", "5")
+NAMESPACES = {
+    "DNS": uuid.NAMESPACE_DNS,
+    "URL": uuid.NAMESPACE_URL,
+    "OID": uuid.NAMESPACE_OID,
+    "X500": uuid.NAMESPACE_X500,
+}
+CHUNK_SIZE = 10_000
+NAME_CACHE_SIZE = 100_000
+
+_HASHERS = {"3": uuid.uuid3, "5": uuid.uuid5}
+
+
+def get_namespace(namespace: str) -> uuid.UUID:
+    """Returns a predefined namespace (DNS, URL, OID, X500), or parses a UUID"""
+    if namespace in NAMESPACES:
+        return NAMESPACES[namespace]
+    try:
+        return uuid.UUID(namespace.strip())
+    except ValueError:
+        raise ValueError(
+            f"Unsupported namespace: {namespace}. "
+            f"Use {', '.join(NAMESPACES)} or a UUID."
+        ) from None
+
+
+def hash_names(uuid_type: str, namespace: str, names: Iterable[str]) -> list[str]:
+    """Returns the v3 or v5 UUID of each name, reusing the ones already computed"""
+    _get_hasher(uuid_type)
+    namespace_uuid = get_namespace(namespace)
+    return [_name_uuid(uuid_type, namespace_uuid, name) for name in names]
+
+
+def write_name_uuid_file(
+    names_path: str,
+    output_path: str,
+    uuid_type: str,
+    namespace: str = "DNS",
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: int | None = None,
+) -> int:
+    """
+    Writes a `name,uuid` CSV file with the v3 or v5 UUID of each line of a text
+    file. Empty lines are skipped.
+
+    Returns:
+        int: Number of names written
+    """
+    with Path(names_path).open(encoding="utf-8") as names_file:
+        chunks = iter_name_uuid_chunks(
+            names_file, uuid_type, namespace, chunk_size, max_workers
+        )
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            raise ValueError(f"No names found in '{Path(names_path).name}'.")
+
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with Path(output_path).open("w", encoding="utf-8", newline="") as output:
+            return write_name_uuid_rows(output, chain([first_chunk], chunks))
+
+
+def iter_name_uuid_chunks(
+    lines: Iterable[str],
+    uuid_type: str,
+    namespace: str = "DNS",
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: int | None = None,
+) -> Iterator[tuple[tuple[str, ...], list[str]]]:
+    """
+    Yields (names, uuids) chunks for lines of names, in input order. Lines are
+    stripped and empty ones skipped.
+
+    Chunks are hashed on a process pool and yielded as they complete, so only a
+    few chunks are held in memory at a time. Inputs that fit in one chunk are
+    hashed in-process.
+    """
+    _get_hasher(uuid_type)
+    get_namespace(namespace)
+    names = (name for line in lines if (name := line.strip()))
+    return _hash_chunks(uuid_type, namespace, batched(names, chunk_size), max_workers)
+
+
+def write_name_uuid_rows(
+    output: TextIO, chunks: Iterable[tuple[tuple[str, ...], list[str]]]
+) -> int:
+    """Writes (names, uuids) chunks as `name,uuid` CSV, returns the row count"""
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(["name", "uuid"])
+    count = 0
+    for names, uuids in chunks:
+        writer.writerows(zip(names, uuids, strict=True))
+        count += len(names)
+    return count
+
+
+def _get_hasher(uuid_type: str):
+    if uuid_type not in _HASHERS:
+        raise ValueError(
+            f"Unsupported UUID type: {uuid_type}. "
+            f"Supported types: {', '.join(NAME_BASED_UUID_TYPES)}"
+        )
+    return _HASHERS[uuid_type]
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _name_uuid(uuid_type: str, namespace: uuid.UUID, name: str) -> str:
+    # v3/v5 are deterministic: repeated names are hashed only once per process
+    return str(_HASHERS[uuid_type](namespace, name))
+
+
+def _hash_chunks(
+    uuid_type: str,
+    namespace: str,
+    chunks: Iterator[tuple[str, ...]],
+    max_workers: int | None,
+) -> Iterator[tuple[tuple[str, ...], list[str]]]:
+    first_chunk = next(chunks, None)
+    next_chunk = next(chunks, None)
+    if next_chunk is None:
+        if first_chunk is not None:
+            yield first_chunk, hash_names(uuid_type, namespace, first_chunk)
+        return
+
+    max_workers = max_workers or os.cpu_count()
+    pending = deque()
+    # Spawned: the UUID page hashes large files from a server callback, whose
+    # threads a fork would copy in whatever state they're in
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        for names in chain((first_chunk, next_chunk), chunks):
+            pending.append(
+                (names, executor.submit(hash_names, uuid_type, namespace, names))
+            )
+            # Keep every worker busy, without reading the whole file ahead
+            if len(pending) > 2 * max_workers:
+                names, future = pending.popleft()
+                yield names, future.result()
+        while pending:
+            names, future = pending.popleft()
+            yield names, future.result()
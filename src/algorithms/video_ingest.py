@@ -0,0 +1,105 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import uuid_utils as uuid
+
+CHUNK_SIZE = 1024 * 1024
+UPLOAD_STORE = "./deposit_files/uploads"
+
+# Box types that can start an ISO base media (MP4/MOV) file, at bytes 4-8
+_MP4_BOXES = (b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip")
+
+
+def ingest_video(
+    upload_path: str, store_dir: str = UPLOAD_STORE, chunk_size: int = CHUNK_SIZE
+) -> dict:
+    """
+    Reads an upload once to get its size, SHA-256 and container type, then moves
+    it to the upload store.
+
+    Identical uploads are stored only once: each caller gets its own hard link to
+    the stored copy, to release with `release_video` when done.
+
+    Returns:
+        dict: "path" (the caller's copy), "sha256" and "size" (in bytes)
+    """
+    upload = Path(upload_path)
+    digest, size, header = _hash_file(upload, chunk_size)
+    if not _is_video_container(header):
+        upload.unlink(missing_ok=True)
+        raise ValueError(f"'{upload.name}' is not an MP4 or AVI video.")
+    stored_path = _store(upload, Path(store_dir), digest)
+    return {"path": str(stored_path), "sha256": digest, "size": size}
+
+
+def release_video(video_path: str | Path) -> int:
+    """
+    Deletes a caller's copy, and the stored upload once nobody uses it.
+
+    Returns:
+        int: The bytes freed on disk, 0 while other callers use the upload
+    """
+    video_path = Path(video_path)
+    if not video_path.is_file():
+        return 0
+    digest = video_path.name.split(".")[0]
+    canonical_path = video_path.with_name(f"{digest}{video_path.suffix}")
+    video_path.unlink()
+    try:
+        stored = canonical_path.stat()
+        if stored.st_nlink == 1:
+            canonical_path.unlink()
+            return stored.st_size
+    except FileNotFoundError:
+        pass  # Released by another caller, or another worker, at the same time
+    return 0
+
+
+def _hash_file(file_path: Path, chunk_size: int) -> tuple[str, int, bytes]:
+    hasher = hashlib.sha256()
+    size = 0
+    header = b""
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with file_path.open("rb") as file:
+        while read_size := file.readinto(buffer):
+            if not size:
+                header = bytes(view[:12])
+            hasher.update(view[:read_size])
+            size += read_size
+    return hasher.hexdigest(), size, header
+
+
+def _is_video_container(header: bytes) -> bool:
+    is_mp4 = header[4:8] in _MP4_BOXES
+    is_avi = header[:4] == b"RIFF" and header[8:12] == b"AVI "
+    return is_mp4 or is_avi
+
+
+def _store(upload: Path, store_dir: Path, digest: str) -> Path:
+    """
+    Moves the upload to the caller's path, then shares it with identical
+    uploads. `release_video` may delete the stored copy at any time, in any
+    worker: the caller's path is never left without the upload's bytes
+    """
+    store_dir.mkdir(parents=True, exist_ok=True)
+    suffix = upload.suffix.lower()
+    canonical_path = store_dir / f"{digest}{suffix}"
+    caller_path = store_dir / f"{digest}.{uuid.uuid4()}{suffix}"
+    shutil.move(upload, caller_path)
+    while True:
+        try:
+            os.link(caller_path, canonical_path)
+            return caller_path
+        except FileExistsError:
+            pass
+        # Stored already: swap this copy for a link to the stored one
+        linked_path = caller_path.with_name(f"{caller_path.name}.link")
+        try:
+            os.link(canonical_path, linked_path)
+        except FileNotFoundError:
+            continue  # Released in the meantime: store this copy instead
+        linked_path.replace(caller_path)
+        return caller_path
@@ -0,0 +1,145 @@
+# Crop region and rotation of a GIF. Both are applied to the decoded frames
+# before they're scaled, so the palette, scaling, dithering and encoding only
+# process the selected pixels. The GIF page picks the region on a thumbnail of
+# the video's first keyframe.
+#
+# Frames are first turned like players display them, following the video's
+# display matrix (phones record upright clips as rotated landscape frames).
+# ffmpeg does so before filtering, so regions and sizes are those of the
+# displayed frame.
+
+import io
+
+import ffmpeg
+from PIL import Image, ImageDraw, ImageEnhance
+
+# Clockwise, in degrees
+ROTATIONS = (0, 90, 180, 270)
+# Width of the keyframe thumbnail shown by the region picker
+THUMBNAIL_WIDTH = 480
+
+_PIL_ROTATIONS = {
+    90: Image.Transpose.ROTATE_270,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_90,
+}
+
+
+def get_rotation(rotation: int | str) -> int:
+    """Returns the rotation as an int, or raises ValueError if unsupported"""
+    try:
+        if int(rotation) in ROTATIONS:
+            return int(rotation)
+    except ValueError:
+        pass
+    raise ValueError(
+        f"Unsupported rotation: {rotation}. "
+        f"Supported rotations: {', '.join(map(str, ROTATIONS))}"
+    )
+
+
+def display_rotation(rotation: float) -> int:
+    """
+    Clockwise turn, in ROTATIONS, that displays a frame whose display matrix
+    rotates it `rotation` degrees counterclockwise, as ffprobe and PyAV report it
+    """
+    return round(-rotation / 90) % 4 * 90
+
+
+def get_region_error(
+    crop: tuple[int, int, int, int] | None, size: tuple[int, int]
+) -> str | None:
+    """Returns the problem with an (x, y, width, height) crop, or None if valid"""
+    if crop is None:
+        return None
+    x, y, width, height = crop
+    if width <= 0 or height <= 0:
+        return "Crop width and height must be positive."
+    if x < 0 or y < 0 or x + width > size[0] or y + height > size[1]:
+        return f"Crop region must be inside the {size[0]}x{size[1]} frame."
+    return None
+
+
+def region_size(
+    size: tuple[int, int], crop: tuple[int, int, int, int] | None, rotation: int
+) -> tuple[int, int]:
+    """Frame size once cropped and rotated"""
+    width, height = size if crop is None else crop[2:]
+    return (height, width) if rotation in (90, 270) else (width, height)
+
+
+def apply_region(stream, crop: tuple[int, int, int, int] | None, rotation: int):
+    """Adds the crop and rotation filters to an ffmpeg-python stream"""
+    if crop is not None:
+        stream = stream.crop(*crop)
+    if rotation == 90:
+        stream = stream.filter("transpose", dir="clock")
+    elif rotation == 180:
+        stream = stream.hflip().vflip()
+    elif rotation == 270:
+        stream = stream.filter("transpose", dir="cclock")
+    return stream
+
+
+def crop_and_rotate(
+    image: Image.Image, crop: tuple[int, int, int, int] | None, rotation: int
+) -> Image.Image:
+    """Same as `apply_region`, for a decoded frame"""
+    if crop is not None:
+        x, y, width, height = crop
+        image = image.crop((x, y, x + width, y + height))
+    if rotation:
+        image = image.transpose(_PIL_ROTATIONS[rotation])
+    return image
+
+
+def extract_keyframe(input_path: str) -> tuple[bytes, tuple[int, int]]:
+    """
+    Decodes the first keyframe of a video.
+
+    Returns:
+        tuple: A JPEG thumbnail THUMBNAIL_WIDTH pixels wide, and the size of the
+            displayed frame
+    """
+    stream = ffmpeg.input(input_path, skip_frame="nokey").output(
+        "pipe:", vframes=1, format="image2", vcodec="mjpeg", **{"q:v": 2}
+    )
+    try:
+        out, _ = ffmpeg.run(stream, capture_stdout=True, capture_stderr=True)
+    except ffmpeg.Error as e:
+        raise ValueError(f"Could not read a frame of '{input_path}'.") from e
+    with Image.open(io.BytesIO(out)) as frame:
+        size = frame.size
+        thumbnail = frame.resize(
+            (THUMBNAIL_WIDTH, max(1, round(size[1] * THUMBNAIL_WIDTH / size[0])))
+        )
+    return _to_jpeg(thumbnail), size
+
+
+def draw_region(
+    thumbnail: bytes,
+    size: tuple[int, int],
+    crop: tuple[int, int, int, int] | None,
+    rotation: int,
+) -> bytes:
+    """
+    Draws a crop region on a keyframe thumbnail: the rest of the frame is
+    dimmed, and the result turned like the GIF will be
+    """
+    with Image.open(io.BytesIO(thumbnail)) as opened:
+        image = opened.convert("RGB")
+    if crop is not None:
+        scale = image.width / size[0]
+        x, y, width, height = crop
+        box = tuple(round(value * scale) for value in (x, y, x + width, y + height))
+        region = image.crop(box)
+        image = ImageEnhance.Brightness(image).enhance(0.4)
+        image.paste(region, box[:2])
+        ImageDraw.Draw(image).rectangle(box, outline=(255, 255, 255), width=2)
+    return _to_jpeg(crop_and_rotate(image, None, rotation))
+
+
+def _to_jpeg(image: Image.Image) -> bytes:
+    output = io.BytesIO()
+    image.convert("RGB").save(output, format="JPEG", quality=85)
+    return output.getvalue()
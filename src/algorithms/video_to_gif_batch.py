@@ -0,0 +1,131 @@
+import multiprocessing
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .metrics import add_to_gauge
+from .video_to_gif_functions import (
+    DEFAULT_VIDEO_BACKEND,
+    get_parameter_error,
+    video_to_gif,
+)
+from .video_to_gif_get_duration import get_clip_duration
+from .video_to_gif_presets import DEFAULT_GIF_PRESET
+
+
+def convert_batch_to_zip(
+    input_paths: list[str],
+    zip_path: str,
+    start_time: float = 0,
+    duration: float | None = None,
+    fps: int = 10,
+    resize_factor: float = 1.0,
+    backend: str = DEFAULT_VIDEO_BACKEND,
+    preset: str = DEFAULT_GIF_PRESET,
+    max_workers: int | None = None,
+) -> dict[str, str | None]:
+    """
+    Converts several videos to GIF with the same parameters, into one ZIP file.
+
+    Conversions run on a process pool (one worker per core by default), and each
+    GIF is written to the archive as soon as it is ready.
+
+    Returns:
+        dict: Input path -> error message, or None if the file was converted
+    """
+    results = {}
+    arcnames = set()
+    workers = max_workers or os.cpu_count()
+    Path(zip_path).parent.mkdir(parents=True, exist_ok=True)
+    with (
+        tempfile.TemporaryDirectory() as temp_dir,
+        zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as archive,
+        # Spawned, like the callbacks' process pool: the GUI starts batches from
+        # a pool thread, and forking a threaded server copies its locks mid-use
+        ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor,
+    ):
+        futures = {
+            executor.submit(
+                convert_one,
+                input_path,
+                str(Path(temp_dir) / f"{index}.gif"),
+                start_time,
+                duration,
+                fps,
+                resize_factor,
+                backend,
+                preset,
+            ): input_path
+            for index, input_path in enumerate(input_paths)
+        }
+        # Videos beyond the pool's size wait for a process, shown on the admin page
+        waiting = max(0, len(futures) - workers)
+        add_to_gauge("batch_videos_waiting", waiting)
+        try:
+            for future in as_completed(futures):
+                if waiting:
+                    waiting -= 1
+                    add_to_gauge("batch_videos_waiting", -1)
+                input_path = futures[future]
+                # A crashed worker fails its own file, not the whole batch
+                if (exception := future.exception()) is not None:
+                    results[input_path] = f"{type(exception).__name__}: {exception}"
+                    continue
+                output_path, error = future.result()
+                if error is None:
+                    # GIFs are already LZW-compressed: store them as they are
+                    archive.write(
+                        output_path, arcname=_unique_arcname(input_path, arcnames)
+                    )
+                    Path(output_path).unlink()
+                results[input_path] = error
+        finally:
+            add_to_gauge("batch_videos_waiting", -waiting)
+    return results
+
+
+def convert_one(
+    input_path: str,
+    output_path: str,
+    start_time: float,
+    duration: float | None,
+    fps: int,
+    resize_factor: float,
+    backend: str = DEFAULT_VIDEO_BACKEND,
+    preset: str = DEFAULT_GIF_PRESET,
+) -> tuple[str, str | None]:
+    """Probes and validates one file of the batch before converting it"""
+    try:
+        clip_duration = get_clip_duration(input_path, backend)
+    except ValueError as e:
+        return output_path, str(e)
+    error = get_parameter_error(start_time, duration, clip_duration)
+    if error:
+        return output_path, error
+    if not video_to_gif(
+        input_path=input_path,
+        output_path=output_path,
+        start_time=start_time,
+        duration=duration,
+        fps=fps,
+        resize_factor=resize_factor,
+        backend=backend,
+        preset=preset,
+    ):
+        return output_path, "GIF conversion failed."
+    return output_path, None
+
+
+def _unique_arcname(input_path: str, arcnames: set) -> str:
+    stem = Path(input_path).stem
+    arcname = f"{stem}.gif"
+    index = 1
+    while arcname in arcnames:
+        arcname = f"{stem}_{index}.gif"
+        index += 1
+    arcnames.add(arcname)
+    return arcname
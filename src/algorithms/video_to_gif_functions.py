@@ -1,8 +1,35 @@
+import logging
+import os
+import re
 import tempfile
 from pathlib import Path
 
 import ffmpeg
 
+from .gif_optimizer import optimize_gif
+from .tracing import current_span, span
+from .video_region import (
+    apply_region,
+    display_rotation,
+    get_region_error,
+    get_rotation,
+    region_size,
+)
+from .video_to_gif_presets import DEFAULT_GIF_PRESET, get_preset
+from .video_to_gif_pyav import pyav_video_to_gif
+
+VIDEO_BACKENDS = ("ffmpeg", "pyav")
+DEFAULT_VIDEO_BACKEND = os.environ.get("TAIPY_TOOLS_VIDEO_BACKEND", "ffmpeg")
+# Height of the preview rendition, the size the GIF page displays
+PREVIEW_HEIGHT = 200
+
+# Last progress line of ffmpeg's stats, on stderr
+_FRAMES_PATTERN = re.compile(rb"frame=\s*(\d+)")
+
+# Failed conversions are logged as well as traced: the default trace sink is
+# only kept in memory
+logger = logging.getLogger(__name__)
+
 
 def video_to_gif(
     input_path: str,
@@ -11,14 +38,146 @@ def video_to_gif(
     duration: float = None,
     fps: int = 10,
     resize_factor: float = 1.0,
+    backend: str = DEFAULT_VIDEO_BACKEND,
+    preset: str = DEFAULT_GIF_PRESET,
+    preview_path: str | None = None,
+    crop: tuple[int, int, int, int] | None = None,
+    rotation: int = 0,
+    optimize: bool = False,
+    tolerance: int = 0,
 ) -> bool:
-    try:
-        _validate_input_file(input_path)
+    """
+    Converts [start_time, start_time + duration] of a video to a GIF.
+
+    `crop`, (x, y, width, height) in pixels of the displayed frame, and
+    `rotation`, clockwise in degrees, are applied before the frames are scaled.
+
+    With `preview_path`, a rendition at most PREVIEW_HEIGHT pixels high is also
+    written there, from the same decoding: pages display it instead of
+    downloading the full GIF.
+
+    With `optimize`, the GIFs are then rewritten by `optimize_gif`, which keeps
+    only each frame's changes; `tolerance` makes it lossy (see gif_optimizer.py)
+    """
+    with span(
+        "video_to_gif", backend=backend, preset=preset, fps=fps, duration=duration
+    ) as gif_span:
+        try:
+            _validate_input_file(input_path)
+            gif_span.set(input_bytes=_file_size(input_path))
+            convert = _get_converter(backend)
+            convert(
+                input_path,
+                output_path,
+                start_time,
+                duration,
+                fps,
+                resize_factor,
+                get_preset(preset),
+                (preview_path, PREVIEW_HEIGHT) if preview_path else None,
+                crop=crop,
+                rotation=get_rotation(rotation),
+            )
+            if optimize:
+                _optimize(output_path, preview_path, tolerance)
+            gif_span.set(output_bytes=_file_size(output_path))
+            if preview_path:
+                gif_span.set(preview_bytes=_file_size(preview_path))
+            return True
+        except ffmpeg.Error as e:
+            error = f"ffmpeg error: {e.stderr.decode('utf8')[-500:]}"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        gif_span.fail(error)
+        logger.warning("Could not convert '%s' to GIF: %s", input_path, error)
+        return False
+
+
+def get_parameter_error(
+    start_time: float, duration: float | None, clip_duration: float
+) -> str | None:
+    """
+    Returns the first problem with the clip parameters, or None if they're
+    valid. A `duration` of None runs until the end of the clip
+    """
+    end_time = clip_duration if duration is None else start_time + duration
+    checks = [
+        (
+            duration is not None and duration > clip_duration,
+            "Duration shouldn't be longer than total file duration.",
+        ),
+        (
+            start_time > clip_duration,
+            "Start Time shouldn't be after video ends!",
+        ),
+        (
+            end_time > clip_duration,
+            "Duration + Start Time can't be longer than total file duration.",
+        ),
+    ]
+    for condition, message in checks:
+        if condition:
+            return message
+    return None
+
+
+def _optimize(output_path: str, preview_path: str | None, tolerance: int):
+    with span("optimize", tolerance=tolerance) as optimize_span:
+        report = optimize_gif(output_path, tolerance=tolerance)
+        optimize_span.set(
+            input_bytes=report["input_bytes"],
+            reduction=report["reduction"],
+            merged_frames=report["merged_frames"],
+            applied=report["applied"],
+        )
+        if preview_path:
+            optimize_gif(preview_path, tolerance=tolerance)
+
+
+def _get_converter(backend: str):
+    converters = {"ffmpeg": _ffmpeg_video_to_gif, "pyav": pyav_video_to_gif}
+    if backend not in converters:
+        raise ValueError(
+            f"Unsupported video backend: {backend}. "
+            f"Supported backends: {', '.join(VIDEO_BACKENDS)}"
+        )
+    return converters[backend]
+
+
+def _ffmpeg_video_to_gif(
+    input_path: str,
+    output_path: str,
+    start_time: float,
+    duration: float,
+    fps: int,
+    resize_factor: float,
+    preset: dict,
+    preview: tuple[str, int] | None = None,
+    crop: tuple[int, int, int, int] | None = None,
+    rotation: int = 0,
+):
+    """
+    Default backend: one ffmpeg/ffprobe subprocess per pipeline step. `preview`
+    is the path and maximum height of the preview rendition, if any
+    """
+    with span("probe") as probe_span:
         clip_info = _get_clip_info(input_path)
-        _log_results(input_path, clip_info, fps)
+        probe_span.set(clip_duration=clip_info["duration"], size=clip_info["size"])
+    if error := get_region_error(crop, clip_info["size"]):
+        raise ValueError(error)
+    if preview is not None:
+        # Never upscaled: a small GIF is its own preview
+        preview_path, preview_height = preview
+        region_height = region_size(clip_info["size"], crop, rotation)[1]
+        preview = (
+            preview_path,
+            min(preview_height, int(region_height * resize_factor)),
+        )
+    with span("palette", max_colors=preset["max_colors"]):
         palette_path = _generate_palette(
-            input_path, start_time, duration, resize_factor
+            input_path, start_time, duration, resize_factor, preset, crop, rotation
         )
+    with span("encode"):
         _create_gif(
             input_path,
             output_path,
@@ -27,16 +186,13 @@ def video_to_gif(
             fps,
             resize_factor,
             palette_path,
+            preset,
+            preview,
+            crop,
+            rotation,
         )
+    with span("cleanup"):
         _cleanup_file(palette_path)
-        print(f"GIF created successfully: '{output_path}'")
-        return True
-    except ffmpeg.Error as e:
-        print(f"Error converting video to GIF: {e.stderr.decode('utf8')}")
-        return False
-    except Exception as e:
-        print(f"Error converting video to GIF: {str(e)}")
-        return False
 
 
 def _validate_input_file(input_path: str):
@@ -45,6 +201,13 @@ def _validate_input_file(input_path: str):
         raise FileNotFoundError(f"Input file '{input_path}' not found.")
 
 
+def _file_size(path: str) -> int | None:
+    try:
+        return Path(path).stat().st_size
+    except OSError:
+        return None
+
+
 def _create_dir_if_not_exist(output_path: str):
     output_dir = Path(output_path).parent
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -52,52 +215,57 @@ def _create_dir_if_not_exist(output_path: str):
 
 def _get_clip_info(input_path: str):
     try:
-        probe = ffmpeg.probe(input_path)
+        probe = ffmpeg.probe(input_path, select_streams="v:0")
         duration = float(probe["format"]["duration"])
-        width = int(probe["streams"][0]["width"])
-        height = int(probe["streams"][0]["height"])
-        return {"duration": duration, "size": (width, height)}
+        stream = probe["streams"][0]
+        size = (int(stream["width"]), int(stream["height"]))
+        # ffmpeg turns the frames like players display them before filtering
+        rotation = display_rotation(_get_matrix_rotation(stream))
+        return {"duration": duration, "size": region_size(size, None, rotation)}
     except ffmpeg.Error as e:
         raise ValueError(
             f"ffprobe error: Could not get info for '{input_path}'.\
                   {e.stderr.decode('utf8')}"
         )
-    except (FileNotFoundError, KeyError) as e:
+    except (FileNotFoundError, KeyError, IndexError) as e:
         raise ValueError(f"Could not get video info. Is '{input_path}' valid?") from e
 
 
-def _log_results(input_path: str, clip_info: dict, fps: int):
-    print(f"Converting '{input_path}' to GIF...")
-    print(f"Duration: {clip_info['duration']:.2f} seconds")
-    print(f"Size: {clip_info['size']}")
-    print(f"FPS: {fps}")
+def _get_matrix_rotation(stream: dict) -> float:
+    for side_data in stream.get("side_data_list", []):
+        if "rotation" in side_data:
+            return float(side_data["rotation"])
+    return 0
 
 
 def _generate_palette(
-    input_path: str, start_time: float, duration: float, resize_factor: float
+    input_path: str,
+    start_time: float,
+    duration: float,
+    resize_factor: float,
+    preset: dict,
+    crop: tuple[int, int, int, int] | None = None,
+    rotation: int = 0,
 ) -> Path:
     input_stream = ffmpeg.input(input_path, ss=start_time)
+    input_stream = apply_region(input_stream, crop, rotation)
     scaled_stream = input_stream.filter(
         "scale",
         f"iw*{resize_factor}",
         f"ih*{resize_factor}",
-        flags="lanczos",
+        flags=preset["scaler"],
     )
     if duration:
         scaled_stream = scaled_stream.filter("trim", duration=duration)
     palette_stream = scaled_stream.filter(
         "palettegen",
-        max_colors=256,
+        max_colors=preset["max_colors"],
         reserve_transparent=0,
-        stats_mode="full",
+        stats_mode=preset["stats_mode"],
     )
     with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp_palette:
         palette_path = Path(temp_palette.name)
-    ffmpeg.run(
-        ffmpeg.output(palette_stream, str(palette_path)),
-        overwrite_output=True,
-        quiet=True,
-    )
+    _run_ffmpeg(ffmpeg.output(palette_stream, str(palette_path)))
     return palette_path
 
 
@@ -109,28 +277,65 @@ def _create_gif(
     fps: int,
     resize_factor: float,
     palette_path: Path,
+    preset: dict,
+    preview: tuple[str, int] | None = None,
+    crop: tuple[int, int, int, int] | None = None,
+    rotation: int = 0,
 ):
     video_stream = ffmpeg.input(input_path, ss=start_time)
+    video_stream = apply_region(video_stream, crop, rotation)
     video_stream = video_stream.filter(
-        "scale", f"iw*{resize_factor}", f"ih*{resize_factor}", flags="lanczos"
+        "scale", f"iw*{resize_factor}", f"ih*{resize_factor}", flags=preset["scaler"]
     )
     if duration:
         video_stream = video_stream.filter("trim", duration=duration)
     video_stream = video_stream.filter("fps", fps=fps)
     palette_input = ffmpeg.input(str(palette_path))
-    gif_stream = ffmpeg.filter(
-        [video_stream, palette_input],
-        "paletteuse",
-        dither="floyd_steinberg",
-        diff_mode="rectangle",
-        new=1,
-    )
-    _create_dir_if_not_exist(output_path)
-    ffmpeg.run(
-        ffmpeg.output(gif_stream, output_path, format="gif"),
-        overwrite_output=True,
-        quiet=True,
+    renditions = [(video_stream, palette_input, output_path)]
+    if preview is not None:
+        # Both renditions come from one decoding, and share the palette
+        preview_path, preview_height = preview
+        video_streams = video_stream.split()
+        palette_inputs = palette_input.split()
+        preview_stream = video_streams[1].filter(
+            "scale", -1, preview_height, flags=preset["scaler"]
+        )
+        renditions = [
+            (video_streams[0], palette_inputs[0], output_path),
+            (preview_stream, palette_inputs[1], preview_path),
+        ]
+    outputs = []
+    for stream, palette, path in renditions:
+        gif_stream = ffmpeg.filter(
+            [stream, palette],
+            "paletteuse",
+            dither=preset["dither"],
+            bayer_scale=preset["bayer_scale"],
+            diff_mode=preset["diff_mode"],
+            new=1,
+        )
+        _create_dir_if_not_exist(path)
+        outputs.append(ffmpeg.output(gif_stream, path, format="gif"))
+    _run_ffmpeg(ffmpeg.merge_outputs(*outputs))
+
+
+def _run_ffmpeg(stream):
+    """
+    Same as `ffmpeg.run(stream, overwrite_output=True, quiet=True)`, but also
+    records the exit status and frames processed on the current span
+    """
+    process = ffmpeg.run_async(
+        stream, pipe_stdout=True, pipe_stderr=True, overwrite_output=True
     )
+    out, err = process.communicate()
+    frames = _FRAMES_PATTERN.findall(err)
+    if (run_span := current_span()) is not None:
+        run_span.set(
+            ffmpeg_exit_status=process.returncode,
+            frames=int(frames[-1]) if frames else None,
+        )
+    if process.returncode:
+        raise ffmpeg.Error("ffmpeg", out, err)
 
 
 def _cleanup_file(file_path: Path):
@@ -1,8 +1,46 @@
+from pathlib import Path
+
 import ffmpeg
 
+from .shared_store import get_shared_store
+from .tracing import span
+from .video_to_gif_functions import DEFAULT_VIDEO_BACKEND
+from .video_to_gif_pyav import get_clip_info
+
+
+def get_clip_duration(input_path: str, backend: str = DEFAULT_VIDEO_BACKEND) -> float:
+    """
+    Gets the duration of a video file using ffprobe (or PyAV, in-process).
+
+    Durations are cached in the shared store, for all the server workers.
+    """
+    with span("get_clip_duration", backend=backend) as duration_span:
+        cache_key = _probe_cache_key(input_path, backend)
+        if cache_key is None:
+            return _probe_duration(input_path, backend)
+        duration_span.set(cached=True)
+
+        def probe() -> bytes:
+            duration_span.set(cached=False)
+            return str(_probe_duration(input_path, backend)).encode()
+
+        duration = float(get_shared_store().get_or_compute("probe", cache_key, probe))
+        duration_span.set(clip_duration=duration)
+        return duration
+
+
+def _probe_cache_key(input_path: str, backend: str) -> str | None:
+    # Hard links to the same upload share their inode, and so their cache entry
+    try:
+        stat = Path(input_path).stat()
+    except OSError:
+        return None
+    return f"{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}:{backend}"
+
 
-def get_clip_duration(input_path: str) -> float:
-    """Gets the duration of a video file using ffprobe"""
+def _probe_duration(input_path: str, backend: str) -> float:
+    if backend == "pyav":
+        return get_clip_info(input_path)["duration"]
     try:
         return _get_clip_duration(input_path)
     except ffmpeg.Error as e:
@@ -18,6 +56,4 @@ def get_clip_duration(input_path: str) -> float:
 
 def _get_clip_duration(input_path: str) -> float:
     probe = ffmpeg.probe(input_path)
-    duration = float(probe["format"]["duration"])
-    print(f"Video duration: {duration:.2f} seconds")
-    return duration
+    return float(probe["format"]["duration"])
@@ -0,0 +1,40 @@
+# Scaler, palette and dithering settings for each speed/quality/size trade-off.
+# "best" matches the converter's original, slowest and largest, settings.
+GIF_PRESETS = {
+    "fast": {
+        "scaler": "fast_bilinear",
+        "max_colors": 64,
+        "stats_mode": "diff",
+        "dither": "bayer",
+        "bayer_scale": 5,
+        "diff_mode": "rectangle",
+    },
+    "balanced": {
+        "scaler": "bicubic",
+        "max_colors": 128,
+        "stats_mode": "diff",
+        "dither": "bayer",
+        "bayer_scale": 3,
+        "diff_mode": "rectangle",
+    },
+    "best": {
+        "scaler": "lanczos",
+        "max_colors": 256,
+        "stats_mode": "full",
+        "dither": "floyd_steinberg",
+        "bayer_scale": 2,
+        "diff_mode": "rectangle",
+    },
+}
+
+DEFAULT_GIF_PRESET = "best"
+
+
+def get_preset(preset_name: str) -> dict:
+    try:
+        return GIF_PRESETS[preset_name]
+    except KeyError:
+        raise ValueError(
+            f"Unsupported GIF preset: {preset_name}. "
+            f"Supported presets: {', '.join(GIF_PRESETS)}"
+        ) from None
@@ -0,0 +1,209 @@
+from pathlib import Path
+
+from PIL import Image
+
+from .tracing import span
+from .video_region import (
+    crop_and_rotate,
+    display_rotation,
+    get_region_error,
+    region_size,
+)
+
+try:
+    import av
+except ImportError:  # Optional dependency, installed with the "pyav" extra
+    av = None
+
+MAX_PALETTE_FRAMES = 64
+
+# PIL equivalents of the ffmpeg preset settings. PIL has no ordered (bayer)
+# dithering for palette images, so "bayer" falls back to no dithering.
+_RESAMPLING = {
+    "lanczos": Image.Resampling.LANCZOS,
+    "bicubic": Image.Resampling.BICUBIC,
+    "bilinear": Image.Resampling.BILINEAR,
+    "fast_bilinear": Image.Resampling.BILINEAR,
+    "neighbor": Image.Resampling.NEAREST,
+}
+_DITHER = {"floyd_steinberg": Image.Dither.FLOYDSTEINBERG}
+
+
+def get_clip_info(input_path: str) -> dict:
+    """
+    Reads duration and displayed frame size in-process, without spawning
+    ffprobe
+    """
+    with _open_container(input_path) as container:
+        return _read_clip_info(container, container.streams.video[0])
+
+
+def pyav_video_to_gif(
+    input_path: str,
+    output_path: str,
+    start_time: float,
+    duration: float,
+    fps: int,
+    resize_factor: float,
+    preset: dict,
+    preview: tuple[str, int] | None = None,
+    crop: tuple[int, int, int, int] | None = None,
+    rotation: int = 0,
+):
+    """
+    Converts a video to GIF decoding the input only once.
+
+    The decoded frames are shared by the probe, the palette generation and the
+    encoding, instead of running one ffmpeg process for each step. They're
+    also scaled down for the `preview` rendition, (path, maximum height), if any.
+    Like with ffmpeg, frames are turned as their display matrix says before
+    `crop` and `rotation` are applied.
+    """
+    resampling = _RESAMPLING.get(preset["scaler"], Image.Resampling.LANCZOS)
+    dither = _DITHER.get(preset["dither"], Image.Dither.NONE)
+    with _open_container(input_path) as container:
+        stream = container.streams.video[0]
+        with span("probe") as probe_span:
+            clip_info = _read_clip_info(container, stream)
+            probe_span.set(clip_duration=clip_info["duration"], size=clip_info["size"])
+        if error := get_region_error(crop, clip_info["size"]):
+            raise ValueError(error)
+        with span("decode") as decode_span:
+            frames = _decode_frames(
+                container,
+                stream,
+                start_time,
+                duration,
+                fps,
+                lambda image: _scale_frame(
+                    crop_and_rotate(image, crop, rotation), resize_factor, resampling
+                ),
+            )
+            decode_span.set(frames=len(frames))
+    if not frames:
+        raise ValueError(f"No frames could be decoded from '{input_path}'.")
+    with span("palette", max_colors=preset["max_colors"]):
+        palette = _generate_palette(frames, preset["max_colors"])
+    with span("encode", frames=len(frames)):
+        _create_gif(frames, palette, output_path, fps, dither)
+        if preview is not None:
+            preview_path, preview_height = preview
+            preview_frames = [
+                _fit_height(frame, preview_height, resampling) for frame in frames
+            ]
+            _create_gif(preview_frames, palette, preview_path, fps, dither)
+
+
+def _open_container(input_path: str):
+    if av is None:
+        raise ValueError(
+            "The 'pyav' video backend requires PyAV: install it with the 'pyav' extra."
+        )
+    try:
+        return av.open(input_path)
+    except (av.FFmpegError, FileNotFoundError) as e:
+        raise ValueError(f"Could not get video info. Is '{input_path}' valid?") from e
+
+
+def _read_clip_info(container, stream) -> dict:
+    # PyAV only exposes the display matrix on frames: decodes the first one
+    frame = next(container.decode(stream), None)
+    rotation = display_rotation(frame.rotation) if frame is not None else 0
+    size = (stream.codec_context.width, stream.codec_context.height)
+    return {
+        "duration": _get_duration(container, stream),
+        "size": region_size(size, None, rotation),
+    }
+
+
+def _get_duration(container, stream) -> float:
+    if container.duration is not None:
+        return container.duration / av.time_base
+    if stream.duration is not None:
+        return float(stream.duration * stream.time_base)
+    raise ValueError("Could not get video duration.")
+
+
+def _decode_frames(
+    container,
+    stream,
+    start_time: float,
+    duration: float,
+    fps: int,
+    transform,
+) -> list[Image.Image]:
+    """
+    Decodes [start_time, start_time + duration] once, resampled to `fps`. Each
+    frame kept is turned for display, then goes through `transform` (crop,
+    rotation and scaling) once
+    """
+    # Also rewinds after the probe's frame
+    container.seek(int(start_time * av.time_base), backward=True)
+    frames = []
+    for frame in container.decode(stream):
+        if frame.time is None:
+            continue
+        clip_time = frame.time - start_time
+        image = None
+        # Like ffmpeg's fps filter: each output tick takes the nearest input frame
+        while clip_time + 0.5 / fps >= len(frames) / fps:
+            if duration and len(frames) / fps >= duration:
+                return frames
+            if image is None:
+                image = transform(_displayed_image(frame))
+            frames.append(image)
+    return frames
+
+
+def _displayed_image(frame) -> Image.Image:
+    return crop_and_rotate(frame.to_image(), None, display_rotation(frame.rotation))
+
+
+def _scale_frame(
+    image: Image.Image, resize_factor: float, resampling: Image.Resampling
+) -> Image.Image:
+    if resize_factor == 1.0:
+        return image
+    width, height = image.size
+    size = (max(1, int(width * resize_factor)), max(1, int(height * resize_factor)))
+    return image.resize(size, resampling)
+
+
+def _fit_height(
+    image: Image.Image, max_height: int, resampling: Image.Resampling
+) -> Image.Image:
+    width, height = image.size
+    if height <= max_height:
+        return image
+    return image.resize(
+        (max(1, round(width * max_height / height)), max_height), resampling
+    )
+
+
+def _generate_palette(frames: list[Image.Image], max_colors: int) -> Image.Image:
+    """Builds one palette from the statistics of the whole clip (stats_mode=full)"""
+    sampled_frames = frames[:: max(1, len(frames) // MAX_PALETTE_FRAMES)]
+    width, height = frames[0].size
+    mosaic = Image.new("RGB", (width, height * len(sampled_frames)))
+    for index, frame in enumerate(sampled_frames):
+        mosaic.paste(frame, (0, index * height))
+    return mosaic.quantize(colors=max_colors, method=Image.Quantize.MEDIANCUT)
+
+
+def _create_gif(
+    frames: list[Image.Image],
+    palette: Image.Image,
+    output_path: str,
+    fps: int,
+    dither: Image.Dither,
+):
+    gif_frames = [frame.quantize(palette=palette, dither=dither) for frame in frames]
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    gif_frames[0].save(
+        output_path,
+        format="GIF",
+        save_all=True,
+        append_images=gif_frames[1:],
+        duration=round(1000 / fps),
+        loop=0,
+    )
@@ -1,21 +1,39 @@
 from pathlib import Path
 
-import uuid_utils as uuid
-from taipy.gui import hold_control, notify, resume_control
+from taipy.gui import get_state_id, notify
 
-from algorithms.video_to_gif_functions import video_to_gif
+from algorithms.artifact_storage import (
+    keep_artifact,
+    new_artifact_path,
+    track_artifact,
+)
+from algorithms.session_activity import activity
+from algorithms.shared_store import get_shared_store
+from algorithms.tracing import span
+from algorithms.video_ingest import ingest_video, release_video
+from algorithms.video_region import draw_region, extract_keyframe, get_region_error
+from algorithms.video_to_gif_batch import convert_batch_to_zip
+from algorithms.video_to_gif_functions import get_parameter_error, video_to_gif
 from algorithms.video_to_gif_get_duration import get_clip_duration
+from algorithms.video_trim_functions import trim_video
+from taipy_utilities.taipy_callback import taipy_callback
 
+# State variables that the clip and region checks read
+_CLIP_INPUTS = (
+    "start_time",
+    "duration",
+    "video_duration",
+    "video_width",
+    "video_height",
+    "crop_enabled",
+    "crop_x",
+    "crop_y",
+    "crop_width",
+    "crop_height",
+)
 
-def _delete_file(content_path):
-    if content_path.is_file():
-        content_path.unlink()
 
-
-def _calculate_file_size(content_path):
-    if not content_path.is_file():
-        return " - "
-    size_bytes = content_path.stat().st_size
+def _format_file_size(size_bytes):
     thresholds = [(1024**3, "GB"), (1024**2, "MB"), (1024, "KB"), (0, "B")]
 
     for factor, suffix in thresholds:
@@ -25,71 +43,269 @@ def _calculate_file_size(content_path):
             return f"{size_bytes / factor:.2f} {suffix}"
 
 
+def _release_upload(state, video_path):
+    activity.remove_upload(get_state_id(state), video_path)
+    release_video(video_path)
+
+
 def _clean_parameters(state):
     with state as s:
         s.video_duration = 0
-        _delete_file(s.content_path)
+        _release_upload(s, s.content_path)
         s.content_path = ""
         s.content = ""
         s.video_is_selected = False
         s.file_size = " - "  # For display as None but as string
         s.file_name = " - "
+        s.keyframe = None
+        s.region_preview = None
+        s.crop_enabled = False
 
 
+@taipy_callback(execution="thread", inputs=("content",))
 def select_video(state):
-    with state as s:
+    with state as s, span("select_video", session=get_state_id(s)) as select_span:
+        s.file_name = Path(s.content).name
+        with span("ingest"):
+            video = ingest_video(s.content)
+        # Released after a conversion, or if the session goes idle
+        activity.add_upload(get_state_id(s), video["path"])
+        select_span.set(input_bytes=video["size"], sha256=video["sha256"])
+        s.content = video["path"]
         s.content_path = Path(s.content)
         s.gif_is_ready = False
+        s.clip_is_ready = False
         s.video_duration = get_clip_duration(s.content)
-        s.file_size = _calculate_file_size(s.content_path)
+        s.file_size = _format_file_size(video["size"])
         s.video_is_selected = True
-        s.file_name = s.content_path.name
+        with span("keyframe"):
+            s.keyframe, (s.video_width, s.video_height) = extract_keyframe(s.content)
+        # The region picker starts with the whole frame
+        s.crop_enabled = False
+        s.crop_x, s.crop_y = 0, 0
+        s.crop_width, s.crop_height = s.video_width, s.video_height
+        s.rotation = "0"
+        s.region_preview = draw_region(
+            s.keyframe, (s.video_width, s.video_height), None, 0
+        )
+
+
+def _selected_crop(state):
+    with state as s:
+        if not s.crop_enabled:
+            return None
+        return (int(s.crop_x), int(s.crop_y), int(s.crop_width), int(s.crop_height))
+
+
+@taipy_callback
+def update_region(state):
+    """Redraws the region picker once the crop or rotation changed"""
+    with state as s:
+        if s.keyframe is None:
+            return
+        size = (s.video_width, s.video_height)
+        crop = _selected_crop(s)
+        # An invalid region is reported when converting, not while it's typed
+        if get_region_error(crop, size) is None:
+            s.region_preview = draw_region(s.keyframe, size, crop, int(s.rotation))
 
 
 def _parameters_are_wrong(state):
     with state as s:
-        checks = [
-            (
-                s.duration > s.video_duration,
-                "Duration shouldn't be longer than total file duration.",
-            ),
-            (
-                s.start_time > s.video_duration,
-                "Start Time shouldn't be after video ends!",
-            ),
-            (
-                (s.duration + s.start_time) > s.video_duration,
-                "Duration + Start Time can't be longer than total file duration.",
-            ),
-        ]
-        for condition, message in checks:
-            if condition:
-                notify(s, "e", message)
-                return True
+        message = get_parameter_error(
+            s.start_time, s.duration, s.video_duration
+        ) or get_region_error(_selected_crop(s), (s.video_width, s.video_height))
+        if message:
+            notify(s, "e", message)
+            return True
     return False
 
 
-def _assert_gif_ready(state, file_output_name):
+def _assert_gif_ready(state, file_output_name, preview_name):
     with state as s:
         s.gif_is_ready = True
         s.content_download = file_output_name
+        s.gif_preview = preview_name
         notify(s, "s", "GIF Generated Successfully!")
 
 
+@taipy_callback(
+    tool="video",
+    execution="thread",
+    inputs=(
+        *_CLIP_INPUTS,
+        "content",
+        "content_path",
+        "file_name",
+        "rotation",
+        "fps",
+        "resize_factor",
+        "gif_preset",
+        "gif_optimize",
+        "gif_tolerance",
+    ),
+    hold_message="Generating GIF",
+)
 def convert_to_gif(state):
     with state as s:
         if _parameters_are_wrong(s):
             return
-        hold_control(s, message="Generating GIF")
-        file_output_name = f"./deposit_files/{uuid.uuid4()}.gif"
-        if video_to_gif(
-            input_path=s.content,
-            output_path=file_output_name,
-            start_time=s.start_time,
-            duration=s.duration,
-            fps=int(s.fps),
-            resize_factor=s.resize_factor,
-        ):
-            _assert_gif_ready(s, file_output_name)
+        file_output_name = new_artifact_path(".gif")
+        # Displayed on the page: the full GIF is only sent when downloaded
+        preview_output_name = new_artifact_path(".gif")
+        job_id = get_shared_store().start_job("gif", s.file_name)
+        converted = False
+        try:
+            with span("convert_to_gif", session=get_state_id(s), job_id=job_id):
+                converted = video_to_gif(
+                    input_path=s.content,
+                    output_path=file_output_name,
+                    start_time=s.start_time,
+                    duration=s.duration,
+                    fps=int(s.fps),
+                    resize_factor=s.resize_factor,
+                    preset=s.gif_preset,
+                    preview_path=preview_output_name,
+                    crop=_selected_crop(s),
+                    rotation=s.rotation,
+                    optimize=s.gif_optimize,
+                    tolerance=int(s.gif_tolerance),
+                )
+                if converted:
+                    with span("store_artifact"):
+                        artifact = keep_artifact(file_output_name, get_state_id(s))
+                        preview = keep_artifact(preview_output_name, get_state_id(s))
+                    _assert_gif_ready(s, artifact, preview)
+                else:
+                    notify(s, "e", "GIF conversion failed.")
+        finally:
+            get_shared_store().finish_job(
+                job_id, None if converted else "GIF conversion failed."
+            )
+    _clean_parameters(state)
+
+
+def _assert_clip_ready(state, file_output_name):
+    with state as s:
+        s.clip_is_ready = True
+        s.clip_download = file_output_name
+        notify(s, "s", "Clip Trimmed Successfully!")
+
+
+@taipy_callback(
+    tool="video",
+    execution="thread",
+    inputs=(*_CLIP_INPUTS, "content", "content_path", "file_name", "trim_mode"),
+    hold_message="Trimming Clip",
+)
+def trim_clip(state):
+    with state as s:
+        if _parameters_are_wrong(s):
+            return
+        suffix = s.content_path.suffix
+        file_output_name = new_artifact_path(suffix)
+        job_id = get_shared_store().start_job("trim", s.file_name)
+        trimmed = False
+        try:
+            trimmed = trim_video(
+                input_path=s.content,
+                output_path=file_output_name,
+                start_time=s.start_time,
+                duration=s.duration,
+                mode=s.trim_mode,
+            )
+        finally:
+            get_shared_store().finish_job(job_id, None if trimmed else "Trim failed.")
+        if trimmed:
+            track_artifact(file_output_name, get_state_id(s))
+            _assert_clip_ready(s, file_output_name)
+        else:
+            notify(s, "e", "Trim failed.")
     _clean_parameters(state)
-    resume_control(state)
+
+
+def _batch_paths(batch_content):
+    if not batch_content:
+        return []
+    if isinstance(batch_content, str):
+        return [batch_content]
+    return list(batch_content)
+
+
+def select_batch_videos(state):
+    with state as s:
+        s.batch_is_ready = False
+        video_paths = []
+        for upload_path in _batch_paths(s.batch_content):
+            try:
+                video_paths.append(ingest_video(upload_path)["path"])
+            except ValueError as e:
+                notify(s, "w", str(e))
+        for video_path in video_paths:
+            activity.add_upload(get_state_id(s), video_path)
+        s.batch_content = video_paths
+        s.batch_file_count = len(video_paths)
+        s.batch_is_selected = s.batch_file_count > 0
+
+
+def _clean_batch_parameters(state):
+    with state as s:
+        for input_path in _batch_paths(s.batch_content):
+            _release_upload(s, input_path)
+        s.batch_content = None
+        s.batch_file_count = 0
+        s.batch_is_selected = False
+
+
+def _notify_batch_results(state, results):
+    failed = {path: error for path, error in results.items() if error}
+    with state as s:
+        if len(failed) == len(results):
+            notify(s, "e", "No GIF could be generated!")
+            return
+        s.batch_is_ready = True
+        if not failed:
+            notify(s, "s", f"{len(results)} GIFs Generated Successfully!")
+            return
+        details = "; ".join(
+            f"{Path(path).name}: {error}" for path, error in failed.items()
+        )
+        notify(s, "w", f"{len(failed)}/{len(results)} files skipped. {details}")
+
+
+@taipy_callback(
+    tool="video",
+    execution="thread",
+    inputs=(
+        "batch_content",
+        "start_time",
+        "duration",
+        "fps",
+        "resize_factor",
+        "gif_preset",
+    ),
+    hold_message="Generating GIFs",
+)
+def convert_batch_to_gif(state):
+    with state as s:
+        zip_output_name = new_artifact_path(".zip")
+        input_paths = _batch_paths(s.batch_content)
+        job_id = get_shared_store().start_job("gif_batch", f"{len(input_paths)} videos")
+        job_error = "Batch conversion failed."
+        try:
+            results = convert_batch_to_zip(
+                input_paths=input_paths,
+                zip_path=zip_output_name,
+                start_time=s.start_time,
+                duration=s.duration,
+                fps=int(s.fps),
+                resize_factor=s.resize_factor,
+                preset=s.gif_preset,
+            )
+            failed = sum(error is not None for error in results.values())
+            job_error = f"{failed} files failed." if failed == len(results) else None
+        finally:
+            get_shared_store().finish_job(job_id, job_error)
+        s.batch_download = track_artifact(zip_output_name, get_state_id(s))
+        _notify_batch_results(s, results)
+    _clean_batch_parameters(state)
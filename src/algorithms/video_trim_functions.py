@@ -0,0 +1,271 @@
+import logging
+import tempfile
+from pathlib import Path
+
+import ffmpeg
+
+from .tracing import span
+from .video_to_gif_functions import _create_dir_if_not_exist, _validate_input_file
+
+TRIM_MODES = ("keyframe", "smart")
+
+# Encoders used to re-encode the leading GOP in "smart" mode, by source codec
+_SMART_TRIM_ENCODERS = {
+    "h264": "libx264",
+    "hevc": "libx265",
+    "mpeg4": "mpeg4",
+    "aac": "aac",
+    "mp3": "libmp3lame",
+    "opus": "libopus",
+    "vorbis": "libvorbis",
+}
+# ffprobe profile names, as the encoders' `profile` option spells them
+_ENCODER_PROFILES = {
+    "h264": {
+        "Constrained Baseline": "baseline",
+        "Baseline": "baseline",
+        "Main": "main",
+        "High": "high",
+        "High 10": "high10",
+        "High 4:2:2": "high422",
+        "High 4:4:4 Predictive": "high444",
+    },
+    "aac": {"LC": "aac_low"},
+}
+# Codecs with open-GOP keyframes (HEVC CRA): the frames right after one may
+# reference frames before it, which the re-encoded head doesn't have
+_OPEN_GOP_CODECS = ("hevc",)
+# What the re-encoded head must share with the stream-copied tail to be joined
+_MATCHED_PARAMETERS = {
+    "video": (
+        "codec_name",
+        "profile",
+        "level",
+        "pix_fmt",
+        "width",
+        "height",
+        "time_base",
+        "nal_length_size",
+    ),
+    "audio": ("codec_name", "profile", "sample_rate", "channels"),
+}
+# Containers whose video timescale can be set: the head's must be the source's
+_TIMESCALE_SUFFIXES = (".mp4", ".m4v", ".mov")
+
+logger = logging.getLogger(__name__)
+
+
+def trim_video(
+    input_path: str,
+    output_path: str,
+    start_time: float = 0,
+    duration: float | None = None,
+    mode: str = "keyframe",
+) -> bool:
+    """
+    Cuts [start_time, start_time + duration] out of a video without re-encoding.
+    A `duration` of None cuts until the end of the video.
+
+    Modes:
+        keyframe: Stream copy only, the clip starts at the keyframe before
+            start_time.
+        smart: Re-encodes only the frames between start_time and the next
+            keyframe, and stream copies the rest, for a frame-accurate start.
+            The re-encoded frames match the source's codecs, profile, level,
+            pixel format and audio format; if they can't, the clip is cut
+            like in keyframe mode.
+    """
+    with span("trim_video", mode=mode, duration=duration) as trim_span:
+        try:
+            _validate_input_file(input_path)
+            if mode not in TRIM_MODES:
+                raise ValueError(
+                    f"Unsupported trim mode: {mode}. "
+                    f"Supported modes: {', '.join(TRIM_MODES)}"
+                )
+            _create_dir_if_not_exist(output_path)
+            if mode == "smart":
+                _smart_trim(input_path, output_path, start_time, duration)
+            else:
+                _stream_copy(input_path, output_path, start_time, duration)
+            return True
+        except ffmpeg.Error as e:
+            error = f"ffmpeg error: {e.stderr.decode('utf8')[-500:]}"
+        except (OSError, ValueError) as e:
+            error = f"{type(e).__name__}: {e}"
+        trim_span.fail(error)
+        logger.warning("Could not trim '%s': %s", input_path, error)
+        return False
+
+
+def _input(input_path: str, start_time: float, duration: float | None):
+    """The input stream from start_time, until the end if duration is None"""
+    if duration is None:
+        return ffmpeg.input(input_path, ss=start_time)
+    return ffmpeg.input(input_path, ss=start_time, t=duration)
+
+
+def _stream_copy(
+    input_path: str, output_path: str, start_time: float, duration: float | None
+):
+    # Input seeking with stream copy snaps to the keyframe before start_time
+    input_stream = _input(input_path, start_time, duration)
+    ffmpeg.run(
+        ffmpeg.output(
+            input_stream, output_path, c="copy", avoid_negative_ts="make_zero"
+        ),
+        overwrite_output=True,
+        quiet=True,
+    )
+
+
+def _copy_tail(input_path: str, output_path: str, keyframe: float, duration: float):
+    # Timestamps stay relative to the keyframe, on the frame grid: unlike with
+    # make_zero, the concat demuxer appends the tail right after the head
+    input_stream = _input(input_path, keyframe, duration)
+    ffmpeg.run(
+        ffmpeg.output(input_stream, output_path, c="copy"),
+        overwrite_output=True,
+        quiet=True,
+    )
+
+
+def _smart_trim(
+    input_path: str, output_path: str, start_time: float, duration: float | None
+):
+    probe = ffmpeg.probe(input_path)
+    streams = _first_streams(probe)
+    if "video" not in streams:
+        raise ValueError(f"'{input_path}' has no video stream.")
+    encoder = _SMART_TRIM_ENCODERS.get(streams["video"]["codec_name"])
+    end_time = start_time + duration if duration else float(probe["format"]["duration"])
+    keyframe = _next_keyframe(input_path, start_time, end_time)
+    if encoder is None or keyframe is None:
+        _reencode(input_path, output_path, start_time, end_time, encoder)
+        return
+    # Streams the head can't match are cut at the keyframe instead
+    head_options = _matching_options(streams, Path(output_path).suffix)
+    if keyframe - start_time < 0.001 or head_options is None:
+        _stream_copy(input_path, output_path, start_time, duration)
+        return
+    suffix = Path(output_path).suffix
+    with tempfile.TemporaryDirectory() as temp_dir:
+        head_path = str(Path(temp_dir) / f"head{suffix}")
+        tail_path = str(Path(temp_dir) / f"tail{suffix}")
+        _reencode_head(input_path, head_path, start_time, keyframe, head_options)
+        head_streams = _first_streams(ffmpeg.probe(head_path))
+        if _joined_parameters(head_streams) != _joined_parameters(streams):
+            # The tail would be decoded with the head's parameters
+            _stream_copy(input_path, output_path, start_time, duration)
+            return
+        _copy_tail(input_path, tail_path, keyframe, end_time - keyframe)
+        _concat([head_path, tail_path], output_path, Path(temp_dir))
+
+
+def _first_streams(probe: dict) -> dict:
+    """The first video and audio streams of an ffprobe result, by codec type"""
+    streams = {}
+    for stream in probe["streams"]:
+        kind = stream["codec_type"]
+        if stream.get("disposition", {}).get("attached_pic"):
+            continue
+        if kind in _MATCHED_PARAMETERS and kind not in streams:
+            streams[kind] = stream
+    return streams
+
+
+def _joined_parameters(streams: dict) -> dict:
+    return {
+        kind: {key: stream.get(key) for key in _MATCHED_PARAMETERS[kind]}
+        for kind, stream in streams.items()
+    }
+
+
+def _matching_options(streams: dict, suffix: str) -> dict | None:
+    """
+    ffmpeg output options that encode like the source streams, or None if the
+    head can't be joined to them
+    """
+    options = {}
+    for kind, specifier in (("video", "v"), ("audio", "a")):
+        if kind not in streams:
+            continue
+        stream = streams[kind]
+        codec = stream["codec_name"]
+        if codec not in _SMART_TRIM_ENCODERS or codec in _OPEN_GOP_CODECS:
+            return None
+        options[f"c:{specifier}"] = _SMART_TRIM_ENCODERS[codec]
+        if profile := _ENCODER_PROFILES.get(codec, {}).get(stream.get("profile")):
+            options[f"profile:{specifier}"] = profile
+        if stream.get("bit_rate"):
+            options[f"b:{specifier}"] = stream["bit_rate"]
+    video = streams["video"]
+    options["pix_fmt"] = video["pix_fmt"]
+    if video["codec_name"] == "h264":
+        options["level:v"] = f"{video['level'] / 10:.1f}"
+    if suffix.lower() in _TIMESCALE_SUFFIXES:
+        options["video_track_timescale"] = video["time_base"].split("/")[1]
+    if "audio" in streams:
+        options["ar"] = streams["audio"]["sample_rate"]
+        options["ac"] = streams["audio"]["channels"]
+    return options
+
+
+def _next_keyframe(input_path: str, start_time: float, end_time: float) -> float | None:
+    """Returns the time of the first keyframe in [start_time, end_time)"""
+    probe = ffmpeg.probe(
+        input_path,
+        select_streams="v:0",
+        skip_frame="nokey",
+        show_entries="frame=pts_time",
+        read_intervals=f"{start_time}%{end_time}",
+    )
+    for frame in probe.get("frames", []):
+        frame_time = float(frame.get("pts_time", "nan"))
+        if start_time <= frame_time < end_time:
+            return frame_time
+    return None
+
+
+def _reencode(
+    input_path: str,
+    output_path: str,
+    start_time: float,
+    end_time: float,
+    encoder: str | None,
+):
+    input_stream = _input(input_path, start_time, end_time - start_time)
+    ffmpeg.run(
+        ffmpeg.output(input_stream, output_path, vcodec=encoder or "libx264"),
+        overwrite_output=True,
+        quiet=True,
+    )
+
+
+def _reencode_head(
+    input_path: str,
+    output_path: str,
+    start_time: float,
+    end_time: float,
+    options: dict,
+):
+    input_stream = _input(input_path, start_time, end_time - start_time)
+    ffmpeg.run(
+        ffmpeg.output(input_stream, output_path, **options),
+        overwrite_output=True,
+        quiet=True,
+    )
+
+
+def _concat(part_paths: list[str], output_path: str, temp_dir: Path):
+    list_path = temp_dir / "parts.txt"
+    list_path.write_text("".join(f"file '{path}'\n" for path in part_paths))
+    ffmpeg.run(
+        ffmpeg.output(
+            ffmpeg.input(str(list_path), format="concat", safe=0),
+            output_path,
+            c="copy",
+        ),
+        overwrite_output=True,
+        quiet=True,
+    )
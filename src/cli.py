@@ -0,0 +1,230 @@
+"""
+Runs the Taipy Tools algorithms from the command line, without the GUI.
+
+Run from the src directory:
+
+    python cli.py uuid --type 7 --count 1000000 > uuids.txt
+    python cli.py uuid --type 5 --namespace URL --names urls.txt > uuids.csv
+    python cli.py qr --output-dir qr_codes < messages.txt
+    python cli.py gif videos/ --output-dir gifs --duration 3 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+VIDEO_EXTENSIONS = (".mp4", ".avi")
+
+
+def main(argv: list[str] | None = None):
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    try:
+        count, failed = args.command(args)
+    except (ValueError, OSError) as e:
+        parser.exit(1, f"error: {e}\n")
+    elapsed = time.perf_counter() - start
+    print(
+        f"{count:,} {args.unit} in {elapsed:.2f} s "
+        f"({count / elapsed:,.0f}/s, {args.workers or os.cpu_count()} workers)"
+        + (f", {failed:,} failed" if failed else ""),
+        file=sys.stderr,
+    )
+    if failed:
+        sys.exit(1)
+
+
+def run_uuid(args) -> tuple[int, int]:
+    if args.type in ("3", "5"):
+        from algorithms.uuid_names import iter_name_uuid_chunks, write_name_uuid_rows
+
+        with _open_lines(args.names) as lines:
+            chunks = iter_name_uuid_chunks(
+                lines, args.type, args.namespace, max_workers=args.workers
+            )
+            return write_name_uuid_rows(sys.stdout, chunks), 0
+
+    from algorithms.uuid_bulk import iter_uuid_batches
+
+    # Random and time-based UUIDs are cheaper to generate than to send between
+    # processes: they're generated in this process only
+    args.workers = 1
+    if args.format == "csv":
+        sys.stdout.write("uuid\n")
+    sys.stdout.writelines(iter_uuid_batches(args.type, args.count))
+    return args.count, 0
+
+
+def run_qr(args) -> tuple[int, int]:
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    options = {
+        "add_logo": args.logo,
+        "dark_color": args.dark_color,
+        "light_color": args.light_color,
+        "transparent_background": args.transparent,
+        "qr_scale": args.scale,
+        "qr_border": args.border,
+    }
+    with _open_lines(args.messages) as lines:
+        jobs = (
+            (message, str(output_dir / f"{index:05d}.png"), options)
+            for index, message in enumerate(
+                (line.rstrip("\r\n") for line in lines if line.strip()), start=1
+            )
+        )
+        return _run_jobs(_qr_job, jobs, args.workers)
+
+
+def run_gif(args) -> tuple[int, int]:
+    from algorithms.video_to_gif_functions import DEFAULT_VIDEO_BACKEND
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_names = set()
+    jobs = (
+        (
+            input_path,
+            str(output_dir / _unique_name(input_path, output_names)),
+            args.start,
+            args.duration,
+            args.fps,
+            args.resize,
+            args.backend or DEFAULT_VIDEO_BACKEND,
+            args.preset,
+        )
+        for input_path in _find_videos(args.inputs)
+    )
+    return _run_jobs(_gif_job, jobs, args.workers)
+
+
+def _qr_job(message: str, output_path: str, options: dict) -> str | None:
+    from algorithms.qr_code_functions import render_qr_code
+
+    try:
+        Path(output_path).write_bytes(render_qr_code(message, **options))
+    except ValueError as e:
+        return f"{message[:40]!r}: {e}"
+    return None
+
+
+def _gif_job(input_path: str, output_path: str, *parameters) -> str | None:
+    from algorithms.video_to_gif_batch import convert_one
+
+    _, error = convert_one(input_path, output_path, *parameters)
+    return f"{input_path}: {error}" if error else None
+
+
+def _run_jobs(job, jobs, workers: int | None) -> tuple[int, int]:
+    """Runs jobs on a process pool, with a bounded number of jobs in flight"""
+    workers = workers or os.cpu_count()
+    count = failed = 0
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for job_args in jobs:
+            pending.append((job_args[0], executor.submit(job, *job_args)))
+            if len(pending) >= 4 * workers:
+                failed += _report(*pending.popleft())
+                count += 1
+        while pending:
+            failed += _report(*pending.popleft())
+            count += 1
+    return count, failed
+
+
+def _report(job_input, future) -> int:
+    """Prints the job's error, or the exception it raised: returns 1 if it failed"""
+    if (exception := future.exception()) is not None:
+        error = f"{job_input}: {type(exception).__name__}: {exception}"
+    elif (error := future.result()) is None:
+        return 0
+    print(f"error: {error}", file=sys.stderr)
+    return 1
+
+
+def _open_lines(path: str):
+    if path == "-":
+        return nullcontext(sys.stdin)
+    return Path(path).open(encoding="utf-8")
+
+
+def _find_videos(inputs: list[str]):
+    for input_path in map(Path, inputs):
+        if input_path.is_dir():
+            for video_path in sorted(input_path.iterdir()):
+                if video_path.suffix.lower() in VIDEO_EXTENSIONS:
+                    yield str(video_path)
+        else:
+            yield str(input_path)
+
+
+def _unique_name(input_path: str, names: set) -> str:
+    stem = Path(input_path).stem
+    name = f"{stem}.gif"
+    index = 1
+    while name in names:
+        name = f"{stem}_{index}.gif"
+        index += 1
+    names.add(name)
+    return name
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="taipy-tools", description=__doc__.splitlines()[1]
+    )
+    subparsers = parser.add_subparsers(required=True)
+
+    uuid_parser = subparsers.add_parser(
+        "uuid", help="Print UUIDs, or a name,uuid CSV for versions 3 and 5"
+    )
+    uuid_parser.add_argument("--type", default="4", help="1, 3, 4, 5, 6 or 7")
+    uuid_parser.add_argument("--count", type=int, default=1)
+    uuid_parser.add_argument("--format", choices=("txt", "csv"), default="txt")
+    uuid_parser.add_argument(
+        "--names", default="-", help="File with one name per line (default: stdin)"
+    )
+    uuid_parser.add_argument(
+        "--namespace", default="DNS", help="DNS, URL, OID, X500 or a UUID"
+    )
+    uuid_parser.set_defaults(command=run_uuid, unit="UUIDs")
+
+    qr_parser = subparsers.add_parser("qr", help="Create one QR code PNG per line")
+    qr_parser.add_argument(
+        "messages", nargs="?", default="-", help="Text file (default: stdin)"
+    )
+    qr_parser.add_argument("--output-dir", default="qr_codes")
+    qr_parser.add_argument("--dark-color", default="black")
+    qr_parser.add_argument("--light-color", default="white")
+    qr_parser.add_argument("--transparent", action="store_true")
+    qr_parser.add_argument("--logo", action="store_true")
+    qr_parser.add_argument("--scale", type=int, default=8)
+    qr_parser.add_argument("--border", type=int, default=4)
+    qr_parser.set_defaults(command=run_qr, unit="QR codes")
+
+    gif_parser = subparsers.add_parser("gif", help="Convert videos to GIF")
+    gif_parser.add_argument("inputs", nargs="+", help="Videos or folders of videos")
+    gif_parser.add_argument("--output-dir", default="gifs")
+    gif_parser.add_argument("--start", type=float, default=0)
+    gif_parser.add_argument("--duration", type=float, default=None)
+    gif_parser.add_argument("--fps", type=int, default=10)
+    gif_parser.add_argument("--resize", type=float, default=1.0)
+    gif_parser.add_argument("--preset", default="best", help="fast, balanced, best")
+    gif_parser.add_argument("--backend", default=None, help="ffmpeg or pyav")
+    gif_parser.set_defaults(command=run_gif, unit="GIFs")
+
+    for subparser in (uuid_parser, qr_parser, gif_parser):
+        subparser.add_argument(
+            "--workers", type=int, default=None, help="Processes (default: CPU count)"
+        )
+    return parser
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+# gunicorn settings, read from the working directory (src/, or /app in the Docker
+# image). Taipy keeps each GUI session, with its state and memory artifacts, in
+# the worker that opened it, and a load balancer can pin a session to a
+# container but not to one of its workers: each container runs a single
+# worker, and the app scales by running more containers.
+import os
+
+
+def on_starting(server):
+    if server.cfg.workers != 1:
+        raise RuntimeError(
+            f"Taipy Tools runs a single gunicorn worker, got {server.cfg.workers} "
+            "(WEB_CONCURRENCY or --workers): run more containers instead"
+        )
+
+
+def post_fork(server, worker):
+    # Claimed before the app loads, so the worker's process pools, which
+    # inherit the variable, start looking for a free worker ID after it
+    from algorithms.uuid_monotonic import default_worker_id
+
+    os.environ["TAIPY_TOOLS_WORKER_ID"] = str(default_worker_id())
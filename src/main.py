@@ -1,52 +1,123 @@
+import os
+
+from flask import Flask
 from taipy.gui import Gui
 
-from pages import qr_code_page, root, uuid_page, video_gif_page
+from algorithms.admission_control import admission
+from algorithms.artifact_storage import start_eviction
+from algorithms.http_api import api, mark_ready
+from pages import format_load_report, load_tool_pages
+from pages.root import root
+from taipy_utilities.session_hooks import on_session_end
+from taipy_utilities.session_reaper import free_ended_session, start_reaper
 
-tool_pages = {
-    "/": root,
-    "uuid_generator": uuid_page,
-    "video_to_gif": video_gif_page,
-    "QR_code_generator": qr_code_page,
-}
+# Only the tools enabled with TAIPY_TOOLS (default: all) are imported
+tool_pages = {"/": root, **load_tool_pages()}
+# The admin page only exists when a token is set to unlock it
+if os.environ.get("TAIPY_TOOLS_ADMIN_TOKEN"):
+    from pages.admin import admin_page, forget_admin_session
+
+    tool_pages["admin"] = admin_page
 
 stylekit = {"color_primary": "#1e3a8a", "color_secondary": "#a8dadc"}
+run_options = {
+    "title": "Taipy 🛠️ Tools",
+    "favicon": "./img/logo.png",
+    "dark_mode": False,
+    "stylekit": stylekit,
+    # Seconds before a disconnected session's state and files are deleted (see
+    # TAIPY_TOOLS_SESSION_IDLE_TIMEOUT for the connected ones)
+    "state_retention_period": 300,
+}
+
+# State variables are module-level: wsgi.py reuses them for production
+
+# uuid page:
+uuid_type = "1"
+selected_uuid = ""
+name_for_uuid = ""
+select_name = False
+bulk_uuid_type = "4"
+uuid_count = 100_000
+uuid_file_format = "txt"
+uuid_file = None
+uuid_namespace = "DNS"
+custom_namespace = ""
+names_uuid_type = "5"
+names_content = None
+names_uuid_file = None
+
+# Video to Gif
+content = None
+content_path = None
+file_size = " - "  # For Display, this is "None"
+file_name = " - "
+video_is_selected = False
+start_time = 0
+duration = 1
+fps = 5
+resize_factor = 1.0
+gif_preset = "best"
+gif_optimize = False
+gif_tolerance = 0
+video_duration = 0
+gif_is_ready = False
+content_download = None
+gif_preview = None
+video_width = 0
+video_height = 0
+keyframe = None
+region_preview = None
+crop_enabled = False
+crop_x = 0
+crop_y = 0
+crop_width = 0
+crop_height = 0
+rotation = "0"
+trim_mode = "keyframe"
+clip_is_ready = False
+clip_download = None
+batch_content = None
+batch_file_count = 0
+batch_is_selected = False
+batch_is_ready = False
+batch_download = None
+
+# QR Code page
+qr_code_input = ""
+transparent_background = False
+dark_color = "black"
+light_color = "white"
+add_logo = True
+qr_scale = 8
+qr_border = 4
+image_path = None
+
+# Admin page
+admin_token = ""
+admin_unlocked = False
+metrics_overview = ""
+callback_metrics = {}
+cache_metrics = {}
+ffmpeg_metrics = {}
+profile_sample_rate = 0.0
+profile_callbacks = ""
+profiling_status = ""
+
+# REST API for machine clients, served next to the GUI
+flask_app = Flask(__name__)
+flask_app.register_blueprint(api)
+
+gui = Gui(pages=tool_pages, css_file="./css/main.css", flask=flask_app)
+on_session_end(gui, free_ended_session)
+on_session_end(gui, admission.forget_session)
+if "admin" in tool_pages:
+    on_session_end(gui, forget_admin_session)
 
 if __name__ == "__main__":
-    # uuid page:
-    uuid_type = "1"
-    selected_uuid = ""
-    name_for_uuid = ""
-    select_name = False
-
-    # Video to Gif
-    content = None
-    content_path = None
-    file_size = " - "  # For Display, this is "None"
-    file_name = " - "
-    video_is_selected = False
-    start_time = 0
-    duration = 1
-    fps = 5
-    resize_factor = 1.0
-    video_duration = 0
-    gif_is_ready = False
-    content_download = None
-
-    # QR Code page
-    qr_code_input = ""
-    transparent_background = False
-    dark_color = "black"
-    light_color = "white"
-    add_logo = True
-    qr_scale = 8
-    qr_border = 4
-    image_path = None
-
-    gui = Gui(pages=tool_pages, css_file="./css/main.css")
-    gui.run(
-        title="Taipy 🛠️ Tools",
-        favicon="./img/logo.png",
-        dark_mode=False,
-        stylekit=stylekit,
-        use_reloader=True,
-    )
+    print(f"Loaded tools:\n{format_load_report()}")
+    start_eviction()
+    start_reaper(gui)
+    mark_ready(require_ffmpeg="video_to_gif" in tool_pages)
+    # Development server: see wsgi.py to run behind gunicorn
+    gui.run(**run_options, use_reloader=True)
@@ -1,4 +1,4 @@
-from .qr_codes import qr_code_page as qr_code_page
-from .root import root as root
-from .uuid_generator import uuid_page as uuid_page
-from .video_to_gif import video_gif_page as video_gif_page
+# Tool pages are imported on demand: importing this package doesn't load Taipy
+from .tool_registry import TOOLS as TOOLS
+from .tool_registry import format_load_report as format_load_report
+from .tool_registry import load_tool_pages as load_tool_pages
@@ -0,0 +1,188 @@
+import hmac
+import os
+import threading
+import time
+from datetime import datetime
+
+import taipy.gui.builder as tgb
+from taipy.gui import get_state_id, invoke_callback, notify
+
+from algorithms.metrics import collect_metrics
+from algorithms.profiling import (
+    disable_profiling,
+    enable_profiling,
+    get_profiling_settings,
+    list_profiles,
+)
+from taipy_utilities.session_hooks import count_sessions
+from taipy_utilities.taipy_callback import taipy_callback
+
+# Seconds between two refreshes of the metrics, for the unlocked sessions
+METRICS_REFRESH_INTERVAL = 5
+# Most recent profiles listed on the page
+LISTED_PROFILES = 10
+
+# State IDs of the sessions unlocked with the token. admin_unlocked only shows
+# the page: the client can set it, so callbacks check this set instead
+_admin_sessions = set()
+_refresh_lock = threading.Lock()
+_refresh_thread = None
+
+
+@taipy_callback
+def unlock_admin(state):
+    """Shows the metrics if the token is TAIPY_TOOLS_ADMIN_TOKEN"""
+    expected = os.environ.get("TAIPY_TOOLS_ADMIN_TOKEN", "")
+    given = state.admin_token
+    state.admin_token = ""
+    if not expected or not hmac.compare_digest(given.encode(), expected.encode()):
+        notify(state, "e", "Wrong admin token")
+        return
+    _start_refresh(state.get_gui(), get_state_id(state))
+    state.admin_unlocked = True
+    refresh_metrics(state)
+
+
+# Not a taipy_callback: the periodic refresh would record its own latency in
+# the metrics it shows, and keep the session from ever being idle
+def refresh_metrics(state):
+    if not _is_unlocked(state):
+        return
+    metrics = collect_metrics(count_sessions(state.get_gui()))
+    state.metrics_overview = _format_overview(metrics)
+    state.callback_metrics = {
+        "callback": list(metrics["callbacks"]),
+        **{
+            column: [summary[column] for summary in metrics["callbacks"].values()]
+            for column in ("calls", "p50", "p95", "p99")
+        },
+    }
+    state.cache_metrics = {
+        "cache": list(metrics["caches"]),
+        **{
+            column: [counts[column] for counts in metrics["caches"].values()]
+            for column in ("hits", "misses", "ratio")
+        },
+    }
+    state.ffmpeg_metrics = {
+        column: [process[column] for process in metrics["ffmpeg"]]
+        for column in ("pid", "parent_pid", "name", "seconds", "cpu_percent", "rss_mib")
+    }
+    state.profiling_status = _format_profiling()
+
+
+@taipy_callback
+def start_profiling(state):
+    """Profiles this worker's callbacks, sampled or by name"""
+    if not _is_unlocked(state):
+        return
+    callbacks = [name.strip() for name in state.profile_callbacks.split(",")]
+    enable_profiling(
+        float(state.profile_sample_rate), [name for name in callbacks if name]
+    )
+    refresh_metrics(state)
+
+
+@taipy_callback
+def stop_profiling(state):
+    if not _is_unlocked(state):
+        return
+    disable_profiling()
+    refresh_metrics(state)
+
+
+def forget_admin_session(client_id: str):
+    """Stops refreshing the metrics of a session that ended"""
+    with _refresh_lock:
+        _admin_sessions.discard(client_id)
+
+
+def _is_unlocked(state) -> bool:
+    with _refresh_lock:
+        return get_state_id(state) in _admin_sessions
+
+
+def _start_refresh(gui, state_id: str):
+    global _refresh_thread
+    with _refresh_lock:
+        _admin_sessions.add(state_id)
+        if _refresh_thread is None:
+            _refresh_thread = threading.Thread(
+                target=_refresh_forever, args=(gui,), daemon=True
+            )
+            _refresh_thread.start()
+
+
+def _refresh_forever(gui):
+    while True:
+        time.sleep(METRICS_REFRESH_INTERVAL)
+        with _refresh_lock:
+            state_ids = list(_admin_sessions)
+        for state_id in state_ids:
+            invoke_callback(gui, state_id, refresh_metrics)
+
+
+def _format_overview(metrics: dict) -> str:
+    running = ", ".join(
+        f"{kind}: {count}" for kind, count in sorted(metrics["running_jobs"].items())
+    )
+    disk = metrics["disk"]
+    freed = metrics["freed_sessions"]
+    collected_at = datetime.fromtimestamp(metrics["collected_at"])
+    return (
+        f"**Worker:** {metrics['pid']} (updated at {collected_at:%H:%M:%S})\n\n"
+        f"**Sessions:** {metrics['sessions']}\n\n"
+        f"**Load:** {metrics['load']} / {metrics['max_load']}\n\n"
+        f"**Running jobs (all workers):** {running or 'none'}\n\n"
+        f"**Batch videos waiting:** {metrics['batch_videos_waiting']}\n\n"
+        f"**deposit_files:** {_mib(disk['deposit_files'])}, "
+        f"artifacts: {_mib(disk['artifacts'])}, "
+        f"in memory: {_mib(disk['memory_artifacts'])}\n\n"
+        f"**Idle or ended sessions freed:** {freed['sessions']} "
+        f"({_mib(freed['disk_bytes'])} on disk, {_mib(freed['memory_bytes'])} "
+        "in memory)"
+    )
+
+
+def _format_profiling() -> str:
+    settings = get_profiling_settings()
+    if settings["enabled"]:
+        callbacks = ", ".join(settings["callbacks"]) or "none"
+        status = (
+            f"**Profiling:** on, {settings['sample_rate']:.1%} of calls, "
+            f"and every call of: {callbacks}"
+        )
+    else:
+        status = "**Profiling:** off"
+    profiles = list_profiles()[-LISTED_PROFILES:]
+    listed = "".join(f"\n- `{path.name}`" for path in reversed(profiles))
+    return f"{status}\n\n**Latest profiles** in `{settings['profile_dir']}`:{listed}"
+
+
+def _mib(size: int) -> str:
+    return f"{size / 1024**2:.1f} MiB"
+
+
+with tgb.Page() as admin_page:
+    tgb.text("## **Admin** Metrics", mode="md")
+    with tgb.part(render="{not admin_unlocked}"), tgb.layout("4 1"):
+        tgb.input("{admin_token}", label="Admin token", password=True)
+        tgb.button("Unlock", on_action=unlock_admin, class_name="fullwidth")
+    with tgb.part(render="{admin_unlocked}"):
+        tgb.button("Refresh", on_action=refresh_metrics)
+        tgb.text("{metrics_overview}", mode="md")
+        tgb.text("### Callback latency (s)", mode="md")
+        tgb.table("{callback_metrics}", show_all=True)
+        tgb.text("### Cache hit ratios", mode="md")
+        tgb.table("{cache_metrics}", show_all=True)
+        tgb.text("### ffmpeg processes", mode="md")
+        tgb.table("{ffmpeg_metrics}", show_all=True)
+        tgb.text("### Profiling", mode="md")
+        with tgb.layout("1 3 1 1"):
+            tgb.number(
+                "{profile_sample_rate}", label="Sample rate", min=0, max=1, step=0.01
+            )
+            tgb.input("{profile_callbacks}", label="Callbacks (comma-separated)")
+            tgb.button("Start", on_action=start_profiling, class_name="fullwidth")
+            tgb.button("Stop", on_action=stop_profiling, class_name="fullwidth")
+        tgb.text("{profiling_status}", mode="md")
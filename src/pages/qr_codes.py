@@ -1,10 +1,23 @@
 import taipy.gui.builder as tgb
+from taipy.gui import get_state_id
 
 from algorithms.qr_code_functions import generate_qr_code
 from taipy_utilities.taipy_callback import taipy_callback
 
 
-@taipy_callback
+@taipy_callback(
+    tool="qr",
+    execution="thread",
+    inputs=(
+        "qr_code_input",
+        "add_logo",
+        "dark_color",
+        "light_color",
+        "transparent_background",
+        "qr_scale",
+        "qr_border",
+    ),
+)
 def make_qr_code(s):
     s.image_path = generate_qr_code(
         message=s.qr_code_input,
@@ -14,6 +27,7 @@ def make_qr_code(s):
         transparent_background=s.transparent_background,
         qr_scale=s.qr_scale,
         qr_border=s.qr_border,
+        owner=get_state_id(s),
     )
 
 
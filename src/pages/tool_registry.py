@@ -0,0 +1,75 @@
+import importlib
+import os
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: the report shows no memory
+    resource = None
+
+# URL -> (module, page variable). Each tool's module, and the libraries it
+# needs (ffmpeg, segno, PIL...), is only imported when the tool is enabled.
+TOOLS = {
+    "uuid_generator": ("pages.uuid_generator", "uuid_page"),
+    "video_to_gif": ("pages.video_to_gif", "video_gif_page"),
+    "QR_code_generator": ("pages.qr_codes", "qr_code_page"),
+}
+
+_load_report = {}
+
+
+def get_enabled_tools() -> list[str]:
+    """Tools listed in TAIPY_TOOLS (comma-separated), or all of them"""
+    enabled = os.environ.get("TAIPY_TOOLS")
+    if not enabled:
+        return list(TOOLS)
+    tools = [tool.strip() for tool in enabled.split(",") if tool.strip()]
+    unknown = [tool for tool in tools if tool not in TOOLS]
+    if unknown:
+        raise ValueError(
+            f"Unsupported tools in TAIPY_TOOLS: {', '.join(unknown)}. "
+            f"Supported tools: {', '.join(TOOLS)}"
+        )
+    return tools
+
+
+def load_tool_page(tool: str):
+    """Imports and builds a tool's page on first access, then returns it"""
+    module_name, page_name = TOOLS[tool]
+    start = time.perf_counter()
+    rss_before = _peak_rss_kib()
+    page = getattr(importlib.import_module(module_name), page_name)
+    if tool not in _load_report:
+        _load_report[tool] = {
+            "seconds": time.perf_counter() - start,
+            "rss_kib": _rss_increase(rss_before),
+        }
+    return page
+
+
+def load_tool_pages(tools: list[str] | None = None) -> dict:
+    """Returns {url: page} for the given tools, default: the enabled ones"""
+    if tools is None:
+        tools = get_enabled_tools()
+    return {tool: load_tool_page(tool) for tool in tools}
+
+
+def format_load_report() -> str:
+    """Import time and peak memory increase of each loaded tool"""
+    lines = []
+    for tool, report in _load_report.items():
+        memory = "" if report["rss_kib"] is None else f", +{report['rss_kib']:,} KiB"
+        lines.append(f"{tool}: {report['seconds']:.2f} s{memory}")
+    return "\n".join(lines)
+
+
+def _peak_rss_kib() -> int | None:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _rss_increase(rss_before: int | None) -> int | None:
+    if rss_before is None:
+        return None
+    return _peak_rss_kib() - rss_before
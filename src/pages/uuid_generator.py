@@ -1,12 +1,29 @@
+from pathlib import Path
+
 import taipy.gui.builder as tgb
+from taipy.gui import get_state_id, notify
 
+from algorithms.artifact_storage import new_artifact_path, track_artifact
+from algorithms.uuid_bulk import (
+    BULK_FILE_FORMATS,
+    BULK_UUID_TYPES,
+    MAX_BULK_COUNT,
+    write_uuid_file,
+)
 from algorithms.uuid_functions import get_uuid
+from algorithms.uuid_names import (
+    NAME_BASED_UUID_TYPES,
+    NAMESPACES,
+    write_name_uuid_file,
+)
 from taipy_utilities.taipy_callback import taipy_callback
 
 
-@taipy_callback
+@taipy_callback(tool="uuid")
 def select_uuid(state):
-    state.selected_uuid = get_uuid(state.uuid_type, state.name_for_uuid)
+    state.selected_uuid = get_uuid(
+        state.uuid_type, state.name_for_uuid, _selected_namespace(state)
+    )
 
 
 @taipy_callback
@@ -19,6 +36,51 @@ def change_name_select(state):
             s.name_for_uuid = ""
 
 
+# CPU-bound: generated in a process, without holding the GIL of the server
+@taipy_callback(
+    tool="uuid_bulk",
+    execution="process",
+    inputs=("uuid_file_format", "bulk_uuid_type", "uuid_count"),
+    hold_message="Generating UUIDs",
+)
+def generate_uuid_file(state):
+    output_path = write_uuid_file(
+        output_path=new_artifact_path(f".{state.uuid_file_format}"),
+        uuid_type=state.bulk_uuid_type,
+        count=int(state.uuid_count),
+        file_format=state.uuid_file_format,
+    )
+    state.uuid_file = track_artifact(output_path, get_state_id(state))
+
+
+@taipy_callback(
+    tool="uuid_bulk",
+    execution="process",
+    inputs=("names_content", "names_uuid_type", "uuid_namespace", "custom_namespace"),
+    hold_message="Hashing names",
+)
+def generate_name_uuid_file(state):
+    try:
+        output_path = new_artifact_path(".csv")
+        count = write_name_uuid_file(
+            names_path=state.names_content,
+            output_path=output_path,
+            uuid_type=state.names_uuid_type,
+            namespace=_selected_namespace(state),
+        )
+        state.names_uuid_file = track_artifact(output_path, get_state_id(state))
+        notify(state, "s", f"Generated {count:,} name-based UUIDs")
+    finally:
+        Path(state.names_content).unlink(missing_ok=True)
+        state.names_content = None
+
+
+def _selected_namespace(state):
+    if state.uuid_namespace == "Custom":
+        return state.custom_namespace
+    return state.uuid_namespace
+
+
 with tgb.Page() as uuid_page:
     tgb.text("## **UUID** Generator", mode="md")
 
@@ -31,4 +93,60 @@ with tgb.Page() as uuid_page:
         tgb.input("{name_for_uuid}", label="Name for UUID", active="{select_name}")
         tgb.button(label="Get UUID!", on_action=select_uuid, class_name="plain")
 
+    with tgb.layout("1 1"):
+        tgb.toggle(
+            "{uuid_namespace}",
+            lov=[*NAMESPACES, "Custom"],
+            label="Namespace",
+            active="{select_name}",
+        )
+        tgb.input(
+            "{custom_namespace}",
+            label="Custom namespace (UUID)",
+            active="{select_name and uuid_namespace == 'Custom'}",
+        )
+
     tgb.text("## {selected_uuid}", mode="md")
+
+    with tgb.expandable(title="Bulk Generation", expanded=False):
+        with tgb.layout("1 1 1 1"):
+            tgb.toggle("{bulk_uuid_type}", lov=list(BULK_UUID_TYPES))
+            tgb.number(
+                "{uuid_count}", label="Number of UUIDs", min=1, max=MAX_BULK_COUNT
+            )
+            tgb.toggle("{uuid_file_format}", lov=list(BULK_FILE_FORMATS))
+            tgb.button(
+                label="Generate File!", on_action=generate_uuid_file, class_name="plain"
+            )
+        tgb.file_download(
+            "{uuid_file}",
+            label="Download UUIDs",
+            active="{uuid_file}",
+            class_name="fullwidth",
+        )
+
+    with tgb.expandable(title="Names to UUIDs", expanded=False):
+        tgb.text(
+            "Upload a text file with one name per line. The UUIDs use the "
+            "namespace selected above.",
+        )
+        with tgb.layout("1 1 1"):
+            tgb.toggle("{names_uuid_type}", lov=list(NAME_BASED_UUID_TYPES))
+            tgb.file_selector(
+                "{names_content}",
+                label="Select Names File",
+                extensions=".txt,.csv",
+                drop_message="Drop Names File here",
+            )
+            tgb.button(
+                label="Hash Names!",
+                on_action=generate_name_uuid_file,
+                active="{names_content}",
+                class_name="plain",
+            )
+        tgb.file_download(
+            "{names_uuid_file}",
+            label="Download Name UUIDs",
+            active="{names_uuid_file}",
+            class_name="fullwidth",
+        )
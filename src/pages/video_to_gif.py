@@ -1,6 +1,16 @@
 import taipy.gui.builder as tgb
 
-from algorithms.video_to_gif_state_functions import convert_to_gif, select_video
+from algorithms.video_region import ROTATIONS
+from algorithms.video_to_gif_presets import GIF_PRESETS
+from algorithms.video_to_gif_state_functions import (
+    convert_batch_to_gif,
+    convert_to_gif,
+    select_batch_videos,
+    select_video,
+    trim_clip,
+    update_region,
+)
+from algorithms.video_trim_functions import TRIM_MODES
 
 with tgb.Page() as video_gif_page:
     tgb.text("## Video to **GIF** Converter", mode="md")
@@ -26,7 +36,19 @@ with tgb.Page() as video_gif_page:
                     mode="md",
                 )
 
-        with tgb.part(render="{video_is_selected}"):
+            with tgb.expandable(title="Batch Conversion", expanded=False):
+                tgb.file_selector(
+                    "{batch_content}",
+                    label="Select Videos",
+                    on_action=select_batch_videos,
+                    extensions=".mp4,.avi",
+                    multiple=True,
+                    drop_message="Drop Message",
+                    class_name="fullwidth",
+                )
+                tgb.text("#### Selected videos: {batch_file_count}", mode="md")
+
+        with tgb.part(render="{video_is_selected or batch_is_selected}"):
             tgb.text("### Select Parameters:", mode="md")
             with tgb.layout("1 1 1 1"):
                 tgb.number("{start_time}", label="Start time", min=0, max=60)
@@ -37,19 +59,100 @@ with tgb.Page() as video_gif_page:
                 with tgb.layout("1 1"):
                     tgb.text("#### FPS: ", mode="md")
                     tgb.slider("{fps}", lov=[5, 7, 10, 15, 20, 25, 30, 35])
+            with tgb.layout("1 1 1"):
+                tgb.toggle(
+                    "{gif_preset}", lov=list(GIF_PRESETS), label="Quality Preset"
+                )
+                tgb.toggle("{gif_optimize}", label="Optimize GIF size")
+                tgb.number(
+                    "{gif_tolerance}",
+                    label="Optimizer color tolerance (0 is lossless)",
+                    min=0,
+                    max=255,
+                    active="{gif_optimize}",
+                )
+            with (
+                tgb.part(render="{video_is_selected}"),
+                tgb.expandable(title="Crop and Rotate", expanded=False),
+                tgb.layout("1 1"),
+            ):
+                with tgb.part():
+                    tgb.toggle(
+                        "{crop_enabled}",
+                        label="Crop to the region",
+                        on_change=update_region,
+                    )
+                    with tgb.layout("1 1"):
+                        tgb.number(
+                            "{crop_x}", label="X", min=0, on_change=update_region
+                        )
+                        tgb.number(
+                            "{crop_y}", label="Y", min=0, on_change=update_region
+                        )
+                        tgb.number(
+                            "{crop_width}",
+                            label="Width",
+                            min=1,
+                            on_change=update_region,
+                        )
+                        tgb.number(
+                            "{crop_height}",
+                            label="Height",
+                            min=1,
+                            on_change=update_region,
+                        )
+                    tgb.text("Video size: {video_width} x {video_height} px")
+                    tgb.toggle(
+                        "{rotation}",
+                        lov=[str(rotation) for rotation in ROTATIONS],
+                        label="Rotation (degrees, clockwise)",
+                        on_change=update_region,
+                    )
+                tgb.image("{region_preview}", width="480px")
             tgb.button(
                 label="Convert to GIF!",
                 on_action=convert_to_gif,
+                active="{video_is_selected}",
                 class_name="fullwidth plain",
             )
+            with tgb.layout("1 3"):
+                tgb.toggle("{trim_mode}", lov=list(TRIM_MODES), label="Trim Mode")
+                tgb.button(
+                    label="Trim Only (no GIF)",
+                    on_action=trim_clip,
+                    active="{video_is_selected}",
+                    class_name="fullwidth",
+                )
+            tgb.button(
+                label="Convert all to ZIP!",
+                on_action=convert_batch_to_gif,
+                active="{batch_is_selected}",
+                class_name="fullwidth",
+            )
 
         with tgb.part(render="{gif_is_ready}"):
             tgb.text("### Convert to GIF:", mode="md")
             with tgb.part(class_name="image-output"):
-                tgb.image("{content_download}", height="200px", class_name="gif-output")
+                tgb.image("{gif_preview}", height="200px", class_name="gif-output")
             tgb.file_download(
                 "{content_download}",
                 label="Download File",
                 active="{gif_is_ready}",
                 class_name="fullwidth",
             )
+
+        with tgb.part(render="{clip_is_ready}"):
+            tgb.file_download(
+                "{clip_download}",
+                label="Download Clip",
+                active="{clip_is_ready}",
+                class_name="fullwidth",
+            )
+
+        with tgb.part(render="{batch_is_ready}"):
+            tgb.file_download(
+                "{batch_download}",
+                label="Download ZIP File",
+                active="{batch_is_ready}",
+                class_name="fullwidth",
+            )
@@ -0,0 +1,141 @@
+# Execution policies of the GUI callbacks. "inline" callbacks run in the request
+# thread, on the session's State. "thread" and "process" callbacks run on a pool,
+# through Taipy's long-running callbacks: they get a StateSnapshot holding a copy
+# of their inputs, and what they change is applied to the State in one batch.
+#
+# Under gunicorn's gevent worker, `threading` is monkey-patched: the "thread"
+# pool runs greenlets, not OS threads. Callbacks still yield while they wait on
+# ffmpeg, files or sockets, but Python work, such as PyAV decoding or the GIF
+# optimizer, holds the worker until it's done. gevent's native thread pool isn't
+# an option: gevent can only start subprocesses, such as ffmpeg, from its main
+# thread. CPU-heavy callbacks that don't need this process's memory belong in
+# the "process" pool.
+
+import importlib
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cache
+
+from taipy.gui import Gui
+
+EXECUTION_POLICIES = ("inline", "thread", "process")
+DEFAULT_THREAD_POOL_SIZE = 8
+
+
+class StateSnapshot:
+    """
+    Stands in for the State of an off-thread callback. Reads return a copy of
+    the callback's inputs. Assignments, notifications and other Taipy actions
+    are recorded, to be applied to the State once the callback returns
+    """
+
+    def __init__(self, state_id: str | None, inputs: dict):
+        # object.__setattr__: assignments to the snapshot are recorded
+        object.__setattr__(self, "_state_id", state_id)
+        object.__setattr__(self, "_inputs", inputs)
+        object.__setattr__(self, "_updates", {})
+        object.__setattr__(self, "_actions", [])
+
+    @property
+    def _gui(self):
+        # Taipy's actions only check that the state has a Gui
+        return _placeholder_gui()
+
+    def __getattr__(self, name: str):
+        # Private and special names, such as pickle's, aren't state variables
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._updates:
+            return self._updates[name]
+        try:
+            return self._inputs[name]
+        except KeyError:
+            raise AttributeError(
+                f"{name} is not an input of this callback: "
+                "add it to the inputs of its taipy_callback decorator"
+            ) from None
+
+    def __setattr__(self, name: str, value):
+        self._updates[name] = value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def _invoke_on_gui(self, method, *args):
+        if method.__name__ == "_get_client_id":
+            return self._state_id
+        self._actions.append((method, args))
+        return None
+
+    def apply_to(self, state):
+        """Sets the recorded variables on `state`, then replays the actions"""
+        with state as s:
+            for name, value in self._updates.items():
+                setattr(s, name, value)
+            for method, args in self._actions:
+                s._invoke_on_gui(method, *args)
+
+
+def snapshot_state(state, state_id: str | None, inputs: tuple[str, ...]):
+    return StateSnapshot(state_id, {name: getattr(state, name) for name in inputs})
+
+
+def submit(policy: str, func, snapshot: StateSnapshot) -> Future:
+    """
+    Runs `func(snapshot)` on the policy's pool. The future's result is the
+    snapshot, with the callback's changes. If the callback raises, its exception
+    carries the snapshot, as `snapshot`, with the changes made before the error.
+    With the process policy, `func` must be a module-level decorated callback
+    """
+    if policy == "thread":
+        return _thread_pool().submit(run_on_snapshot, func, snapshot)
+    if policy == "process":
+        # The callback is found again by name in the worker process
+        return _process_pool().submit(
+            _run_by_name, func.__module__, func.__qualname__, snapshot
+        )
+    raise ValueError(
+        f"Unsupported execution policy: {policy}. "
+        f"Supported policies: {', '.join(EXECUTION_POLICIES[1:])}"
+    )
+
+
+def run_on_snapshot(func, snapshot: StateSnapshot) -> StateSnapshot:
+    try:
+        func(snapshot)
+    except Exception as e:
+        e.snapshot = snapshot
+        raise
+    return snapshot
+
+
+def _run_by_name(module_name: str, qualname: str, snapshot: StateSnapshot):
+    wrapper = getattr(importlib.import_module(module_name), qualname)
+    return run_on_snapshot(wrapper.__wrapped__, snapshot)
+
+
+@cache
+def _placeholder_gui() -> Gui:
+    # Never initialized: this also works in a process pool's worker
+    return Gui.__new__(Gui)
+
+
+@cache
+def _thread_pool() -> ThreadPoolExecutor:
+    size = int(os.environ.get("TAIPY_TOOLS_THREAD_POOL_SIZE", DEFAULT_THREAD_POOL_SIZE))
+    return ThreadPoolExecutor(max_workers=size, thread_name_prefix="callback")
+
+
+@cache
+def _process_pool() -> ProcessPoolExecutor:
+    size = os.environ.get("TAIPY_TOOLS_PROCESS_POOL_SIZE")
+    # Spawned, not forked: a forked worker would share its parent's random state
+    # (uuid_utils), SQLite connections and Taipy threads
+    return ProcessPoolExecutor(
+        max_workers=int(size) if size else None,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
@@ -0,0 +1,30 @@
+from taipy.gui import Gui
+
+
+def on_session_end(gui: Gui, callback):
+    """
+    Calls `callback(client_id)` once Taipy removes the state of a disconnected
+    session, `state_retention_period` seconds after its last tab closed.
+
+    Taipy 4.1 has no public hook for this: the Gui's `_remove_state` is wrapped.
+    taipy==4.1.0, pinned in pyproject.toml, only allows taipy-gui 4.1 releases;
+    tests/test_session_hooks.py fails if a release changes these private members.
+    """
+    remove_state = gui._remove_state
+
+    def _remove_state(client_id: str):
+        remove_state(client_id)
+        # Taipy keeps the state if the session reconnected in the meantime
+        if client_id not in gui._bindings()._get_all_scopes():
+            callback(client_id)
+
+    gui._remove_state = _remove_state
+
+
+def count_sessions(gui: Gui) -> int:
+    """
+    Sessions of this worker, including the disconnected ones that Taipy keeps
+    for `state_retention_period` seconds
+    """
+    # Every session has its data scope, next to the global one
+    return len(gui._bindings()._get_all_scopes()) - 1
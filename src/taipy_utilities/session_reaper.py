@@ -0,0 +1,95 @@
+import threading
+import time
+
+from taipy.gui import Gui, get_state_id, invoke_callback, notify
+
+from algorithms.session_activity import activity, free_session, get_idle_timeout
+
+# Seconds between two searches for idle sessions
+REAP_INTERVAL = 60
+# The values of main.py: what a new session starts with
+HEAVY_VARIABLES = {
+    "content": None,
+    "content_path": None,
+    "file_size": " - ",
+    "file_name": " - ",
+    "video_is_selected": False,
+    "video_duration": 0,
+    "gif_is_ready": False,
+    "content_download": None,
+    "gif_preview": None,
+    "keyframe": None,
+    "region_preview": None,
+    "crop_enabled": False,
+    "clip_is_ready": False,
+    "clip_download": None,
+    "batch_content": None,
+    "batch_file_count": 0,
+    "batch_is_selected": False,
+    "batch_is_ready": False,
+    "batch_download": None,
+    "uuid_file": None,
+    "names_content": None,
+    "names_uuid_file": None,
+    "image_path": None,
+}
+
+_reaper_lock = threading.Lock()
+_reaper_thread = None
+
+
+def start_reaper(gui: Gui, interval: float = REAP_INTERVAL):
+    """
+    Frees the sessions idle for TAIPY_TOOLS_SESSION_IDLE_TIMEOUT seconds, every
+    `interval` seconds, in a daemon thread. Ended sessions are freed by
+    `free_ended_session`, to hook with `on_session_end`
+    """
+    global _reaper_thread
+    idle_timeout = get_idle_timeout()
+    with _reaper_lock:
+        if _reaper_thread is None:
+            _reaper_thread = threading.Thread(
+                target=_reap_forever, args=(gui, idle_timeout, interval), daemon=True
+            )
+            _reaper_thread.start()
+
+
+def free_ended_session(client_id: str):
+    freed = free_session(client_id)
+    _report("ended", client_id, freed)
+
+
+def reap_idle_session(state):
+    """Frees an idle session's files, then resets the variables pointing at them"""
+    with state as s:
+        state_id = get_state_id(s)
+        # Uploaded name lists go straight to the variable, without a callback
+        names_paths = (s.names_content,) if s.names_content else ()
+        freed = free_session(state_id, names_paths)
+        if not freed["uploads"] and not freed["artifacts"]:
+            return
+        for name, value in HEAVY_VARIABLES.items():
+            setattr(s, name, value)
+        notify(s, "i", "Your files were deleted after a period of inactivity")
+    _report("idle", state_id, freed)
+
+
+def _reap_forever(gui: Gui, idle_timeout: float, interval: float):
+    while True:
+        time.sleep(interval)
+        scopes = gui._bindings()._get_all_scopes()
+        for session in activity.idle_sessions(idle_timeout):
+            if session in scopes:
+                invoke_callback(gui, session, reap_idle_session)
+            else:  # Its state is gone, but it didn't end through Taipy
+                free_ended_session(session)
+
+
+def _report(reason: str, session: str, freed: dict):
+    if not freed["uploads"] and not freed["artifacts"]:
+        return
+    print(
+        f"Freed {reason} session {session}: {freed['uploads']} uploads, "
+        f"{freed['artifacts']} artifacts, {freed['disk_bytes']} bytes on disk, "
+        f"{freed['memory_bytes']} bytes in memory"
+    )
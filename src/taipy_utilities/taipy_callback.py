@@ -1,20 +1,167 @@
-from functools import wraps
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+from functools import partial, wraps
 
-from taipy.gui import notify
+from taipy.gui import (
+    get_state_id,
+    hold_control,
+    invoke_long_callback,
+    notify,
+    resume_control,
+)
 
+from algorithms import profiling
+from algorithms.admission_control import ServerBusyError, admission
+from algorithms.metrics import record_latency
+from algorithms.session_activity import activity
+from taipy_utilities.execution import EXECUTION_POLICIES, snapshot_state, submit
 
-def taipy_callback(func):
-    """Decorator that translates Python exceptions to Taipy notifications"""
+
+def taipy_callback(
+    func=None,
+    *,
+    tool: str | None = None,
+    execution: str = "inline",
+    inputs: tuple[str, ...] = (),
+    hold_message: str | None = None,
+):
+    """
+    Decorator that translates Python exceptions to Taipy notifications.
+
+    With `tool`, the call must first be admitted by the admission controller:
+    a busy server or a session over its rate limit gets a warning instead.
+    The duration of admitted calls is recorded for the admin page, and calls
+    can be profiled (see algorithms.profiling). Calls keep their session from
+    being freed as idle (see algorithms.session_activity).
+
+    With `execution="thread"` or `"process"`, the call runs on a pool instead
+    of the request thread (see taipy_utilities.execution), and can only read
+    the state variables listed in `inputs`. `hold_message` blocks the page,
+    with this message, until the call returns
+    """
+    if func is None:
+        return partial(
+            taipy_callback,
+            tool=tool,
+            execution=execution,
+            inputs=inputs,
+            hold_message=hold_message,
+        )
+    if execution not in EXECUTION_POLICIES:
+        raise ValueError(
+            f"Unsupported execution policy: {execution}. "
+            f"Supported policies: {', '.join(EXECUTION_POLICIES)}"
+        )
 
     @wraps(func)
     def wrapper(state):
-        with state as s:
-            try:
-                return func(s)
-            except ValueError as e:
-                notify(s, "w", str(e))
-            except Exception as e:
-                notify(s, "e", f"Unexpected error: {str(e)}")
-                raise
+        with state as s, _notify_errors(s):
+            if execution != "inline":
+                _start_off_thread(s, func, tool, execution, inputs, hold_message)
+                return None
+            with (
+                activity.running(get_state_id(s)),
+                _admit(s, tool),
+                _hold(s, hold_message),
+            ):
+                start = time.perf_counter()
+                try:
+                    return _call(func, s)
+                finally:
+                    record_latency(func.__name__, time.perf_counter() - start)
 
     return wrapper
+
+
+@contextmanager
+def _notify_errors(state):
+    try:
+        yield
+    except (ServerBusyError, ValueError) as e:
+        notify(state, "w", str(e))
+    except Exception as e:
+        notify(state, "e", f"Unexpected error: {str(e)}")
+        raise
+
+
+def _admit(state, tool):
+    if tool is None:
+        return nullcontext()
+    return admission.admit(get_state_id(state), tool)
+
+
+@contextmanager
+def _hold(state, hold_message):
+    if hold_message is None:
+        yield
+        return
+    hold_control(state, message=hold_message)
+    try:
+        yield
+    finally:
+        resume_control(state)
+
+
+def _call(func, state):
+    # While profiling is disabled, this only reads its flag
+    if profiling.enabled and profiling.should_profile(func.__name__):
+        with profiling.profile(func.__name__):
+            return func(state)
+    return func(state)
+
+
+def _start_off_thread(state, func, tool, execution, inputs, hold_message):
+    # The call keeps its share of the load, and its session stays active, until
+    # _finish_off_thread
+    admitted = ExitStack()
+    held = False
+    # Set once _finish_off_thread runs: from then on, it releases the page
+    finished = []
+    try:
+        admitted.enter_context(activity.running(get_state_id(state)))
+        admitted.enter_context(_admit(state, tool))
+        snapshot = snapshot_state(state, get_state_id(state), inputs)
+        if hold_message is not None:
+            hold_control(state, message=hold_message)
+            held = True
+        # Processes find the callback by name, threads can profile it in place
+        target = func if execution == "process" else partial(_call, func)
+        invoke_long_callback(
+            state,
+            _wait_for_pool,
+            [execution, target, snapshot],
+            _finish_off_thread,
+            [func.__name__, admitted, time.perf_counter(), held, finished],
+        )
+    except BaseException:
+        admitted.close()
+        # The call couldn't be dispatched: the wrapper notifies the user
+        if held and not finished:
+            resume_control(state)
+        raise
+
+
+def _wait_for_pool(execution, target, snapshot):
+    # Runs in Taipy's thread for long callbacks
+    future = submit(execution, target, snapshot)
+    future.exception()  # Waits, without raising the callback's error
+    return future
+
+
+def _finish_off_thread(state, status, name, admitted, start, held, finished, future):
+    finished.append(True)
+    admitted.close()
+    record_latency(name, time.perf_counter() - start)
+    with state as s, _notify_errors(s):
+        if held:
+            resume_control(s)
+        if not status:  # The call couldn't be submitted to the pool
+            notify(s, "e", "Unexpected error: the callback couldn't run")
+            return
+        error = future.exception()
+        # Without a snapshot, the pool itself failed, such as a killed process
+        snapshot = getattr(error, "snapshot", None) if error else future.result()
+        if snapshot is not None:
+            snapshot.apply_to(s)
+        if error is not None:
+            raise error
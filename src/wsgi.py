@@ -0,0 +1,12 @@
+# Production entry point: the WSGI app for gunicorn, run from src/ (see the
+# Dockerfile). main.py's development server and reloader aren't used.
+from algorithms.artifact_storage import start_eviction
+from algorithms.http_api import mark_ready
+from main import format_load_report, gui, run_options, tool_pages
+from taipy_utilities.session_reaper import start_reaper
+
+print(f"Loaded tools:\n{format_load_report()}")
+app = gui.run(run_server=False, **run_options)
+start_eviction()
+start_reaper(gui)
+mark_ready(require_ffmpeg="video_to_gif" in tool_pages)
@@ -0,0 +1,64 @@
+import os
+import shutil
+from fractions import Fraction
+
+import pytest
+from PIL import Image
+
+SYNTHETIC_VIDEO_FPS = 25
+SYNTHETIC_VIDEO_SECONDS = 2
+SYNTHETIC_VIDEO_SIZE = (160, 120)
+
+requires_ffmpeg = pytest.mark.skipif(
+    shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+    reason="ffmpeg binaries are not installed",
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def shared_store_path(tmp_path_factory):
+    """Keep the caches and jobs of the test run out of deposit_files."""
+    path = tmp_path_factory.mktemp("store") / "shared_store.sqlite3"
+    previous = os.environ.get("TAIPY_TOOLS_STORE")
+    os.environ["TAIPY_TOOLS_STORE"] = str(path)
+    yield path
+    if previous is None:
+        del os.environ["TAIPY_TOOLS_STORE"]
+    else:
+        os.environ["TAIPY_TOOLS_STORE"] = previous
+
+
+@pytest.fixture(scope="session")
+def synthetic_video(tmp_path_factory):
+    """Encode a small synthetic video: a square moving over a gradient."""
+    video_path = tmp_path_factory.mktemp("videos") / "synthetic.mp4"
+    _encode_synthetic_video(video_path)
+    return video_path
+
+
+@pytest.fixture(scope="session")
+def rotated_video(tmp_path_factory):
+    """The synthetic video, tagged to be displayed upright: a quarter turn right."""
+    video_path = tmp_path_factory.mktemp("videos") / "rotated.mp4"
+    # Display matrices rotate counterclockwise
+    _encode_synthetic_video(video_path, display_rotation=-90)
+    return video_path
+
+
+def _encode_synthetic_video(video_path, display_rotation=0):
+    av = pytest.importorskip("av")
+    with av.open(str(video_path), mode="w") as container:
+        stream = container.add_stream("mpeg4", rate=SYNTHETIC_VIDEO_FPS)
+        stream.width, stream.height = SYNTHETIC_VIDEO_SIZE
+        stream.pix_fmt = "yuv420p"
+        stream.time_base = Fraction(1, SYNTHETIC_VIDEO_FPS)
+        if display_rotation:
+            stream.set_display_rotation(display_rotation)
+        for index in range(SYNTHETIC_VIDEO_FPS * SYNTHETIC_VIDEO_SECONDS):
+            image = Image.linear_gradient("L").resize(SYNTHETIC_VIDEO_SIZE)
+            image = image.convert("RGB")
+            image.paste((255, 0, 0), (index * 2, 30, index * 2 + 40, 70))
+            frame = av.VideoFrame.from_image(image)
+            frame.pts = index
+            container.mux(stream.encode(frame))
+        container.mux(stream.encode())
@@ -0,0 +1,83 @@
+import importlib
+from pathlib import Path
+
+import pytest
+from taipy.gui import Gui
+
+from benchmarks.load_test import FakeState
+
+SRC_DIR = Path(__file__).parents[1] / "src"
+
+
+class AdminState(FakeState):
+    """A session of the admin page."""
+
+    def get_gui(self):
+        return None
+
+
+@pytest.fixture
+def admin(tmp_path, monkeypatch):
+    """The admin page, imported from src/ like the app does, without its poll"""
+    monkeypatch.syspath_prepend(SRC_DIR)
+    monkeypatch.setenv("TAIPY_TOOLS_ADMIN_TOKEN", "secret")
+    module = importlib.import_module("pages.admin")
+    monkeypatch.setattr(module, "_admin_sessions", set())
+    monkeypatch.setattr(
+        module,
+        "_start_refresh",
+        lambda gui, state_id: module._admin_sessions.add(state_id),
+    )
+    monkeypatch.setattr(module, "count_sessions", lambda gui: 1)
+    monkeypatch.setattr(FakeState, "_gui", Gui.__new__(Gui))
+    return module
+
+
+def _state(tmp_path, **variables):
+    return AdminState(
+        tmp_path.name,
+        {
+            "admin_token": "",
+            "admin_unlocked": False,
+            "metrics_overview": "",
+            "profile_sample_rate": 0.5,
+            "profile_callbacks": "",
+        }
+        | variables,
+    )
+
+
+class TestAdminPage:
+    """Test that the admin page is unlocked on the server, by the token only."""
+
+    def test_token_unlocks(self, admin, tmp_path):
+        """Test that the right token unlocks the session and shows the metrics."""
+        state = _state(tmp_path, admin_token="secret")
+        admin.unlock_admin(state)
+        assert state.admin_unlocked
+        assert "**Worker:**" in state.metrics_overview
+
+    def test_wrong_token(self, admin, tmp_path):
+        """Test that a wrong token leaves the session locked."""
+        state = _state(tmp_path, admin_token="guess")
+        admin.unlock_admin(state)
+        assert not state.admin_unlocked
+        assert ("e", "Wrong admin token") in state.notifications
+
+    def test_client_flag_does_not_unlock(self, admin, tmp_path, monkeypatch):
+        """Test that setting admin_unlocked from the client unlocks nothing."""
+        enabled = []
+        monkeypatch.setattr(admin, "enable_profiling", lambda *args: enabled.append(1))
+        state = _state(tmp_path, admin_unlocked=True)
+        admin.refresh_metrics(state)
+        admin.start_profiling(state)
+        assert state.metrics_overview == ""
+        assert enabled == []
+
+    def test_refresh_not_measured(self, admin, tmp_path):
+        """Test that the periodic refresh stays out of the latencies it shows."""
+        metrics = importlib.import_module("algorithms.metrics")
+        state = _state(tmp_path, admin_token="secret")
+        admin.unlock_admin(state)
+        admin.refresh_metrics(state)
+        assert "refresh_metrics" not in metrics.latency_percentiles()
@@ -0,0 +1,112 @@
+import pytest
+
+from src.algorithms.admission_control import (
+    TOOL_LIMITS,
+    AdmissionController,
+    ServerBusyError,
+    TokenBucket,
+    get_tool_limits,
+)
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestTokenBucket:
+    """Test the per-session rate limit."""
+
+    def test_burst_then_rate(self, clock):
+        """Test that a burst is allowed, then one call per 1/rate seconds."""
+        bucket = TokenBucket(rate=2.0, burst=3, clock=clock)
+        assert [bucket.take() for _ in range(3)] == [0, 0, 0]
+        assert bucket.take() == pytest.approx(0.5)
+        clock.now = 0.5
+        assert bucket.take() == 0
+
+    def test_refill_is_capped(self, clock):
+        """Test that an idle bucket doesn't hold more than `burst` tokens."""
+        bucket = TokenBucket(rate=1.0, burst=2, clock=clock)
+        clock.now = 100
+        assert [bucket.take() for _ in range(2)] == [0, 0]
+        assert bucket.take() > 0
+
+
+class TestAdmissionController:
+    """Test the admission of tool calls."""
+
+    def test_rate_limit_per_session_and_tool(self, clock):
+        """Test that each session and tool has its own token bucket."""
+        controller = AdmissionController(max_load=100, clock=clock)
+        for _ in range(TOOL_LIMITS["video"]["burst"]):
+            with controller.admit("a", "video"):
+                pass
+        with (
+            pytest.raises(ServerBusyError, match=r"retry in 10 s"),
+            controller.admit("a", "video"),
+        ):
+            pass
+        with controller.admit("b", "video"), controller.admit("a", "qr"):
+            pass
+
+    def test_load_is_weighted_by_cost(self, clock):
+        """Test that expensive calls take more of the load budget."""
+        controller = AdmissionController(max_load=12, clock=clock)
+        with controller.admit("a", "video"):
+            assert controller.load == 10
+            with controller.admit("b", "qr"):
+                assert controller.load == 12
+                with (
+                    pytest.raises(ServerBusyError) as error,
+                    controller.admit("c", "uuid"),
+                ):
+                    pass
+                assert error.value.retry_after == 1
+        assert controller.load == 0
+
+    def test_idle_server_admits_anything(self, clock):
+        """Test that a call costing more than the budget runs when idle."""
+        controller = AdmissionController(max_load=1, clock=clock)
+        with controller.admit("a", "video"):
+            assert controller.load == 10
+
+    def test_rejected_calls_keep_their_tokens(self, clock):
+        """Test that a call rejected for load doesn't use a token."""
+        controller = AdmissionController(max_load=10, clock=clock)
+        with controller.admit("a", "video"):
+            for _ in range(5):
+                with pytest.raises(ServerBusyError), controller.admit("b", "video"):
+                    pass
+        with controller.admit("b", "video"):
+            pass
+
+    def test_load_released_on_error(self, clock):
+        """Test that a failing call gives its load back."""
+        controller = AdmissionController(max_load=10, clock=clock)
+        with pytest.raises(RuntimeError), controller.admit("a", "qr"):
+            raise RuntimeError
+        assert controller.load == 0
+
+    def test_forget_session(self, clock):
+        """Test that an ended session's buckets are dropped."""
+        controller = AdmissionController(max_load=10, clock=clock)
+        with controller.admit("a", "qr"), controller.admit("b", "qr"):
+            pass
+        controller.forget_session("a")
+        assert list(controller._buckets) == [("b", "qr")]
+
+    def test_unknown_tool(self, clock):
+        """Test that an unknown tool raises ValueError."""
+        with pytest.raises(ValueError, match="Unsupported tool: gif"):
+            get_tool_limits("gif")
@@ -0,0 +1,195 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src.algorithms import artifact_storage
+from src.algorithms.artifact_storage import (
+    ARTIFACT_URL,
+    MemoryArtifacts,
+    enforce_quota,
+    evict_expired,
+    get_memory_artifact,
+    keep_artifact,
+    memory_budget,
+    new_artifact_path,
+    reclaim_session,
+    release_session,
+    save_artifact,
+    track_artifact,
+)
+from src.algorithms.shared_store import get_shared_store
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    """A fresh shared store for each test, so artifacts don't add up."""
+    monkeypatch.setenv("TAIPY_TOOLS_STORE", str(tmp_path / "store.sqlite3"))
+    return get_shared_store()
+
+
+def _write_artifact(tmp_path, owner=None, size=10):
+    path = new_artifact_path(".bin", artifact_dir=str(tmp_path / "artifacts"))
+    Path(path).write_bytes(b"x" * size)
+    return track_artifact(path, owner)
+
+
+class TestNewArtifactPath:
+    """Test the sharded artifact paths."""
+
+    def test_paths_are_sharded(self, tmp_path):
+        """Test that each artifact goes to the subdirectory of its first 2 chars."""
+        path = Path(new_artifact_path(".gif", artifact_dir=str(tmp_path)))
+        assert path.suffix == ".gif"
+        assert path.parent.parent == tmp_path
+        assert path.parent.name == path.name[:2]
+        assert path.parent.is_dir()
+
+    def test_paths_are_unique(self, tmp_path):
+        """Test that every call returns a new path."""
+        paths = {new_artifact_path(".png", str(tmp_path)) for _ in range(100)}
+        assert len(paths) == 100
+
+
+class TestEviction:
+    """Test that artifacts are deleted with their session, TTL or quota."""
+
+    def test_track_artifact(self, tmp_path, store):
+        """Test that artifacts are recorded with their size."""
+        path = _write_artifact(tmp_path, "session", size=42)
+        assert store.list_artifacts(owner="session") == [(path, 42)]
+        assert store.artifact_bytes() == 42
+
+    def test_release_session(self, tmp_path, store):
+        """Test that only the files of the ended session are deleted."""
+        mine = _write_artifact(tmp_path, "mine")
+        other = _write_artifact(tmp_path, "other")
+        assert release_session("mine") == 1
+        assert not Path(mine).exists()
+        assert Path(other).exists()
+        assert store.list_artifacts() == [(other, 10)]
+
+    def test_evict_expired(self, tmp_path):
+        """Test that only the artifacts older than the TTL are deleted."""
+        old = _write_artifact(tmp_path)
+        time.sleep(0.05)
+        new = _write_artifact(tmp_path)
+        assert evict_expired(ttl=0.02) == 1
+        assert not Path(old).exists()
+        assert Path(new).exists()
+
+    def test_quota_evicts_oldest(self, tmp_path, monkeypatch):
+        """Test that the oldest artifacts go first when over the quota."""
+        monkeypatch.setenv("TAIPY_TOOLS_STORAGE_QUOTA", "25")
+        first = _write_artifact(tmp_path)
+        second = _write_artifact(tmp_path)
+        third = _write_artifact(tmp_path)
+        assert not Path(first).exists()
+        assert Path(second).exists()
+        assert Path(third).exists()
+
+    def test_quota_keeps_new_artifact(self, tmp_path, monkeypatch):
+        """Test that an artifact larger than the quota is still kept."""
+        monkeypatch.setenv("TAIPY_TOOLS_STORAGE_QUOTA", "5")
+        path = _write_artifact(tmp_path, size=10)
+        assert Path(path).exists()
+        assert enforce_quota() == 1
+        assert not Path(path).exists()
+
+    def test_missing_files_are_forgotten(self, tmp_path, store):
+        """Test that artifacts deleted by hand are removed from the store."""
+        path = _write_artifact(tmp_path, "session")
+        Path(path).unlink()
+        assert release_session("session") == 1
+        assert store.artifact_bytes() == 0
+
+    def test_invalid_quota(self, monkeypatch):
+        """Test that an invalid quota raises ValueError."""
+        monkeypatch.setenv("TAIPY_TOOLS_STORAGE_QUOTA", "2GB")
+        with pytest.raises(ValueError, match="TAIPY_TOOLS_STORAGE_QUOTA"):
+            enforce_quota()
+
+
+class TestMemoryArtifacts:
+    """Test that small artifacts are kept in memory, and large ones on disk."""
+
+    @pytest.fixture(autouse=True)
+    def artifact_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "src.algorithms.artifact_storage.ARTIFACT_DIR", str(tmp_path / "artifacts")
+        )
+        monkeypatch.setattr(
+            "src.algorithms.artifact_storage.memory_artifacts", MemoryArtifacts(100)
+        )
+
+    def test_small_artifact_in_memory(self):
+        """Test that a small artifact is served from memory."""
+        url = save_artifact(b"GIF89a", ".gif", "session")
+        assert url.startswith(ARTIFACT_URL)
+        assert get_memory_artifact(url.removeprefix(ARTIFACT_URL)) == (
+            b"GIF89a",
+            "image/gif",
+        )
+
+    def test_spill_to_disk_when_full(self, store):
+        """Test that artifacts go to disk once the memory budget is used."""
+        save_artifact(b"x" * 80, ".png", "session")
+        path = save_artifact(b"x" * 80, ".png", "session")
+        assert Path(path).read_bytes() == b"x" * 80
+        assert store.list_artifacts(owner="session") == [(path, 80)]
+
+    def test_large_artifact_on_disk(self, tmp_path, monkeypatch):
+        """Test that artifacts larger than the size limit go to disk."""
+        monkeypatch.setattr(
+            "src.algorithms.artifact_storage.MEMORY_ARTIFACT_MAX_SIZE", 10
+        )
+        path = save_artifact(b"x" * 20, ".zip")
+        assert Path(path).is_relative_to(tmp_path)
+
+    def test_keep_artifact(self, tmp_path):
+        """Test that a small file is moved to memory."""
+        path = tmp_path / "clip.gif"
+        path.write_bytes(b"GIF89a")
+        url = keep_artifact(str(path), "session")
+        assert url.startswith(ARTIFACT_URL)
+        assert not path.exists()
+
+    def test_release_session(self):
+        """Test that a session's memory artifacts are freed when it ends."""
+        url = save_artifact(b"x" * 10, ".png", "session")
+        save_artifact(b"x" * 10, ".png", "other")
+        assert release_session("session") == 1
+        assert get_memory_artifact(url.removeprefix(ARTIFACT_URL)) is None
+        assert artifact_storage.memory_artifacts.size == 10
+
+    def test_reclaim_session(self, tmp_path, store):
+        """Test that the memory and disk freed with a session are reported."""
+        save_artifact(b"x" * 10, ".png", "session")
+        save_artifact(b"x" * 10, ".png", "other")
+        path = _write_artifact(tmp_path, "session", size=500)
+        freed = reclaim_session("session")
+        assert freed == {"artifacts": 2, "memory_bytes": 10, "disk_bytes": 500}
+        assert not Path(path).exists()
+        assert artifact_storage.memory_artifacts.size == 10
+
+    def test_evict_expired(self):
+        """Test that memory artifacts expire like files."""
+        save_artifact(b"x" * 10, ".png")
+        time.sleep(0.02)
+        assert evict_expired(ttl=0.01) == 1
+        assert artifact_storage.memory_artifacts.size == 0
+
+    def test_memory_budget(self, monkeypatch):
+        """Test that TAIPY_TOOLS_MEMORY_BUDGET sets the memory budget."""
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+        monkeypatch.setenv("TAIPY_TOOLS_MEMORY_BUDGET", "1000")
+        assert memory_budget() == 1000
+
+    def test_no_memory_with_several_workers(self, monkeypatch):
+        """Test that artifacts go to disk when another worker may serve them."""
+        monkeypatch.setenv("WEB_CONCURRENCY", "2")
+        monkeypatch.setattr(
+            "src.algorithms.artifact_storage.memory_artifacts",
+            MemoryArtifacts(memory_budget()),
+        )
+        assert not save_artifact(b"GIF89a", ".gif").startswith(ARTIFACT_URL)
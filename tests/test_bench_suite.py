@@ -0,0 +1,27 @@
+from benchmarks.bench_suite import compare_results
+
+
+def _results(**seconds):
+    return {"results": {name: {"seconds": value} for name, value in seconds.items()}}
+
+
+class TestCompareResults:
+    """Test the regression check against a baseline."""
+
+    def test_flags_slower_stages(self):
+        """Test that only stages slower than the threshold are flagged."""
+        baseline = _results(encode=1.0, palette=1.0)
+        current = _results(encode=1.5, palette=1.1)
+        regressions = compare_results(current, baseline, threshold=0.2)
+        assert regressions == ["encode: 1.0000 s -> 1.5000 s (+50%)"]
+
+    def test_ignores_timer_noise(self):
+        """Test that tiny stages aren't flagged for sub-millisecond changes."""
+        baseline = _results(save=0.0002)
+        current = _results(save=0.0008)
+        assert compare_results(current, baseline, threshold=0.2) == []
+
+    def test_ignores_new_stages(self):
+        """Test that stages missing from the baseline are skipped."""
+        current = _results(render=1.0)
+        assert compare_results(current, _results(), threshold=0.2) == []
@@ -0,0 +1,148 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+from src.cli import _run_jobs
+from tests.conftest import requires_ffmpeg
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+def _failing_job(value) -> str | None:
+    if value == 2:
+        raise TypeError("boom")
+    return None if value else "empty"
+
+
+def run_cli(*args, stdin=""):
+    """Run the CLI like a user would, from the src directory."""
+    return subprocess.run(
+        [sys.executable, "cli.py", *map(str, args)],
+        check=False,
+        cwd=SRC_DIR,
+        input=stdin,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+class TestUUIDCommand:
+    """Test the uuid subcommand."""
+
+    def test_prints_uuids(self):
+        """Test that UUIDs go to stdout and statistics to stderr."""
+        result = run_cli("uuid", "--type", "7", "--count", "1000")
+        uuids = result.stdout.splitlines()
+        assert result.returncode == 0
+        assert len(set(uuids)) == 1000
+        assert uuids == sorted(uuids)
+        assert "1,000 UUIDs in" in result.stderr
+
+    def test_csv_header(self):
+        """Test that the CSV format has a header."""
+        result = run_cli("uuid", "--count", "2", "--format", "csv")
+        assert result.stdout.splitlines()[0] == "uuid"
+
+    def test_name_based_from_stdin(self):
+        """Test that names are read from stdin for versions 3 and 5."""
+        result = run_cli("uuid", "--type", "5", "--namespace", "URL", stdin="a\n\nb\n")
+        assert result.stdout.splitlines()[0] == "name,uuid"
+        assert [row.split(",")[0] for row in result.stdout.splitlines()[1:]] == [
+            "a",
+            "b",
+        ]
+
+    def test_invalid_type(self):
+        """Test that errors are reported on stderr with a non-zero exit code."""
+        result = run_cli("uuid", "--type", "9")
+        assert result.returncode == 1
+        assert "Unsupported UUID type" in result.stderr
+
+    def test_does_not_import_taipy(self):
+        """Test that the CLI starts without importing Taipy."""
+        code = (
+            "import sys, cli; cli.main(['uuid']); "
+            "assert not any(m.startswith('taipy') for m in sys.modules), 'taipy'"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            check=False,
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+
+
+class TestQRCommand:
+    """Test the qr subcommand."""
+
+    def test_one_png_per_line(self, tmp_path):
+        """Test that every non-empty line becomes a PNG, on several workers."""
+        result = run_cli(
+            "qr", "--output-dir", tmp_path, "--workers", "2", stdin="a\n\nb\nc\n"
+        )
+        assert result.returncode == 0
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "00001.png",
+            "00002.png",
+            "00003.png",
+        ]
+        assert Image.open(tmp_path / "00001.png").format == "PNG"
+        assert "3 QR codes in" in result.stderr
+
+    def test_reports_failures(self, tmp_path):
+        """Test that invalid messages are reported and fail the run."""
+        result = run_cli("qr", "--output-dir", tmp_path, stdin="a\n" + "x" * 2000)
+        assert result.returncode == 1
+        assert "Text too long" in result.stderr
+        assert "1 failed" in result.stderr
+
+
+@requires_ffmpeg
+class TestGIFCommand:
+    """Test the gif subcommand."""
+
+    def test_converts_folder(self, synthetic_video, tmp_path):
+        """Test that videos in a folder are converted, invalid ones reported."""
+        (tmp_path / "invalid.mp4").write_bytes(b"not a video")
+        result = run_cli(
+            "gif",
+            synthetic_video.parent,
+            tmp_path / "invalid.mp4",
+            "--output-dir",
+            tmp_path / "gifs",
+            "--duration",
+            "1",
+            "--preset",
+            "fast",
+        )
+        assert result.returncode == 1
+        assert (tmp_path / "gifs" / "synthetic.gif").exists()
+        assert not (tmp_path / "gifs" / "invalid.gif").exists()
+        assert "2 GIFs in" in result.stderr
+
+    def test_converts_until_end_without_duration(self, synthetic_video, tmp_path):
+        """Test that the whole clip is converted when no duration is given."""
+        result = run_cli(
+            "gif", synthetic_video, "--output-dir", tmp_path, "--preset", "fast"
+        )
+        assert result.returncode == 0, result.stderr
+        assert "1 GIFs in" in result.stderr
+        with Image.open(tmp_path / "synthetic.gif") as gif:
+            # 2 seconds at 10 fps
+            assert gif.n_frames == 20
+
+
+class TestRunJobs:
+    """Test the process pool runner."""
+
+    def test_job_exceptions_are_failures(self, capsys):
+        """Test that a job's exception counts as a failure, like its errors."""
+        jobs = ((value,) for value in range(4))
+        assert _run_jobs(_failing_job, jobs, workers=2) == (4, 2)
+        errors = capsys.readouterr().err.splitlines()
+        assert errors == ["error: empty", "error: 2: TypeError: boom"]
@@ -0,0 +1,129 @@
+import importlib
+import os
+import pickle
+from functools import wraps
+from pathlib import Path
+
+import pytest
+from taipy.gui import Gui, get_state_id, notify
+
+from benchmarks.load_test import FakeState
+
+SRC_DIR = Path(__file__).parents[1] / "src"
+
+
+def _decorated(func):
+    @wraps(func)
+    def wrapper(state):
+        raise AssertionError("The pool must call the undecorated function")
+
+    return wrapper
+
+
+def _render(state):
+    state.image_path = f"/api/artifacts/{state.qr_code_input}.png"
+    state.pid = os.getpid()
+    notify(state, "s", f"Rendered for {get_state_id(state)}")
+
+
+@_decorated
+def render_in_process(state):
+    _render(state)
+
+
+def _fail(state):
+    state.names_content = None
+    raise ValueError("Unsupported UUID type: 9")
+
+
+@pytest.fixture(scope="module")
+def execution():
+    """Import the module from src/, like the app and the pool's workers do."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.syspath_prepend(SRC_DIR)
+        yield importlib.import_module("taipy_utilities.execution")
+
+
+@pytest.fixture
+def snapshot(execution):
+    return execution.StateSnapshot(
+        "session-1", {"qr_code_input": "hello", "image_path": None}
+    )
+
+
+class TestStateSnapshot:
+    """Test the stand-in State of off-thread callbacks."""
+
+    def test_reads_and_writes(self, snapshot):
+        """Test that inputs are read, and assignments recorded."""
+        snapshot.image_path = "qr.png"
+        assert snapshot.qr_code_input == "hello"
+        assert snapshot.image_path == "qr.png"
+        assert snapshot._updates == {"image_path": "qr.png"}
+
+    def test_unknown_variable(self, snapshot):
+        """Test that reading a variable that isn't an input fails clearly."""
+        with pytest.raises(AttributeError, match="add_logo is not an input"):
+            assert snapshot.add_logo is None
+
+    def test_taipy_actions(self, snapshot):
+        """Test that get_state_id works, and notifications are recorded."""
+        assert get_state_id(snapshot) == "session-1"
+        notify(snapshot, "w", "Slow down")
+        ((method, args),) = snapshot._actions
+        assert method is Gui._notify
+        assert args[:2] == ("w", "Slow down")
+
+    def test_apply_to_state(self, snapshot, monkeypatch):
+        """Test that changes and notifications go to the State in one batch."""
+        monkeypatch.setattr(FakeState, "_gui", Gui.__new__(Gui))
+        state = FakeState("session-1", {"image_path": None})
+        snapshot.image_path = "qr.png"
+        notify(snapshot, "s", "Done")
+        snapshot.apply_to(state)
+        assert state.image_path == "qr.png"
+        assert state.notifications == [("s", "Done")]
+
+    def test_snapshot_state(self, execution):
+        """Test that only the inputs are copied."""
+        state = FakeState("session-1", {"content": "a.mp4", "fps": 10})
+        copied = execution.snapshot_state(state, "session-1", ("content",))
+        assert copied._inputs == {"content": "a.mp4"}
+
+    def test_picklable(self, snapshot):
+        """Test that a snapshot, with its recorded actions, can cross processes."""
+        notify(snapshot, "i", "Hello")
+        snapshot.image_path = "qr.png"
+        copied = pickle.loads(pickle.dumps(snapshot))
+        assert copied.image_path == "qr.png"
+        assert copied._actions[0][0] is Gui._notify
+
+
+class TestSubmit:
+    """Test running callbacks on the pools."""
+
+    def test_thread(self, execution, snapshot):
+        """Test that the thread pool returns the snapshot with its changes."""
+        result = execution.submit("thread", _render, snapshot).result()
+        assert result.image_path == "/api/artifacts/hello.png"
+        assert result.pid == os.getpid()
+
+    def test_process(self, execution, snapshot):
+        """Test that the process pool runs the undecorated callback elsewhere."""
+        result = execution.submit("process", render_in_process, snapshot).result(
+            timeout=120
+        )
+        assert result.image_path == "/api/artifacts/hello.png"
+        assert result.pid != os.getpid()
+        assert result._actions[0][1][1] == "Rendered for session-1"
+
+    def test_error_carries_snapshot(self, execution, snapshot):
+        """Test that the changes made before an error aren't lost."""
+        error = execution.submit("thread", _fail, snapshot).exception()
+        assert isinstance(error, ValueError)
+        assert error.snapshot._updates == {"names_content": None}
+
+    def test_unknown_policy(self, execution, snapshot):
+        """Test that only the pool policies can be submitted."""
+        with pytest.raises(ValueError, match="Unsupported execution policy: inline"):
+            execution.submit("inline", _render, snapshot)
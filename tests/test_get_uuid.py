@@ -100,3 +100,16 @@ class TestGetUUID:
                 uuid_str = str(result)
                 assert len(uuid_str) == 36
                 assert uuid_str.count("-") == 4
+
+    def test_uuid5_namespace(self):
+        """Test that the namespace changes name-based UUIDs"""
+        result_dns = get_uuid("5", name="example.com", namespace="DNS")
+        result_url = get_uuid("5", name="example.com", namespace="URL")
+        assert result_dns != result_url
+
+    def test_uuid3_custom_namespace(self):
+        """Test that a UUID string can be used as namespace"""
+        namespace = "12345678-1234-5678-1234-567812345678"
+        result = get_uuid("3", name="example.com", namespace=namespace)
+        assert result.version == 3
+        assert result == get_uuid("3", name="example.com", namespace=namespace)
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from src.algorithms.gif_optimizer import optimize_gif
+from src.algorithms.video_to_gif_functions import video_to_gif
+from tests.conftest import requires_ffmpeg
+
+SIZE = (64, 48)
+
+
+def _save_gif(path, frames, duration=100):
+    images = [Image.fromarray(frame) for frame in frames]
+    images[0].save(
+        path, save_all=True, append_images=images[1:], duration=duration, loop=0
+    )
+    return str(path)
+
+
+def _read_gif(path):
+    """Composited RGB frames and durations, as a viewer displays them"""
+    with Image.open(path) as gif:
+        return [
+            (np.asarray(frame.convert("RGB")).astype(int), frame.info["duration"])
+            for frame in ImageSequence.Iterator(gif)
+        ]
+
+
+def _background(seed=0):
+    """A noisy 16-color background, which compresses poorly"""
+    colors = np.random.default_rng(seed).integers(0, 256, (16, 3), dtype=np.uint8)
+    indices = np.random.default_rng(seed + 1).integers(0, 16, SIZE[::-1])
+    return colors[indices]
+
+
+def _moving_corners(count=6):
+    """Small squares moving in opposite corners: a frame-wide change box"""
+    frames = []
+    for i in range(count):
+        frame = _background().copy()
+        frame[i : i + 4, i : i + 4] = (255, 0, 0)
+        frame[-4 - i : SIZE[1] - i, -4 - i : SIZE[0] - i] = (0, 0, 255)
+        frames.append(frame)
+    return frames
+
+
+class TestOptimizeGif:
+    """Test the GIF post-optimizer."""
+
+    def test_lossless(self, tmp_path):
+        """Test that frames are unchanged, and the GIF smaller."""
+        original = _save_gif(tmp_path / "in.gif", _moving_corners())
+        output = tmp_path / "out.gif"
+        report = optimize_gif(original, str(output))
+        assert report["applied"]
+        assert report["output_bytes"] == output.stat().st_size
+        assert report["output_bytes"] < report["input_bytes"]
+        assert 0 < report["reduction"] < 1
+        assert report["seconds"] > 0
+        for (expected, _), (frame, _) in zip(
+            _read_gif(original), _read_gif(output), strict=True
+        ):
+            assert np.array_equal(frame, expected)
+
+    def test_in_place(self, tmp_path):
+        """Test that the GIF is replaced when there's no output path."""
+        original = _save_gif(tmp_path / "in.gif", _moving_corners())
+        report = optimize_gif(original)
+        assert (tmp_path / "in.gif").stat().st_size == report["output_bytes"]
+
+    def test_lossy_tolerance(self, tmp_path):
+        """Test that colors stay within the tolerance, for fewer bytes."""
+        frames = [
+            np.clip(_background().astype(int) + offset, 0, 255).astype(np.uint8)
+            for offset in (0, 3, -2, 5)
+        ]
+        for frame in frames:
+            frame[10:20, 10:20] = (0, 255, 0)
+        original = _save_gif(tmp_path / "in.gif", frames)
+        lossless = optimize_gif(original, str(tmp_path / "lossless.gif"))
+        lossy = optimize_gif(original, str(tmp_path / "lossy.gif"), tolerance=8)
+        assert lossy["output_bytes"] < lossless["output_bytes"]
+        displayed = _read_gif(tmp_path / "lossy.gif")
+        # Nothing changed by more than the tolerance: one long frame
+        assert (lossy["frames"], lossy["merged_frames"]) == (1, 3)
+        assert displayed[0][1] == 400
+        for expected, _ in _read_gif(original):
+            assert np.abs(displayed[0][0] - expected).max() <= 8
+
+    def test_kept_if_not_smaller(self, tmp_path):
+        """Test that the original is kept when rewriting doesn't shrink it."""
+        original = _save_gif(tmp_path / "in.gif", [_background()])
+        output = tmp_path / "out.gif"
+        report = optimize_gif(original, str(output))
+        assert not report["applied"]
+        assert report["reduction"] == 0
+        assert output.read_bytes() == (tmp_path / "in.gif").read_bytes()
+
+    def test_too_many_colors(self, tmp_path):
+        """Test that GIFs beyond one 256-color palette are kept as is."""
+        gradient = np.arange(200, dtype=np.uint8).reshape(10, 20)
+        frames = [
+            np.stack([gradient, gradient, np.full_like(gradient, blue)], axis=-1)
+            for blue in (0, 255)
+        ]
+        report = optimize_gif(_save_gif(tmp_path / "in.gif", frames))
+        assert not report["applied"]
+        assert report["frames"] == 2
+
+    @pytest.mark.parametrize("tolerance", [-1, 256])
+    def test_invalid_tolerance(self, tmp_path, tolerance):
+        """Test that the tolerance must be a channel difference."""
+        original = _save_gif(tmp_path / "in.gif", _moving_corners())
+        with pytest.raises(ValueError, match="tolerance must be 0-255"):
+            optimize_gif(original, tolerance=tolerance)
+
+
+@requires_ffmpeg
+def test_video_to_gif_optimize(tmp_path, synthetic_video):
+    """Test that optimized GIFs and previews display the same frames."""
+    plain, optimized = tmp_path / "plain.gif", tmp_path / "optimized.gif"
+    assert video_to_gif(synthetic_video, str(plain), duration=1, fps=10)
+    assert video_to_gif(
+        synthetic_video,
+        str(optimized),
+        duration=1,
+        fps=10,
+        preview_path=str(tmp_path / "preview.gif"),
+        optimize=True,
+    )
+    assert optimized.stat().st_size <= plain.stat().st_size
+    for (expected, _), (frame, _) in zip(
+        _read_gif(plain), _read_gif(optimized), strict=True
+    ):
+        assert np.array_equal(frame, expected)
+    assert (tmp_path / "preview.gif").exists()
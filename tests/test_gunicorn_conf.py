@@ -0,0 +1,45 @@
+import importlib.util
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+SRC_DIR = Path(__file__).parents[1] / "src"
+
+
+@pytest.fixture
+def conf(tmp_path, monkeypatch):
+    """Load the settings file from src/, like gunicorn does."""
+    monkeypatch.syspath_prepend(SRC_DIR)
+    monkeypatch.setenv("TAIPY_TOOLS_WORKER_ID_DIR", str(tmp_path))
+    monkeypatch.delenv("TAIPY_TOOLS_WORKER_ID", raising=False)
+    spec = importlib.util.spec_from_file_location("conf", SRC_DIR / "gunicorn.conf.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    # Releases the worker ID that post_fork claimed for this process
+    importlib.import_module("algorithms.uuid_monotonic")._forget_parent_state()
+
+
+def _server(workers):
+    return SimpleNamespace(cfg=SimpleNamespace(workers=workers))
+
+
+class TestGunicornConf:
+    """Test the gunicorn hooks."""
+
+    def test_single_worker(self, conf):
+        """Test that gunicorn starts with one worker."""
+        conf.on_starting(_server(1))
+
+    def test_refuses_several_workers(self, conf):
+        """Test that several workers, which can't share sessions, are refused."""
+        with pytest.raises(RuntimeError, match="got 4"):
+            conf.on_starting(_server(4))
+
+    def test_post_fork_claims_worker_id(self, conf, tmp_path):
+        """Test that each worker claims a worker ID, and exports it."""
+        conf.post_fork(_server(1), None)
+        assert os.environ["TAIPY_TOOLS_WORKER_ID"] == "0"
+        assert (tmp_path / "0.lock").exists()
@@ -0,0 +1,233 @@
+import io
+import threading
+import zipfile
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+from PIL import Image
+
+from src.algorithms import http_api
+from src.algorithms.artifact_storage import save_artifact
+from src.algorithms.http_api import MAX_BATCH_SIZE, api
+from src.algorithms.uuid_names import hash_names
+from tests.conftest import requires_ffmpeg
+
+
+@pytest.fixture
+def client():
+    """A Flask test client with only the API blueprint mounted."""
+    app = Flask(__name__)
+    app.register_blueprint(api)
+    return app.test_client()
+
+
+class TestUUIDEndpoint:
+    """Test GET /api/uuid."""
+
+    def test_default_single_uuid4(self, client):
+        """Test that one UUIDv4 is returned by default."""
+        response = client.get("/api/uuid")
+        assert response.status_code == 200
+        (uuid,) = response.json["uuids"]
+        assert len(uuid) == 36
+        assert uuid[14] == "4"
+
+    @pytest.mark.parametrize("uuid_type", ["1", "4", "6", "7"])
+    def test_batch(self, client, uuid_type):
+        """Test that `count` unique UUIDs of the requested version are returned."""
+        response = client.get(f"/api/uuid?type={uuid_type}&count=50")
+        uuids = response.json["uuids"]
+        assert len(set(uuids)) == 50
+        assert all(uuid[14] == uuid_type for uuid in uuids)
+
+    def test_name_based(self, client):
+        """Test that name and namespace are used for name-based UUIDs."""
+        response = client.get("/api/uuid?type=5&name=example.com&namespace=URL")
+        assert response.json["uuids"] == hash_names("5", "URL", ["example.com"])
+
+    def test_name_based_batch_rejected(self, client):
+        """Test that a count is rejected for name-based UUIDs."""
+        response = client.get("/api/uuid?type=3&name=a&count=2")
+        assert response.status_code == 400
+        assert "name-based" in response.json["error"]
+
+    @pytest.mark.parametrize(
+        "query", ["type=99", "count=0", f"count={MAX_BATCH_SIZE + 1}", "count=x"]
+    )
+    def test_bad_requests(self, client, query):
+        """Test that invalid parameters return a 400 JSON error."""
+        response = client.get(f"/api/uuid?{query}")
+        assert response.status_code == 400
+        assert response.json["error"]
+
+
+class TestNameUUIDsEndpoint:
+    """Test POST /api/uuid/names."""
+
+    def test_hashes_each_name(self, client):
+        """Test that one UUID is returned for each name, in order."""
+        names = ["a", "b", "a"]
+        response = client.post(
+            "/api/uuid/names", json={"type": "3", "namespace": "OID", "names": names}
+        )
+        assert response.json["uuids"] == hash_names("3", "OID", names)
+
+    @pytest.mark.parametrize("body", [{}, {"names": []}, {"names": "a"}, ["a"]])
+    def test_bad_requests(self, client, body):
+        """Test that missing or malformed name lists are rejected."""
+        response = client.post("/api/uuid/names", json=body)
+        assert response.status_code == 400
+
+
+class TestQREndpoints:
+    """Test POST /api/qr and /api/qr/batch."""
+
+    def test_returns_png(self, client):
+        """Test that the QR code is returned as PNG in the response body."""
+        response = client.post("/api/qr", json={"message": "hello", "scale": 5})
+        assert response.status_code == 200
+        assert response.mimetype == "image/png"
+        assert Image.open(io.BytesIO(response.data)).format == "PNG"
+
+    def test_empty_message(self, client):
+        """Test that an empty message returns a 400 JSON error."""
+        response = client.post("/api/qr", json={"message": " "})
+        assert response.status_code == 400
+        assert response.json["error"] == "Message cannot be empty"
+
+    def test_scale_out_of_range(self, client):
+        """Test that huge images can't be requested."""
+        response = client.post("/api/qr", json={"message": "hello", "scale": 1000})
+        assert response.status_code == 400
+
+    def test_not_json(self, client):
+        """Test that a non-JSON body is rejected."""
+        response = client.post("/api/qr", data="hello")
+        assert response.status_code == 400
+
+    def test_batch_returns_zip(self, client):
+        """Test that a batch returns one PNG per message, in order."""
+        response = client.post("/api/qr/batch", json={"messages": ["a", "b", "c"]})
+        assert response.mimetype == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+            assert archive.namelist() == ["0001.png", "0002.png", "0003.png"]
+            single = client.post("/api/qr", json={"message": "b"}).data
+            assert archive.read("0002.png") == single
+
+
+class TestHealthEndpoint:
+    """Test GET /api/health."""
+
+    def test_not_ready(self, client):
+        """Test that a worker that hasn't built its pages isn't healthy."""
+        with patch.object(http_api, "_ready", threading.Event()):
+            response = client.get("/api/health")
+        assert response.status_code == 503
+        assert response.json["ready"] is False
+
+    def test_ready(self, client):
+        """Test that a ready worker with a working store is healthy."""
+        with patch.object(http_api, "_ready", threading.Event()):
+            http_api.mark_ready()
+            response = client.get("/api/health")
+        assert response.status_code == 200
+        assert response.json["status"] == "ok"
+        assert response.json["shared_store"] is True
+
+    def test_broken_store(self, client):
+        """Test that a worker without a usable shared store isn't healthy."""
+        with (
+            patch.object(http_api, "_ready", threading.Event()),
+            patch("src.algorithms.shared_store.SharedStore.ping", return_value=False),
+        ):
+            http_api.mark_ready()
+            response = client.get("/api/health")
+        assert response.status_code == 503
+        assert response.json["shared_store"] is False
+
+
+class TestReadyEndpoint:
+    """Test GET /api/ready."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_worker(self):
+        """Start each test with a worker that hasn't run its checks yet."""
+        with (
+            patch.object(http_api, "_ready", threading.Event()),
+            patch.object(http_api, "_startup_checks", {}),
+        ):
+            yield
+
+    def test_ready(self, client, monkeypatch):
+        """Test that a worker whose checks all pass is ready."""
+        monkeypatch.setattr(http_api, "LOGO_PATH", "src/img/logo.png")
+        http_api.mark_ready(require_ffmpeg=False)
+        response = client.get("/api/ready")
+        assert response.status_code == 200
+        assert set(response.json["checks"]) == {"logo", "shared_store"}
+
+    def test_not_ready(self, client):
+        """Test that a worker that hasn't run its checks isn't ready."""
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json["ready"] is False
+
+    def test_missing_logo(self, client, tmp_path, monkeypatch):
+        """Test that a missing or broken logo fails the readiness check."""
+        logo_path = tmp_path / "logo.png"
+        logo_path.write_bytes(b"not a png")
+        monkeypatch.setattr(http_api, "LOGO_PATH", str(logo_path))
+        http_api.mark_ready(require_ffmpeg=False)
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json["checks"]["logo"]["ok"] is False
+
+    def test_missing_ffmpeg(self, client, monkeypatch):
+        """Test that the video tool needs the ffmpeg binaries."""
+        monkeypatch.setattr(http_api, "LOGO_PATH", "src/img/logo.png")
+        monkeypatch.setenv("PATH", "")
+        http_api.mark_ready()
+        response = client.get("/api/ready")
+        assert response.status_code == 503
+        assert response.json["checks"]["ffmpeg"] == {
+            "ok": False,
+            "detail": "ffmpeg not found in PATH",
+        }
+
+    @requires_ffmpeg
+    def test_ffmpeg_version(self):
+        """Test that the ffmpeg check reports the version it found."""
+        check = http_api.run_startup_checks()["ffmpeg"]
+        assert check["ok"] is True
+        assert check["detail"].startswith("ffmpeg version")
+
+
+class TestQRCache:
+    """Test that QR codes are cached in the shared store."""
+
+    def test_renders_once(self, client):
+        """Test that the same request is rendered only once."""
+        body = {"message": "cached message", "scale": 3}
+        with patch(
+            "src.algorithms.qr_code_functions.render_qr_code", return_value=b"png"
+        ) as mock_render:
+            first = client.post("/api/qr", json=body).data
+            second = client.post("/api/qr", json=body).data
+        assert first == second == b"png"
+        mock_render.assert_called_once()
+
+
+class TestArtifactEndpoint:
+    """Test that artifacts kept in memory are served to the GUI."""
+
+    def test_serves_artifact(self, client):
+        """Test that the artifact is returned with its MIME type."""
+        response = client.get(save_artifact(b"GIF89a", ".gif"))
+        assert response.status_code == 200
+        assert response.mimetype == "image/gif"
+        assert response.data == b"GIF89a"
+
+    def test_unknown_artifact(self, client):
+        """Test that unknown or evicted artifacts return 404."""
+        assert client.get("/api/artifacts/missing.png").status_code == 404
@@ -0,0 +1,47 @@
+from argparse import ArgumentTypeError
+
+import pytest
+from taipy.gui import Gui, get_state_id, notify
+
+from benchmarks.load_test import FakeState, _latency_summary, _parse_mix
+
+
+@pytest.fixture
+def state(monkeypatch):
+    monkeypatch.setattr(FakeState, "_gui", Gui())
+    return FakeState("session", {"qr_scale": 8})
+
+
+class TestFakeState:
+    """Test that the fake State works with Taipy's callback actions."""
+
+    def test_variables(self, state):
+        """Test that variables are read and written like on a State."""
+        with state as s:
+            s.qr_scale += 1
+        assert state.qr_scale == 9
+
+    def test_taipy_actions(self, state):
+        """Test that notifications are recorded and the session ID returned."""
+        notify(state, "w", "Server busy, retry in 1 s")
+        assert get_state_id(state) == "session"
+        assert state.notifications == [("w", "Server busy, retry in 1 s")]
+
+
+class TestReport:
+    """Test the load test's options and statistics."""
+
+    def test_latency_summary(self):
+        """Test the percentiles and throughput of a callback."""
+        summary = _latency_summary([i / 100 for i in range(1, 101)], 3, wall=10)
+        assert summary["calls"] == 100
+        assert summary["rejected"] == 3
+        assert summary["p50"] == pytest.approx(0.505)
+        assert summary["p99"] == pytest.approx(0.9901)
+        assert summary["per_second"] == 10
+
+    def test_parse_mix(self):
+        """Test that weights default to 1 and unknown tools are rejected."""
+        assert _parse_mix("uuid=10,qr") == {"uuid": 10.0, "qr": 1.0}
+        with pytest.raises(ArgumentTypeError, match="Unsupported tool: gif"):
+            _parse_mix("gif=1")
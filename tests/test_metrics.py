@@ -0,0 +1,115 @@
+import os
+import signal
+import subprocess
+import sys
+from collections import Counter, defaultdict, deque
+
+import pytest
+
+from src.algorithms import metrics
+from src.algorithms.metrics import (
+    add_to_gauge,
+    collect_metrics,
+    disk_usage,
+    ffmpeg_processes,
+    latency_percentiles,
+    record_latency,
+)
+from tests.conftest import requires_ffmpeg
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    """Start each test without recorded latencies or gauges."""
+    monkeypatch.setattr(
+        metrics, "_latencies", defaultdict(lambda: deque(maxlen=metrics.LATENCY_WINDOW))
+    )
+    monkeypatch.setattr(metrics, "_gauges", Counter())
+
+
+class TestLatencies:
+    """Test the callback latency percentiles."""
+
+    def test_percentiles(self):
+        """Test the percentiles of each callback's calls."""
+        for milliseconds in range(1, 101):
+            record_latency("convert_to_gif", milliseconds / 1000)
+        record_latency("select_uuid", 0.002)
+        summaries = latency_percentiles()
+        assert list(summaries) == ["convert_to_gif", "select_uuid"]
+        assert summaries["convert_to_gif"]["calls"] == 100
+        assert summaries["convert_to_gif"]["p50"] == pytest.approx(0.0505)
+        assert summaries["convert_to_gif"]["p99"] == pytest.approx(0.09901)
+        assert summaries["select_uuid"]["p95"] == 0.002
+
+    def test_window(self, monkeypatch):
+        """Test that only the last calls are kept."""
+        for seconds in (10.0, 1.0, 1.0):
+            record_latency("make_qr_code", seconds)
+        assert latency_percentiles()["make_qr_code"]["calls"] == 3
+        monkeypatch.setattr(metrics, "_latencies", defaultdict(lambda: deque(maxlen=2)))
+        for seconds in (10.0, 1.0, 1.0):
+            record_latency("make_qr_code", seconds)
+        assert latency_percentiles()["make_qr_code"]["p99"] == 1.0
+
+
+def test_disk_usage(tmp_path):
+    """Test that the files of every subdirectory are counted."""
+    (tmp_path / "artifacts" / "ab").mkdir(parents=True)
+    (tmp_path / "artifacts" / "ab" / "ab12.gif").write_bytes(b"x" * 100)
+    (tmp_path / "upload.mp4").write_bytes(b"x" * 20)
+    assert disk_usage(tmp_path) == 120
+    assert disk_usage(tmp_path / "missing") == 0
+
+
+@requires_ffmpeg
+@pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+def test_ffmpeg_processes():
+    """Test that a running ffmpeg process is listed with its CPU and memory."""
+    process = subprocess.Popen(
+        ["ffmpeg", "-re", "-f", "lavfi", "-i", "testsrc", "-f", "null", "-"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        listed = {found["pid"]: found for found in ffmpeg_processes()}
+    finally:
+        process.kill()
+        process.wait()
+    assert listed[process.pid]["name"] == "ffmpeg"
+    assert listed[process.pid]["rss_mib"] > 0
+    assert listed[process.pid]["cpu_percent"] >= 0
+
+
+@requires_ffmpeg
+@pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+def test_ffmpeg_processes_of_this_worker_only():
+    """Test that ffmpeg processes this worker didn't start aren't listed."""
+    # The shell exits at once: its ffmpeg is adopted by init, out of this tree
+    command = "ffmpeg -re -f lavfi -i testsrc -f null - </dev/null >/dev/null 2>&1"
+    launcher = subprocess.run(
+        ["sh", "-c", f"{command} & echo $!"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    orphan_pid = int(launcher.stdout)
+    try:
+        listed = [found["pid"] for found in ffmpeg_processes()]
+    finally:
+        os.kill(orphan_pid, signal.SIGKILL)
+    assert orphan_pid not in listed
+
+
+def test_collect_metrics():
+    """Test that the metrics gather the gauges, jobs and caches."""
+    add_to_gauge("batch_videos_waiting", 3)
+    add_to_gauge("batch_videos_waiting", -1)
+    record_latency("select_uuid", 0.001)
+    collected = collect_metrics(sessions=2)
+    assert collected["sessions"] == 2
+    assert collected["batch_videos_waiting"] == 2
+    assert list(collected["callbacks"]) == ["select_uuid"]
+    assert set(collected["disk"]) == {"deposit_files", "artifacts", "memory_artifacts"}
+    assert isinstance(collected["running_jobs"], dict)
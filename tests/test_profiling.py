@@ -0,0 +1,104 @@
+import pstats
+import threading
+import tracemalloc
+
+import pytest
+
+from src.algorithms import profiling
+from src.algorithms.profiling import (
+    disable_profiling,
+    enable_profiling,
+    list_profiles,
+    profile,
+    should_profile,
+)
+
+
+@pytest.fixture
+def profile_dir(tmp_path):
+    """Write the profiles of the test to a temporary directory."""
+    enable_profiling(profile_dir=tmp_path)
+    yield tmp_path
+    enable_profiling()
+
+
+def _allocate_images():
+    return [bytearray(1024 * 1024) for _ in range(4)]
+
+
+class TestSettings:
+    """Test which calls are profiled."""
+
+    def test_disabled_by_default(self, profile_dir):
+        """Test that nothing is profiled until profiling is enabled."""
+        assert profiling.enabled is False
+        assert not should_profile("make_qr_code")
+
+    def test_named_callbacks(self, profile_dir):
+        """Test that every call of a named callback is profiled."""
+        enable_profiling(callbacks=["convert_to_gif"], profile_dir=profile_dir)
+        assert should_profile("convert_to_gif")
+        assert not should_profile("make_qr_code")
+
+    def test_sample_rate(self, profile_dir):
+        """Test that a sample rate of 1 profiles every call, until disabled."""
+        enable_profiling(sample_rate=1.0, profile_dir=profile_dir)
+        assert should_profile("make_qr_code")
+        disable_profiling()
+        assert not should_profile("make_qr_code")
+
+    def test_invalid_sample_rate(self):
+        """Test that a sample rate outside [0, 1] raises ValueError."""
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            enable_profiling(sample_rate=5)
+
+
+class TestProfile:
+    """Test the profiles written for a call."""
+
+    def test_writes_stats_and_allocations(self, profile_dir):
+        """Test that the .prof and .txt files hold the call's functions."""
+        with profile("make_qr_code") as profiler:
+            images = _allocate_images()
+        assert profiler is not None
+        assert len(images) == 4
+        (summary_path,) = list_profiles(profile_dir)
+        assert "-make_qr_code-" in summary_path.name
+        summary = summary_path.read_text()
+        assert summary.startswith("Callback: make_qr_code")
+        assert "test_profiling.py" in summary.split("allocations")[1]
+        stats = pstats.Stats(str(summary_path.with_suffix(".prof")))
+        assert any(name == "_allocate_images" for _, _, name in stats.stats)
+
+    def test_stops_tracemalloc(self, profile_dir):
+        """Test that tracemalloc is only on during the call."""
+        with profile("select_uuid"):
+            assert tracemalloc.is_tracing()
+        assert not tracemalloc.is_tracing()
+
+    def test_failing_call(self, profile_dir):
+        """Test that a failing call is profiled, then its exception raised."""
+        with pytest.raises(ValueError), profile("select_uuid"):
+            raise ValueError("Unsupported UUID type")
+        assert len(list_profiles(profile_dir)) == 1
+
+    def test_one_call_at_a_time(self, profile_dir):
+        """Test that a call made while another is profiled runs unprofiled."""
+        inner = []
+        with profile("convert_to_gif"):
+            thread = threading.Thread(
+                target=lambda: inner.append(profile("make_qr_code").__enter__())
+            )
+            thread.start()
+            thread.join()
+        assert inner == [None]
+        assert len(list_profiles(profile_dir)) == 1
+
+    def test_old_profiles_deleted(self, profile_dir, monkeypatch):
+        """Test that only the last MAX_PROFILES profiles are kept."""
+        monkeypatch.setattr(profiling, "MAX_PROFILES", 2)
+        for _ in range(3):
+            with profile("select_uuid"):
+                pass
+        assert len(list_profiles(profile_dir)) == 2
+        assert len(list(profile_dir.glob("*.prof"))) == 2
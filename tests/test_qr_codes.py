@@ -1,17 +1,17 @@
 from pathlib import Path
-from unittest.mock import patch
 
 import pytest
 from PIL import Image
 
+from src.algorithms.artifact_storage import ARTIFACT_URL, get_memory_artifact
 from src.algorithms.qr_code_functions import (
     _add_center_image,
     _calculate_center_position,
     _center,
-    _cleanup_temp_file,
     _prepare_center_image,
     create_qr_code,
     generate_qr_code,
+    render_qr_code,
 )
 
 
@@ -58,18 +58,21 @@ class TestBasicQRCreation:
             Path(result).unlink()
 
     def test_generate_qr_code_success(self):
-        with patch("src.algorithms.qr_code_functions.create_qr_code"):
-            result = generate_qr_code(
-                message="Test message",
-                add_logo=True,
-                dark_color="#000",
-                light_color="#FFF",
-                transparent_background=False,
-                qr_scale=10,
-                qr_border=4,
-            )
-            assert result.startswith("./deposit_files/")
-            assert result.endswith(".png")
+        """Test that the small QR code is kept in memory and served by the API."""
+        result = generate_qr_code(
+            message="Test message",
+            add_logo=True,
+            dark_color="#000",
+            light_color="#FFF",
+            transparent_background=False,
+            qr_scale=10,
+            qr_border=4,
+        )
+        assert result.startswith(ARTIFACT_URL)
+        assert result.endswith(".png")
+        data, mimetype = get_memory_artifact(result.removeprefix(ARTIFACT_URL))
+        assert data.startswith(b"\x89PNG")
+        assert mimetype == "image/png"
 
     def test_generate_qr_code_text_too_long(self):
         with pytest.raises(ValueError, match="Text too long"):
@@ -269,23 +272,6 @@ class TestAddCenterImage:
         assert result.size == qr_img.size
 
 
-class TestCleanupTempFile:
-    """Test temporary file cleanup."""
-
-    def test_deletes_existing_file(self, tmp_path):
-        """Test that existing temp file is deleted."""
-        temp_file = tmp_path / "temp_test.png"
-        temp_file.touch()
-        _cleanup_temp_file(temp_file)
-        assert not temp_file.exists()
-
-    def test_handles_nonexistent_file(self, tmp_path):
-        """Test handling when temp file doesn't exist."""
-        temp_file = tmp_path / "nonexistent.png"
-        _cleanup_temp_file(temp_file)
-        assert True
-
-
 class TestQRCodeIntegration:
     """Integration tests for complete QR code creation."""
 
@@ -328,3 +314,22 @@ class TestQRCodeIntegration:
         create_qr_code("first", output_path=str(qr_output_path))
         create_qr_code("second data with more content", output_path=str(qr_output_path))
         assert qr_output_path.exists()
+
+
+class TestRenderQRCode:
+    """Test in-memory QR code rendering."""
+
+    def test_returns_png_bytes(self):
+        """Test that PNG bytes are returned and no file is written."""
+        png = render_qr_code("test data")
+        assert png.startswith(b"\x89PNG")
+
+    def test_matches_file_output(self, qr_output_path):
+        """Test that the bytes match the file created with the same options."""
+        create_qr_code("test data", output_path=str(qr_output_path))
+        assert render_qr_code("test data") == qr_output_path.read_bytes()
+
+    def test_empty_message(self):
+        """Test that the message is validated like generate_qr_code."""
+        with pytest.raises(ValueError, match="Message cannot be empty"):
+            render_qr_code("   ")
@@ -0,0 +1,159 @@
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from src.algorithms import metrics, session_activity
+from src.algorithms.artifact_storage import save_artifact
+from src.algorithms.session_activity import (
+    DEFAULT_IDLE_TIMEOUT,
+    SessionActivity,
+    free_session,
+    get_idle_timeout,
+)
+from src.algorithms.shared_store import get_shared_store
+from src.algorithms.video_ingest import ingest_video
+
+MP4_HEADER = b"\x00\x00\x00\x20ftypisom"
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def activity(clock, monkeypatch):
+    """A fresh tracker, also used by free_session."""
+    tracker = SessionActivity(clock)
+    monkeypatch.setattr(session_activity, "activity", tracker)
+    return tracker
+
+
+def _ingest(tmp_path, name, content):
+    upload_path = tmp_path / name
+    upload_path.write_bytes(content)
+    return ingest_video(str(upload_path), str(tmp_path / "uploads"))["path"]
+
+
+class TestSessionActivity:
+    """Test which sessions are idle."""
+
+    def test_idle_after_timeout(self, activity, clock):
+        """Test that only the sessions inactive for the timeout are idle."""
+        activity.touch("old")
+        clock.now = 50
+        activity.touch("recent")
+        clock.now = 100
+        assert activity.idle_sessions(60) == ["old"]
+        assert activity.idle_sessions(10) == ["old", "recent"]
+
+    def test_running_call_is_active(self, activity, clock):
+        """Test that a session stays active while a long call runs."""
+        with activity.running("session"):
+            clock.now = 1000
+            assert activity.idle_sessions(60) == []
+        assert activity.idle_sessions(60) == []
+        clock.now = 1100
+        assert activity.idle_sessions(60) == ["session"]
+
+    def test_upload_is_activity(self, activity, clock):
+        """Test that an upload without a decorated callback is tracked too."""
+        activity.add_upload("session", "a.mp4")
+        clock.now = 100
+        assert activity.idle_sessions(60) == ["session"]
+
+    def test_forget(self, activity):
+        """Test that a forgotten session returns its uploads and isn't tracked."""
+        activity.add_upload("session", "a.mp4")
+        activity.add_upload("session", "b.mp4")
+        activity.remove_upload("session", "a.mp4")
+        assert activity.forget("session") == ["b.mp4"]
+        assert activity.idle_sessions(0) == []
+        assert activity.forget("session") == []
+
+    def test_no_session_id(self, activity):
+        """Test that calls outside a session aren't tracked."""
+        activity.touch(None)
+        activity.add_upload(None, "a.mp4")
+        assert activity.idle_sessions(-1) == []
+
+
+class TestFreeSession:
+    """Test freeing the files of an idle or ended session."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_store(self, tmp_path, monkeypatch):
+        """Start each test with empty stores and gauges."""
+        monkeypatch.setenv("TAIPY_TOOLS_STORE", str(tmp_path / "store.sqlite3"))
+        monkeypatch.setattr(metrics, "_gauges", Counter())
+        return get_shared_store()
+
+    def test_frees_uploads_and_artifacts(self, tmp_path, activity):
+        """Test that the uploads and artifacts are deleted, and reported."""
+        video = _ingest(tmp_path, "a.mp4", MP4_HEADER + b"x" * 100)
+        activity.add_upload("session", video)
+        save_artifact(b"x" * 10, ".png", "session")
+        freed = free_session("session")
+        assert freed == {
+            "artifacts": 1,
+            "memory_bytes": 10,
+            "disk_bytes": 112,
+            "uploads": 1,
+        }
+        assert list((tmp_path / "uploads").iterdir()) == []
+        assert metrics.collect_metrics()["freed_sessions"] == {
+            "sessions": 1,
+            "memory_bytes": 10,
+            "disk_bytes": 112,
+        }
+
+    def test_other_uploads(self, tmp_path, activity):
+        """Test that uploads that aren't videos are deleted and counted."""
+        names_path = tmp_path / "names.txt"
+        names_path.write_text("alice\nbob\n")
+        freed = free_session("session", (str(names_path), str(tmp_path / "gone")))
+        assert freed["uploads"] == 1
+        assert freed["disk_bytes"] == 10
+        assert not names_path.exists()
+
+    def test_keeps_uploads_of_other_sessions(self, tmp_path, activity):
+        """Test that an upload shared with another session stays on disk."""
+        content = MP4_HEADER + b"x" * 100
+        mine = _ingest(tmp_path, "a.mp4", content)
+        other = _ingest(tmp_path, "b.mp4", content)
+        activity.add_upload("mine", mine)
+        activity.add_upload("other", other)
+        assert free_session("mine")["disk_bytes"] == 0
+        assert Path(other).read_bytes() == content
+
+    def test_nothing_to_free(self, activity):
+        """Test that a session without files isn't counted."""
+        activity.touch("session")
+        assert free_session("session")["uploads"] == 0
+        assert metrics.collect_metrics()["freed_sessions"]["sessions"] == 0
+
+
+class TestIdleTimeout:
+    """Test the idle timeout setting."""
+
+    def test_default(self, monkeypatch):
+        """Test the default timeout."""
+        monkeypatch.delenv("TAIPY_TOOLS_SESSION_IDLE_TIMEOUT", raising=False)
+        assert get_idle_timeout() == DEFAULT_IDLE_TIMEOUT
+
+    def test_invalid(self, monkeypatch):
+        """Test that a timeout that isn't a number raises ValueError."""
+        monkeypatch.setenv("TAIPY_TOOLS_SESSION_IDLE_TIMEOUT", "soon")
+        with pytest.raises(ValueError, match="number of seconds"):
+            get_idle_timeout()
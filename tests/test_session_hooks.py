@@ -0,0 +1,70 @@
+import importlib
+import importlib.metadata
+import inspect
+from pathlib import Path
+
+import pytest
+from taipy.gui import Gui
+
+SRC_DIR = Path(__file__).parents[1] / "src"
+
+
+@pytest.fixture(scope="module")
+def session_hooks():
+    """Import the module from src/, like the app does."""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.syspath_prepend(SRC_DIR)
+        yield importlib.import_module("taipy_utilities.session_hooks")
+
+
+@pytest.fixture
+def gui():
+    """A Gui with two sessions: client-1 in one tab, client-2 in two."""
+    gui = Gui()
+    # Set once the Gui runs: no variable is shared between sessions
+    gui._get_shared_variables = list
+    bindings = gui._bindings()
+    bindings._set_single_client(False)
+    for client_id in ("client-1", "client-2"):
+        bindings._get_or_create_scope(client_id)
+    gui._Gui__client_id_2_sid.update(
+        {"client-1": {"sid-1"}, "client-2": {"sid-2", "sid-3"}}
+    )
+    return gui
+
+
+class TestTaipyPrivateAPI:
+    """Test the Taipy internals that the hooks rely on."""
+
+    def test_taipy_gui_version(self):
+        """Test that taipy-gui is a 4.1 release, which the hooks were written for."""
+        assert importlib.metadata.version("taipy-gui").startswith("4.1.")
+
+    def test_remove_state(self):
+        """Test that Taipy removes states through the Gui's `_remove_state`."""
+        assert list(inspect.signature(Gui._remove_state).parameters) == [
+            "self",
+            "client_id",
+        ]
+        # Looked up on the instance when the retention timer starts
+        assert "self._remove_state" in inspect.getsource(Gui)
+
+
+class TestOnSessionEnd:
+    """Test the session end callback."""
+
+    def test_called_when_state_removed(self, session_hooks, gui):
+        """Test that the callback gets the session whose state was removed."""
+        ended = []
+        session_hooks.on_session_end(gui, ended.append)
+        gui._remove_state("client-1")
+        assert ended == ["client-1"]
+        assert session_hooks.count_sessions(gui) == 1
+
+    def test_not_called_for_open_session(self, session_hooks, gui):
+        """Test that a session with another open tab keeps its state."""
+        ended = []
+        session_hooks.on_session_end(gui, ended.append)
+        gui._remove_state("client-2")
+        assert ended == []
+        assert session_hooks.count_sessions(gui) == 2
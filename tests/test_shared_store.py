@@ -0,0 +1,167 @@
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.algorithms.shared_store import (
+    DEAD_WORKER_ERROR,
+    SharedStore,
+    get_shared_store,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A fresh store in a temporary directory."""
+    return SharedStore(tmp_path / "store.sqlite3")
+
+
+def _start_and_finish_job(path):
+    store = SharedStore(path)
+    store.finish_job(store.start_job("gif", "from a worker"))
+    return store.cache_get("qr", "shared")
+
+
+class TestCache:
+    """Test the shared cache."""
+
+    def test_set_and_get(self, store):
+        """Test that cached values are returned until they expire."""
+        store.cache_set("qr", "key", b"png")
+        assert store.cache_get("qr", "key") == b"png"
+        assert store.cache_get("probe", "key") is None
+
+    def test_expired_values(self, store):
+        """Test that expired values are ignored, then purged."""
+        store.cache_set("qr", "key", b"png", ttl=-1)
+        assert store.cache_get("qr", "key") is None
+        assert store.purge_expired() == 1
+
+    def test_get_or_compute(self, store):
+        """Test that values are computed only once."""
+        calls = []
+
+        def compute():
+            calls.append(None)
+            return b"value"
+
+        assert store.get_or_compute("qr", "key", compute) == b"value"
+        assert store.get_or_compute("qr", "key", compute) == b"value"
+        assert len(calls) == 1
+
+    def test_hit_ratios(self, store):
+        """Test that hits and misses are counted by namespace."""
+        store.cache_set("qr", "key", b"png")
+        for key in ("key", "key", "key", "other"):
+            store.cache_get("qr", key)
+        store.cache_get("probe", "key")
+        assert store.cache_hit_ratios() == {
+            "probe": {"hits": 0, "misses": 1, "ratio": 0.0},
+            "qr": {"hits": 3, "misses": 1, "ratio": 0.75},
+        }
+
+
+class TestJobs:
+    """Test the shared job table."""
+
+    def test_job_statuses(self, store):
+        """Test that jobs are counted by status."""
+        store.start_job("gif", "running")
+        store.finish_job(store.start_job("gif", "done"))
+        store.finish_job(store.start_job("trim", "failed"), error="Trim failed.")
+        assert store.count_jobs() == {"running": 1, "done": 1, "failed": 1}
+        assert store.count_running_jobs() == {"gif": 1}
+
+    def test_shared_between_processes(self, store):
+        """Test that other processes see, and add to, the same jobs and cache."""
+        store.cache_set("qr", "shared", b"png")
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(_start_and_finish_job, [store.path] * 4))
+        assert results == [b"png"] * 4
+        assert store.count_jobs() == {"done": 4}
+
+
+def _exited_pid():
+    process = subprocess.Popen([sys.executable, "-c", ""])
+    process.wait()
+    return process.pid
+
+
+def _update_job(store, job_id, **values):
+    with store._connect() as connection:
+        for column, value in values.items():
+            connection.execute(
+                f"UPDATE jobs SET {column} = ? WHERE id = ?", (value, job_id)
+            )
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+class TestDeadJobs:
+    """Test that jobs left running by an exited worker are failed."""
+
+    def test_exited_worker(self, store):
+        """Test that the jobs of a process that exited are failed."""
+        job_id = store.start_job("gif", "orphan")
+        _update_job(store, job_id, pid=_exited_pid())
+        store.start_job("gif", "running here")
+        assert store.fail_dead_jobs() == 1
+        assert store.count_jobs() == {"failed": 1, "running": 1}
+        row = store._connect().execute("SELECT error FROM jobs WHERE id = ?", (job_id,))
+        assert row.fetchone()[0] == DEAD_WORKER_ERROR
+
+    def test_reused_pid(self, store):
+        """Test that a job older than the process with its PID is failed."""
+        job_id = store.start_job("trim", "before this process started")
+        _update_job(store, job_id, started_at=0)
+        assert store.fail_dead_jobs() == 1
+
+    def test_other_host(self, store):
+        """Test that the jobs of other hosts are left to them."""
+        job_id = store.start_job("gif", "another container")
+        _update_job(store, job_id, pid=_exited_pid(), host="elsewhere")
+        assert store.fail_dead_jobs() == 0
+        assert store.count_running_jobs() == {"gif": 1}
+
+    def test_store_without_host(self, tmp_path):
+        """Test that stores created before jobs had a host get the column."""
+        path = tmp_path / "old.sqlite3"
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+                "description TEXT NOT NULL, status TEXT NOT NULL, error TEXT, "
+                "pid INTEGER NOT NULL, started_at REAL NOT NULL, finished_at REAL)"
+            )
+        store = SharedStore(path)
+        _update_job(store, store.start_job("gif"), pid=_exited_pid())
+        assert SharedStore(path).fail_dead_jobs() == 1
+
+
+class TestPing:
+    """Test the health check of the store."""
+
+    def test_ping(self, store):
+        """Test that a working store answers."""
+        assert store.ping()
+
+    def test_ping_read_only(self, store):
+        """Test that a store that can't be written fails the check."""
+        store._connect().execute("PRAGMA query_only = ON")
+        assert not store.ping()
+
+
+class TestGetSharedStore:
+    """Test the process-wide store."""
+
+    def test_uses_environment_path(self, tmp_path, monkeypatch):
+        """Test that TAIPY_TOOLS_STORE sets the database file."""
+        monkeypatch.setenv("TAIPY_TOOLS_STORE", str(tmp_path / "env.sqlite3"))
+        assert get_shared_store().path == tmp_path / "env.sqlite3"
+        assert get_shared_store() is get_shared_store()
+
+    def test_default_is_test_store(self, shared_store_path):
+        """Test that the test run doesn't write to deposit_files."""
+        with patch.dict("os.environ"):
+            assert get_shared_store().path == shared_store_path
@@ -0,0 +1,106 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.pages import tool_registry
+from src.pages.tool_registry import (
+    TOOLS,
+    format_load_report,
+    get_enabled_tools,
+    load_tool_pages,
+)
+
+SRC_DIR = Path(__file__).parents[1] / "src"
+
+# Stand-in tools that import standard library modules instead of pages
+FAKE_TOOLS = {"json_tool": ("json", "dumps"), "csv_tool": ("csv", "writer")}
+
+
+@pytest.fixture
+def fake_tools():
+    """Replace the registry with stand-in tools and an empty load report."""
+    with (
+        patch.dict(tool_registry.TOOLS, FAKE_TOOLS, clear=True),
+        patch.dict(tool_registry._load_report, clear=True),
+    ):
+        yield
+
+
+class TestGetEnabledTools:
+    """Test tool selection with TAIPY_TOOLS."""
+
+    def test_all_tools_by_default(self, monkeypatch):
+        """Test that every tool is enabled without configuration."""
+        monkeypatch.delenv("TAIPY_TOOLS", raising=False)
+        assert get_enabled_tools() == list(TOOLS)
+
+    def test_selected_tools(self, monkeypatch):
+        """Test that only the listed tools are enabled, in order."""
+        monkeypatch.setenv("TAIPY_TOOLS", " QR_code_generator, uuid_generator ")
+        assert get_enabled_tools() == ["QR_code_generator", "uuid_generator"]
+
+    def test_unknown_tool(self, monkeypatch):
+        """Test that unknown tools are rejected."""
+        monkeypatch.setenv("TAIPY_TOOLS", "uuid_generator,pdf_merger")
+        with pytest.raises(ValueError, match="pdf_merger"):
+            get_enabled_tools()
+
+
+class TestLoadToolPages:
+    """Test lazy loading of the tool pages."""
+
+    def test_loads_only_enabled_tools(self, fake_tools, monkeypatch):
+        """Test that disabled tools are not loaded."""
+        monkeypatch.setenv("TAIPY_TOOLS", "json_tool")
+        pages = load_tool_pages()
+        assert list(pages) == ["json_tool"]
+        assert list(tool_registry._load_report) == ["json_tool"]
+
+    def test_returns_page_objects(self, fake_tools):
+        """Test that each URL maps to the module's page variable."""
+        import csv
+        import json
+
+        pages = load_tool_pages(["json_tool", "csv_tool"])
+        assert pages == {"json_tool": json.dumps, "csv_tool": csv.writer}
+
+    def test_empty_list_loads_nothing(self, fake_tools):
+        """Test that an explicit empty list doesn't fall back to all tools."""
+        assert load_tool_pages([]) == {}
+
+    def test_load_report(self, fake_tools):
+        """Test that the report has one line per loaded tool."""
+        load_tool_pages(["json_tool"])
+        report = format_load_report()
+        assert report.startswith("json_tool: ")
+        assert " s" in report
+
+
+@pytest.mark.parametrize(
+    ("tool", "unused_modules"),
+    [
+        ("QR_code_generator", ["uuid_utils", "ffmpeg", "algorithms.uuid_names"]),
+        ("uuid_generator", ["segno", "ffmpeg", "algorithms.video_ingest"]),
+    ],
+)
+def test_app_loads_only_enabled_tools(tool, unused_modules, tmp_path):
+    """Test that the app, not only its pages, skips the disabled tools' modules."""
+    code = (
+        "import sys, main; "
+        f"loaded = [m for m in {unused_modules!r} if m in sys.modules]; "
+        "assert not loaded, loaded"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        check=False,
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        env=os.environ
+        | {"TAIPY_TOOLS": tool, "TAIPY_TOOLS_STORE": str(tmp_path / "store.sqlite3")},
+    )
+    assert result.returncode == 0, result.stderr[-500:]
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from src.algorithms import tracing
+from src.algorithms.tracing import JsonLinesSink, RingBufferSink, set_sink, span
+from src.algorithms.video_to_gif_functions import video_to_gif
+from tests.conftest import requires_ffmpeg
+
+
+@pytest.fixture
+def sink():
+    """Collect the spans of the test in a fresh ring buffer."""
+    sink = RingBufferSink()
+    set_sink(sink)
+    yield sink
+    set_sink(None)
+
+
+class TestSpan:
+    """Test span nesting, attributes and errors."""
+
+    def test_nested_spans(self, sink):
+        """Test that child spans share the trace and point to their parent."""
+        with span("job", session="abc") as parent, span("step") as child:
+            child.set(frames=10)
+        step, job = sink.spans
+        assert step["trace_id"] == job["trace_id"]
+        assert step["parent_id"] == job["span_id"]
+        assert job["parent_id"] is None
+        assert step["attributes"] == {"frames": 10}
+        assert job["attributes"] == {"session": "abc"}
+        assert job["duration_ms"] >= step["duration_ms"] >= 0
+        assert job["trace_id"] == parent.trace_id
+
+    def test_exceptions_fail_the_span(self, sink):
+        """Test that a raised exception is recorded, then propagated."""
+        with pytest.raises(OSError), span("probe"):
+            raise OSError("disk full")
+        assert sink.spans[0]["status"] == "error"
+        assert sink.spans[0]["error"] == "OSError: disk full"
+
+    def test_handled_errors(self, sink):
+        """Test that a span can be failed without raising."""
+        with span("encode") as encode_span:
+            encode_span.fail("ffmpeg error")
+        assert sink.spans[0]["status"] == "error"
+
+
+class TestSinks:
+    """Test where the spans go."""
+
+    def test_ring_buffer_is_bounded(self, sink):
+        """Test that the ring buffer keeps only the last spans."""
+        set_sink(RingBufferSink(size=2))
+        for index in range(3):
+            with span(f"step{index}"):
+                pass
+        names = [finished["name"] for finished in tracing.get_sink().spans]
+        assert names == ["step1", "step2"]
+
+    def test_get_trace(self, sink):
+        """Test that a trace's spans can be found after the fact."""
+        with span("job") as job, span("step"):
+            pass
+        with span("other"):
+            pass
+        assert [s["name"] for s in sink.get_trace(job.trace_id)] == ["step", "job"]
+
+    def test_json_lines_file(self, tmp_path):
+        """Test that each span is written as one JSON line."""
+        trace_path = tmp_path / "traces" / "spans.jsonl"
+        set_sink(JsonLinesSink(trace_path))
+        try:
+            with span("job", size=(640, 360)), span("step"):
+                pass
+        finally:
+            set_sink(None)
+        lines = trace_path.read_text().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["step", "job"]
+        assert json.loads(lines[1])["attributes"] == {"size": [640, 360]}
+
+    def test_sink_from_environment(self, tmp_path, monkeypatch):
+        """Test that TAIPY_TOOLS_TRACE_FILE selects the JSON lines sink."""
+        monkeypatch.setenv("TAIPY_TOOLS_TRACE_FILE", str(tmp_path / "spans.jsonl"))
+        set_sink(None)
+        try:
+            assert isinstance(tracing.get_sink(), JsonLinesSink)
+        finally:
+            set_sink(None)
+
+
+@requires_ffmpeg
+def test_conversion_is_traced(sink, synthetic_video, tmp_path):
+    """Test that each step of an ffmpeg conversion gets its span."""
+    output_path = tmp_path / "out.gif"
+    assert video_to_gif(str(synthetic_video), str(output_path), duration=1, fps=5)
+    spans = {finished["name"]: finished for finished in sink.spans}
+    assert list(spans) == ["probe", "palette", "encode", "cleanup", "video_to_gif"]
+    assert spans["encode"]["attributes"]["ffmpeg_exit_status"] == 0
+    assert spans["encode"]["attributes"]["frames"] == 5
+    assert spans["video_to_gif"]["attributes"]["output_bytes"] == (
+        output_path.stat().st_size
+    )
+    assert spans["probe"]["parent_id"] == spans["video_to_gif"]["span_id"]
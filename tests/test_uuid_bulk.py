@@ -0,0 +1,81 @@
+import pytest
+
+from src.algorithms.uuid_bulk import (
+    MAX_BULK_COUNT,
+    iter_uuid_batches,
+    measure_throughput,
+    write_uuid_file,
+)
+
+
+class TestIterUUIDBatches:
+    """Test batched UUID generation."""
+
+    def test_generates_requested_count(self):
+        """Test that all batches add up to the requested count."""
+        text = "".join(iter_uuid_batches("4", 25, batch_size=10))
+        assert len(text.splitlines()) == 25
+
+    def test_batch_sizes(self):
+        """Test that batches hold at most batch_size UUIDs."""
+        batches = list(iter_uuid_batches("4", 25, batch_size=10))
+        assert [len(batch.splitlines()) for batch in batches] == [10, 10, 5]
+
+    @pytest.mark.parametrize("uuid_type", ["1", "4", "6", "7"])
+    def test_uuid_format(self, uuid_type):
+        """Test that every line is a 36 character UUID."""
+        lines = "".join(iter_uuid_batches(uuid_type, 5)).splitlines()
+        assert all(len(line) == 36 and line.count("-") == 4 for line in lines)
+
+    def test_uuids_are_unique(self):
+        """Test that generated UUIDs are unique."""
+        lines = "".join(iter_uuid_batches("4", 1000)).splitlines()
+        assert len(set(lines)) == 1000
+
+    @pytest.mark.parametrize("uuid_type", ["3", "5"])
+    def test_rejects_name_based_types(self, uuid_type):
+        """Test that name-based versions are rejected."""
+        with pytest.raises(ValueError, match="name-based"):
+            iter_uuid_batches(uuid_type, 10)
+
+    def test_rejects_unsupported_type(self):
+        """Test that unknown versions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported UUID type"):
+            iter_uuid_batches("99", 10)
+
+    @pytest.mark.parametrize("count", [0, MAX_BULK_COUNT + 1])
+    def test_rejects_count_out_of_range(self, count):
+        """Test that the number of UUIDs is bounded."""
+        with pytest.raises(ValueError, match="Number of UUIDs"):
+            iter_uuid_batches("4", count)
+
+
+class TestWriteUUIDFile:
+    """Test streaming UUIDs to a file."""
+
+    def test_writes_txt(self, tmp_path):
+        """Test that a TXT file has one UUID per line."""
+        output_path = tmp_path / "uuids.txt"
+        write_uuid_file(str(output_path), "7", 100)
+        assert len(output_path.read_text().splitlines()) == 100
+
+    def test_writes_csv_header(self, tmp_path):
+        """Test that a CSV file starts with a header."""
+        output_path = tmp_path / "uuids.csv"
+        write_uuid_file(str(output_path), "7", 100, file_format="csv")
+        lines = output_path.read_text().splitlines()
+        assert lines[0] == "uuid"
+        assert len(lines) == 101
+
+    def test_rejects_unsupported_format(self, tmp_path):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            write_uuid_file(str(tmp_path / "uuids.json"), "4", 10, "json")
+
+
+class TestMeasureThroughput:
+    """Test throughput measurement."""
+
+    def test_returns_positive_rate(self):
+        """Test that throughput is a positive number of UUIDs/second."""
+        assert measure_throughput("4", count=1000) > 0
@@ -0,0 +1,211 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import pairwise
+from unittest.mock import patch
+
+import pytest
+
+from src.algorithms.uuid_monotonic import (
+    MAX_WORKER_ID,
+    MonotonicUUIDGenerator,
+    _forget_parent_state,
+    default_worker_id,
+    uuid7,
+    uuid7_batch,
+)
+
+FROZEN_NS = 1_700_000_000_000_000_000
+
+
+def _generate_worker_uuids(version, worker_id, count):
+    generator = MonotonicUUIDGenerator(version, worker_id=worker_id)
+    uuids = [generator() for _ in range(count // 2)]
+    uuids += generator.generate_batch(count - count // 2)
+    return [uuid.int for uuid in uuids]
+
+
+def _default_generator_uuids(count):
+    return [uuid.int for uuid in uuid7_batch(count)]
+
+
+def _process_worker_id(_):
+    time.sleep(0.01)  # Long enough for every process of the pool to take tasks
+    return os.getpid(), default_worker_id()
+
+
+@pytest.fixture
+def worker_id_dir(tmp_path, monkeypatch):
+    """A fresh lock directory, with no worker ID held by this process."""
+    monkeypatch.setenv("TAIPY_TOOLS_WORKER_ID_DIR", str(tmp_path))
+    monkeypatch.delenv("TAIPY_TOOLS_WORKER_ID", raising=False)
+    _forget_parent_state()
+    yield tmp_path
+    _forget_parent_state()
+
+
+def _is_strictly_increasing(values):
+    return all(a < b for a, b in pairwise(values))
+
+
+class TestMonotonicUUIDGenerator:
+    """Test the monotonic UUIDv6/v7 generator."""
+
+    @pytest.mark.parametrize("version", [6, 7])
+    def test_version_and_variant(self, version):
+        """Test that UUIDs have the right version and RFC 9562 variant bits."""
+        uuid = MonotonicUUIDGenerator(version, worker_id=1)()
+        assert uuid.version == version
+        assert uuid.int >> 62 & 0b11 == 0b10
+
+    @pytest.mark.parametrize("version", [6, 7])
+    def test_single_uuids_strictly_increase(self, version):
+        """Test that consecutive single UUIDs strictly increase."""
+        generator = MonotonicUUIDGenerator(version, worker_id=1)
+        values = [generator().int for _ in range(5000)]
+        assert _is_strictly_increasing(values)
+
+    @pytest.mark.parametrize("version", [6, 7])
+    def test_batches_strictly_increase(self, version):
+        """Test that UUIDs strictly increase within and across batches."""
+        generator = MonotonicUUIDGenerator(version, worker_id=1)
+        values = [uuid.int for uuid in generator.generate_batch(5000)]
+        values += [uuid.int for uuid in generator.generate_batch(5000)]
+        assert _is_strictly_increasing(values)
+
+    @pytest.mark.parametrize("version", [6, 7])
+    @patch("src.algorithms.uuid_monotonic.time.time_ns")
+    def test_frozen_clock(self, mock_time_ns, version):
+        """Test that UUIDs still increase when the clock doesn't move."""
+        mock_time_ns.return_value = FROZEN_NS
+        generator = MonotonicUUIDGenerator(version, worker_id=1)
+        values = [generator().int for _ in range(100)]
+        assert _is_strictly_increasing(values)
+
+    @pytest.mark.parametrize("version", [6, 7])
+    @patch("src.algorithms.uuid_monotonic.time.time_ns")
+    def test_clock_going_backwards(self, mock_time_ns, version):
+        """Test that UUIDs still increase when the clock goes backwards."""
+        generator = MonotonicUUIDGenerator(version, worker_id=1)
+        mock_time_ns.return_value = FROZEN_NS
+        first = generator()
+        mock_time_ns.return_value = FROZEN_NS - 10_000_000_000
+        assert generator().int > first.int
+
+    @patch("src.algorithms.uuid_monotonic._V7_MAX_COUNTER", 3)
+    @patch("src.algorithms.uuid_monotonic.time.time_ns")
+    def test_v7_counter_overflow(self, mock_time_ns):
+        """Test that an exhausted counter moves on to the next millisecond."""
+        mock_time_ns.return_value = FROZEN_NS
+        generator = MonotonicUUIDGenerator(7, worker_id=1)
+        uuids = generator.generate_batch(10)
+        timestamps = [uuid.int >> 80 for uuid in uuids]
+        assert timestamps == [FROZEN_NS // 1_000_000 + i // 4 for i in range(10)]
+        assert _is_strictly_increasing([uuid.int for uuid in uuids])
+
+    def test_v7_timestamp(self):
+        """Test that UUIDv7 starts with the current Unix time in milliseconds."""
+        with patch("src.algorithms.uuid_monotonic.time.time_ns") as mock_time_ns:
+            mock_time_ns.return_value = FROZEN_NS
+            uuid = MonotonicUUIDGenerator(7, worker_id=1)()
+        assert uuid.int >> 80 == FROZEN_NS // 1_000_000
+
+    @pytest.mark.parametrize("version", [6, 7])
+    def test_worker_id_is_encoded(self, version):
+        """Test that the worker ID is stored in every UUID."""
+        uuid = MonotonicUUIDGenerator(version, worker_id=0xABC)()
+        shift = 32 if version == 7 else 28
+        assert uuid.int >> shift & MAX_WORKER_ID == 0xABC
+
+    @pytest.mark.parametrize("worker_id", [-1, MAX_WORKER_ID + 1])
+    def test_invalid_worker_id(self, worker_id):
+        """Test that out of range worker IDs are rejected."""
+        with pytest.raises(ValueError, match="Worker ID must be between"):
+            MonotonicUUIDGenerator(7, worker_id=worker_id)
+
+    def test_invalid_version(self):
+        """Test that versions other than 6 and 7 are rejected."""
+        with pytest.raises(ValueError, match="Unsupported UUID version"):
+            MonotonicUUIDGenerator(4)
+
+
+class TestDefaultWorkerID:
+    """Test the default worker ID."""
+
+    def test_first_free_id(self, worker_id_dir):
+        """Test that the first process gets worker ID 0, and keeps it."""
+        assert default_worker_id() == 0
+        assert default_worker_id() == 0
+        assert (worker_id_dir / "0.lock").exists()
+
+    def test_from_environment(self, worker_id_dir, monkeypatch):
+        """Test that TAIPY_TOOLS_WORKER_ID sets the first worker ID tried."""
+        monkeypatch.setenv("TAIPY_TOOLS_WORKER_ID", "42")
+        assert default_worker_id() == 42
+
+    def test_invalid_environment(self, worker_id_dir, monkeypatch):
+        """Test that an out of range TAIPY_TOOLS_WORKER_ID is rejected."""
+        monkeypatch.setenv("TAIPY_TOOLS_WORKER_ID", str(MAX_WORKER_ID + 1))
+        with pytest.raises(ValueError, match="Worker ID must be between"):
+            default_worker_id()
+
+    def test_released_id_is_reused(self, worker_id_dir):
+        """Test that a worker ID is free again once its process is gone."""
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            _, worker_id = executor.submit(_process_worker_id, None).result()
+        assert worker_id == 0
+        assert default_worker_id() == 0
+
+    @patch("src.algorithms.uuid_monotonic.fcntl", None)
+    def test_without_file_locks(self, worker_id_dir):
+        """Test that the worker ID falls back to the process ID."""
+        with patch("src.algorithms.uuid_monotonic.os.getpid", return_value=0x1234):
+            assert default_worker_id() == 0x234
+
+    @pytest.mark.parametrize("first_id", [None, "7", str(MAX_WORKER_ID)])
+    def test_live_processes_never_share_an_id(
+        self, worker_id_dir, monkeypatch, first_id
+    ):
+        """Test that concurrent processes, forked or spawned, get distinct IDs."""
+        if first_id is not None:
+            # Inherited by every child, like a container's environment
+            monkeypatch.setenv("TAIPY_TOOLS_WORKER_ID", first_id)
+        parent_id = default_worker_id()
+        for method in ("fork", "spawn"):
+            context = multiprocessing.get_context(method)
+            worker_ids = {}
+            with ProcessPoolExecutor(max_workers=16, mp_context=context) as executor:
+                for pid, worker_id in executor.map(_process_worker_id, range(200)):
+                    assert worker_ids.setdefault(pid, worker_id) == worker_id
+            assert len(worker_ids) > 1
+            assert len(set(worker_ids.values())) == len(worker_ids)
+            assert parent_id not in worker_ids.values()
+
+
+class TestMultiProcess:
+    """Test that processes generate ordered, collision-free UUIDs."""
+
+    @pytest.mark.parametrize("version", [6, 7])
+    def test_workers_do_not_collide(self, version):
+        """Test that concurrent workers never produce the same UUID."""
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    _generate_worker_uuids, [version] * 8, range(8), [20_000] * 8
+                )
+            )
+        for values in results:
+            assert _is_strictly_increasing(values)
+        assert len(set().union(*results)) == 8 * 20_000
+
+    def test_forked_workers_get_own_generator(self, worker_id_dir):
+        """Test that forked workers don't reuse the parent's generator state."""
+        uuid7()  # Creates the parent's generator before forking
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=4, mp_context=context) as executor:
+            results = list(executor.map(_default_generator_uuids, [10_000] * 4))
+        for values in results:
+            assert _is_strictly_increasing(values)
+        assert len(set().union(*results)) == 4 * 10_000
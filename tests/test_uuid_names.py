@@ -0,0 +1,120 @@
+import uuid as std_uuid
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.algorithms import uuid_names
+from src.algorithms.uuid_names import (
+    NAMESPACES,
+    _name_uuid,
+    get_namespace,
+    hash_names,
+    write_name_uuid_file,
+)
+
+
+@pytest.fixture
+def names_file(tmp_path):
+    """A names file with blank lines, a repeated name and a comma."""
+    path = tmp_path / "names.txt"
+    path.write_text("example.com\n\nexample.org\nexample.com\n  a,b  \n")
+    return path
+
+
+class TestGetNamespace:
+    """Test namespace selection."""
+
+    @pytest.mark.parametrize("name", ["DNS", "URL", "OID", "X500"])
+    def test_predefined_namespaces(self, name):
+        """Test that predefined namespaces match the standard library."""
+        expected = getattr(std_uuid, f"NAMESPACE_{name}")
+        assert str(get_namespace(name)) == str(expected)
+
+    def test_custom_namespace(self):
+        """Test that any UUID string can be a namespace."""
+        namespace = "12345678-1234-5678-1234-567812345678"
+        assert str(get_namespace(namespace)) == namespace
+
+    def test_invalid_namespace(self):
+        """Test that other strings are rejected."""
+        with pytest.raises(ValueError, match="Unsupported namespace"):
+            get_namespace("not-a-uuid")
+
+
+class TestHashNames:
+    """Test name-based UUID hashing."""
+
+    @pytest.mark.parametrize(
+        ("uuid_type", "std_hasher"), [("3", std_uuid.uuid3), ("5", std_uuid.uuid5)]
+    )
+    @pytest.mark.parametrize("namespace", list(NAMESPACES))
+    def test_matches_standard_library(self, uuid_type, std_hasher, namespace):
+        """Test that UUIDs match the standard library's v3/v5."""
+        std_namespace = getattr(std_uuid, f"NAMESPACE_{namespace}")
+        names = ["example.com", "naïve", ""]
+        expected = [str(std_hasher(std_namespace, name)) for name in names]
+        assert hash_names(uuid_type, namespace, names) == expected
+
+    def test_repeated_names_use_cache(self):
+        """Test that repeated names are hashed only once."""
+        _name_uuid.cache_clear()
+        hash_names("5", "DNS", ["a", "b", "a", "a"])
+        assert _name_uuid.cache_info().hits == 2
+        assert _name_uuid.cache_info().misses == 2
+
+    @pytest.mark.parametrize("uuid_type", ["1", "4", "7"])
+    def test_rejects_other_types(self, uuid_type):
+        """Test that non name-based versions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported UUID type"):
+            hash_names(uuid_type, "DNS", ["a"])
+
+
+class TestWriteNameUUIDFile:
+    """Test the name,uuid CSV output."""
+
+    def test_writes_csv(self, names_file, tmp_path):
+        """Test the header, the skipped blank lines and CSV quoting."""
+        output_path = tmp_path / "out.csv"
+        count = write_name_uuid_file(str(names_file), str(output_path), "5")
+        lines = output_path.read_text().splitlines()
+        assert count == 4
+        assert lines[0] == "name,uuid"
+        assert (
+            lines[1]
+            == f"example.com,{std_uuid.uuid5(std_uuid.NAMESPACE_DNS, 'example.com')}"
+        )
+        assert lines[1].split(",")[1] == lines[3].split(",")[1]
+        assert lines[4].startswith('"a,b",')
+
+    def test_parallel_chunks_keep_order(self, tmp_path):
+        """Test that chunks hashed on the process pool are written in order."""
+        names = [f"name-{index}" for index in range(1000)]
+        names_path = tmp_path / "names.txt"
+        names_path.write_text("\n".join(names))
+        output_path = tmp_path / "out.csv"
+        with patch.object(
+            uuid_names, "ProcessPoolExecutor", wraps=ProcessPoolExecutor
+        ) as mock_pool:
+            count = write_name_uuid_file(
+                str(names_path),
+                str(output_path),
+                "3",
+                "URL",
+                chunk_size=64,
+                max_workers=2,
+            )
+        # Spawned, never forked from the threaded server
+        context = mock_pool.call_args.kwargs["mp_context"]
+        assert context.get_start_method() == "spawn"
+        rows = [line.split(",") for line in output_path.read_text().splitlines()[1:]]
+        assert count == 1000
+        assert [name for name, _ in rows] == names
+        assert [uuid for _, uuid in rows] == hash_names("3", "URL", names)
+
+    def test_empty_file(self, tmp_path):
+        """Test that a file without names is rejected."""
+        names_path = tmp_path / "names.txt"
+        names_path.write_text("\n  \n")
+        with pytest.raises(ValueError, match="No names found"):
+            write_name_uuid_file(str(names_path), str(tmp_path / "out.csv"), "5")
@@ -0,0 +1,225 @@
+import pytest
+from PIL import Image, ImageChops, ImageSequence, ImageStat
+
+from src.algorithms.video_to_gif_functions import video_to_gif
+from src.algorithms.video_to_gif_pyav import get_clip_info
+from tests.conftest import (
+    SYNTHETIC_VIDEO_SECONDS,
+    SYNTHETIC_VIDEO_SIZE,
+    requires_ffmpeg,
+)
+
+pytest.importorskip("av")
+
+
+@pytest.fixture(scope="module")
+def gif_pair(synthetic_video, tmp_path_factory):
+    """Convert the same clip with both backends and return their frames."""
+    output_dir = tmp_path_factory.mktemp("gifs")
+    outputs = {}
+    for backend in ("ffmpeg", "pyav"):
+        outputs[backend] = output_dir / f"{backend}.gif"
+        video_to_gif(
+            str(synthetic_video),
+            str(outputs[backend]),
+            start_time=0.5,
+            duration=1,
+            fps=10,
+            resize_factor=0.5,
+            backend=backend,
+        )
+    return _gif_frames(outputs["ffmpeg"]), _gif_frames(outputs["pyav"])
+
+
+def _gif_frames(gif_path):
+    with Image.open(gif_path) as gif:
+        return [frame.convert("RGB") for frame in ImageSequence.Iterator(gif)]
+
+
+def _mean_difference(image1, image2):
+    return sum(ImageStat.Stat(ImageChops.difference(image1, image2)).mean) / 3
+
+
+class TestPyAVBackend:
+    """Test the in-process PyAV backend."""
+
+    def test_clip_info_duration(self, synthetic_video):
+        """Test that duration is read without ffprobe."""
+        result = get_clip_info(str(synthetic_video))
+        assert result["duration"] == pytest.approx(SYNTHETIC_VIDEO_SECONDS, abs=0.1)
+
+    def test_clip_info_size(self, synthetic_video):
+        """Test that frame size is read without ffprobe."""
+        result = get_clip_info(str(synthetic_video))
+        assert result["size"] == SYNTHETIC_VIDEO_SIZE
+
+    def test_clip_info_displayed_size(self, rotated_video):
+        """Test that the size is the one of the frame turned for display."""
+        result = get_clip_info(str(rotated_video))
+        assert result["size"] == SYNTHETIC_VIDEO_SIZE[::-1]
+
+    def test_clip_info_invalid_file(self, tmp_path):
+        """Test that an invalid file raises ValueError."""
+        invalid_file = tmp_path / "invalid.mp4"
+        invalid_file.write_bytes(b"not a video")
+        with pytest.raises(ValueError, match="Could not get video info"):
+            get_clip_info(str(invalid_file))
+
+    def test_creates_gif(self, synthetic_video, tmp_path):
+        """Test that the pyav backend creates a GIF."""
+        output_path = tmp_path / "output.gif"
+        assert video_to_gif(str(synthetic_video), str(output_path), backend="pyav")
+        assert output_path.exists()
+
+    def test_frame_count_matches_fps(self, synthetic_video, tmp_path):
+        """Test that frames are resampled to the requested fps."""
+        output_path = tmp_path / "output.gif"
+        video_to_gif(
+            str(synthetic_video), str(output_path), duration=1, fps=10, backend="pyav"
+        )
+        assert len(_gif_frames(output_path)) == 10
+
+    def test_applies_resize_factor(self, synthetic_video, tmp_path):
+        """Test that frames are scaled by the resize factor."""
+        output_path = tmp_path / "output.gif"
+        video_to_gif(
+            str(synthetic_video), str(output_path), resize_factor=0.5, backend="pyav"
+        )
+        assert _gif_frames(output_path)[0].size == (80, 60)
+
+    def test_unsupported_backend(self, synthetic_video, tmp_path):
+        """Test that an unknown backend makes the conversion fail."""
+        output_path = tmp_path / "output.gif"
+        assert not video_to_gif(str(synthetic_video), str(output_path), backend="gpu")
+
+
+@requires_ffmpeg
+class TestBackendConformance:
+    """Test that both backends produce equivalent GIFs."""
+
+    def test_same_size(self, gif_pair):
+        """Test that both GIFs have the same dimensions."""
+        ffmpeg_frames, pyav_frames = gif_pair
+        assert ffmpeg_frames[0].size == pyav_frames[0].size
+
+    def test_same_frame_count(self, gif_pair):
+        """Test that both GIFs have the same number of frames (+/- 1)."""
+        ffmpeg_frames, pyav_frames = gif_pair
+        assert abs(len(ffmpeg_frames) - len(pyav_frames)) <= 1
+
+    def test_frames_look_alike(self, gif_pair):
+        """Test that matching frames differ only by quantization noise."""
+        ffmpeg_frames, pyav_frames = gif_pair
+        for ffmpeg_frame, pyav_frame in zip(ffmpeg_frames, pyav_frames):
+            assert _mean_difference(ffmpeg_frame, pyav_frame) < 12
+
+
+@pytest.mark.parametrize(
+    "backend", [pytest.param("ffmpeg", marks=requires_ffmpeg), "pyav"]
+)
+class TestPreview:
+    """Test the preview rendition written with the GIF."""
+
+    def test_scaled_to_preview_height(self, backend, synthetic_video, tmp_path):
+        """Test that the preview has the GIF's frames, at the preview height."""
+        output_path = tmp_path / "output.gif"
+        preview_path = tmp_path / "preview.gif"
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(
+                "src.algorithms.video_to_gif_functions.PREVIEW_HEIGHT", 60
+            )
+            assert video_to_gif(
+                str(synthetic_video),
+                str(output_path),
+                duration=1,
+                fps=10,
+                backend=backend,
+                preview_path=str(preview_path),
+            )
+        gif_frames = _gif_frames(output_path)
+        preview_frames = _gif_frames(preview_path)
+        assert gif_frames[0].size == SYNTHETIC_VIDEO_SIZE
+        assert preview_frames[0].size == (80, 60)
+        assert len(preview_frames) == len(gif_frames)
+
+    def test_never_upscaled(self, backend, synthetic_video, tmp_path):
+        """Test that a GIF smaller than the preview height is previewed as is."""
+        preview_path = tmp_path / "preview.gif"
+        video_to_gif(
+            str(synthetic_video),
+            str(tmp_path / "output.gif"),
+            resize_factor=0.5,
+            backend=backend,
+            preview_path=str(preview_path),
+        )
+        assert _gif_frames(preview_path)[0].size == (80, 60)
+
+
+@pytest.mark.parametrize(
+    "backend", [pytest.param("ffmpeg", marks=requires_ffmpeg), "pyav"]
+)
+class TestRegion:
+    """Test the crop and rotation applied before scaling."""
+
+    def test_crop_then_scale(self, backend, synthetic_video, tmp_path):
+        """Test that the GIF is the scaled crop region."""
+        output_path = tmp_path / "output.gif"
+        assert video_to_gif(
+            str(synthetic_video),
+            str(output_path),
+            duration=1,
+            resize_factor=0.5,
+            backend=backend,
+            crop=(40, 20, 80, 60),
+        )
+        assert _gif_frames(output_path)[0].size == (40, 30)
+
+    def test_rotation(self, backend, synthetic_video, tmp_path):
+        """Test that a quarter turn swaps the GIF's width and height."""
+        output_path = tmp_path / "output.gif"
+        video_to_gif(
+            str(synthetic_video),
+            str(output_path),
+            duration=1,
+            backend=backend,
+            rotation=90,
+        )
+        # The gradient goes from black, at the top, to white: right once turned
+        frame = _gif_frames(output_path)[0]
+        assert frame.size == SYNTHETIC_VIDEO_SIZE[::-1]
+        assert sum(frame.getpixel((5, 150))) > sum(frame.getpixel((115, 150)))
+
+    def test_region_outside_frame(self, backend, synthetic_video, tmp_path):
+        """Test that a crop region outside the frame makes the conversion fail."""
+        output_path = tmp_path / "output.gif"
+        assert not video_to_gif(
+            str(synthetic_video),
+            str(output_path),
+            backend=backend,
+            crop=(100, 0, 100, 60),
+        )
+
+    def test_displayed_frame(self, backend, rotated_video, tmp_path):
+        """Test that the region is picked on the frame turned for display."""
+        output_path = tmp_path / "output.gif"
+        assert video_to_gif(
+            str(rotated_video),
+            str(output_path),
+            duration=1,
+            backend=backend,
+            crop=(0, 40, 120, 120),
+        )
+        # The gradient, black at the top of the stored frame, is on the right
+        frame = _gif_frames(output_path)[0]
+        assert frame.size == (120, 120)
+        assert sum(frame.getpixel((5, 60))) > sum(frame.getpixel((115, 60)))
+
+    def test_stored_frame_region_outside(self, backend, rotated_video, tmp_path):
+        """Test that a region of the stored, unturned frame is refused."""
+        assert not video_to_gif(
+            str(rotated_video),
+            str(tmp_path / "output.gif"),
+            duration=1,
+            backend=backend,
+            crop=(0, 0, *SYNTHETIC_VIDEO_SIZE),
+        )
@@ -0,0 +1,161 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.algorithms.video_ingest import (
+    _hash_file,
+    _is_video_container,
+    ingest_video,
+    release_video,
+)
+
+MP4_HEADER = b"\x00\x00\x00\x20ftypisom"
+AVI_HEADER = b"RIFF\x00\x00\x00\x00AVI "
+
+
+@pytest.fixture
+def store_dir(tmp_path):
+    """Provide a temporary upload store."""
+    return tmp_path / "store"
+
+
+def _upload(tmp_path, name, content):
+    upload_path = tmp_path / name
+    upload_path.write_bytes(content)
+    return upload_path
+
+
+class TestHashFile:
+    """Test the one-pass hash, size and header read."""
+
+    def test_hash_matches_sha256(self, tmp_path):
+        """Test that the digest is the file's SHA-256."""
+        content = MP4_HEADER + b"x" * 5000
+        upload_path = _upload(tmp_path, "video.mp4", content)
+        digest, _, _ = _hash_file(upload_path, chunk_size=1024)
+        assert digest == hashlib.sha256(content).hexdigest()
+
+    def test_size_across_chunks(self, tmp_path):
+        """Test that the size adds up all chunks."""
+        upload_path = _upload(tmp_path, "video.mp4", MP4_HEADER + b"x" * 5000)
+        _, size, _ = _hash_file(upload_path, chunk_size=1024)
+        assert size == len(MP4_HEADER) + 5000
+
+    def test_reads_header(self, tmp_path):
+        """Test that the header is taken from the first chunk."""
+        upload_path = _upload(tmp_path, "video.mp4", MP4_HEADER + b"x" * 5000)
+        _, _, header = _hash_file(upload_path, chunk_size=1024)
+        assert header == MP4_HEADER
+
+
+class TestIsVideoContainer:
+    """Test container magic bytes."""
+
+    def test_accepts_mp4(self):
+        """Test that an MP4 header is accepted."""
+        assert _is_video_container(MP4_HEADER)
+
+    def test_accepts_avi(self):
+        """Test that an AVI header is accepted."""
+        assert _is_video_container(AVI_HEADER)
+
+    def test_rejects_other_files(self):
+        """Test that other files are rejected."""
+        assert not _is_video_container(b"\x89PNG\r\n\x1a\n\x00\x00\x00\x0d")
+
+
+class TestIngestVideo:
+    """Test upload ingestion and deduplication."""
+
+    def test_returns_size_and_digest(self, tmp_path, store_dir):
+        """Test that ingestion reports size and digest."""
+        content = MP4_HEADER + b"video"
+        upload_path = _upload(tmp_path, "video.mp4", content)
+        result = ingest_video(str(upload_path), str(store_dir))
+        assert result["size"] == len(content)
+        assert result["sha256"] == hashlib.sha256(content).hexdigest()
+
+    def test_moves_upload_to_store(self, tmp_path, store_dir):
+        """Test that the upload is moved into the store."""
+        upload_path = _upload(tmp_path, "video.mp4", MP4_HEADER + b"video")
+        result = ingest_video(str(upload_path), str(store_dir))
+        assert not upload_path.exists()
+        assert Path(result["path"]).parent == store_dir
+
+    def test_rejects_non_video(self, tmp_path, store_dir):
+        """Test that non-video uploads are rejected and deleted."""
+        upload_path = _upload(tmp_path, "video.mp4", b"not a video at all")
+        with pytest.raises(ValueError, match="not an MP4 or AVI"):
+            ingest_video(str(upload_path), str(store_dir))
+        assert not upload_path.exists()
+
+    def test_deduplicates_identical_uploads(self, tmp_path, store_dir):
+        """Test that identical uploads share one stored copy."""
+        content = MP4_HEADER + b"video"
+        first = ingest_video(str(_upload(tmp_path, "a.mp4", content)), str(store_dir))
+        second = ingest_video(str(_upload(tmp_path, "b.mp4", content)), str(store_dir))
+        assert first["path"] != second["path"]
+        assert Path(first["path"]).samefile(second["path"])
+
+    def test_stored_copy_released_while_linking(self, tmp_path, store_dir):
+        """Test that an upload survives the stored copy being deleted meanwhile."""
+        content = MP4_HEADER + b"video"
+        first = ingest_video(str(_upload(tmp_path, "a.mp4", content)), str(store_dir))
+        link = os.link
+
+        def release_then_link(source, destination):
+            if Path(destination).name.endswith(".link"):
+                release_video(first["path"])
+            link(source, destination)
+
+        with patch("src.algorithms.video_ingest.os.link", release_then_link):
+            second = ingest_video(
+                str(_upload(tmp_path, "b.mp4", content)), str(store_dir)
+            )
+        assert Path(second["path"]).read_bytes() == content
+        assert release_video(second["path"]) == len(content)
+        assert list(store_dir.iterdir()) == []
+
+    def test_concurrent_ingest_and_release(self, tmp_path, store_dir):
+        """Test that sessions storing and releasing one upload never lose it."""
+        content = MP4_HEADER + b"video"
+
+        def session(index):
+            for attempt in range(50):
+                upload = _upload(tmp_path, f"{index}-{attempt}.mp4", content)
+                path = ingest_video(str(upload), str(store_dir))["path"]
+                assert Path(path).read_bytes() == content
+                release_video(path)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(session, range(8)))
+        assert list(store_dir.iterdir()) == []
+
+
+class TestReleaseVideo:
+    """Test releasing stored uploads."""
+
+    def test_keeps_copy_still_in_use(self, tmp_path, store_dir):
+        """Test that a shared upload survives until its last user releases it."""
+        content = MP4_HEADER + b"video"
+        first = ingest_video(str(_upload(tmp_path, "a.mp4", content)), str(store_dir))
+        second = ingest_video(str(_upload(tmp_path, "b.mp4", content)), str(store_dir))
+        release_video(first["path"])
+        assert Path(second["path"]).read_bytes() == content
+
+    def test_deletes_last_copy(self, tmp_path, store_dir):
+        """Test that the store is empty once every user released the upload."""
+        content = MP4_HEADER + b"video"
+        first = ingest_video(str(_upload(tmp_path, "a.mp4", content)), str(store_dir))
+        second = ingest_video(str(_upload(tmp_path, "b.mp4", content)), str(store_dir))
+        assert release_video(first["path"]) == 0
+        assert release_video(second["path"]) == len(content)
+        assert list(store_dir.iterdir()) == []
+
+    def test_handles_missing_file(self, tmp_path):
+        """Test no error when the file doesn't exist."""
+        assert release_video(tmp_path / "missing.mp4") == 0
@@ -0,0 +1,118 @@
+import io
+
+import pytest
+from PIL import Image
+
+from src.algorithms.video_region import (
+    THUMBNAIL_WIDTH,
+    crop_and_rotate,
+    display_rotation,
+    draw_region,
+    extract_keyframe,
+    get_region_error,
+    get_rotation,
+    region_size,
+)
+from tests.conftest import SYNTHETIC_VIDEO_SIZE, requires_ffmpeg
+
+
+def _jpeg(size, color=(200, 200, 200)):
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, format="JPEG")
+    return output.getvalue()
+
+
+class TestRotation:
+    """Test the rotation setting."""
+
+    @pytest.mark.parametrize("rotation", [0, 90, "180", "270"])
+    def test_supported(self, rotation):
+        """Test that rotations are returned as ints."""
+        assert get_rotation(rotation) == int(rotation)
+
+    @pytest.mark.parametrize("rotation", [45, "upside down"])
+    def test_unsupported(self, rotation):
+        """Test that other rotations raise ValueError."""
+        with pytest.raises(ValueError, match="Unsupported rotation"):
+            get_rotation(rotation)
+
+    @pytest.mark.parametrize(
+        ("matrix_rotation", "expected"), [(0, 0), (90, 270), (-90, 90), (180, 180)]
+    )
+    def test_display_rotation(self, matrix_rotation, expected):
+        """Test that counterclockwise display matrices become clockwise turns."""
+        assert display_rotation(matrix_rotation) == expected
+
+
+class TestRegion:
+    """Test the crop region checks and sizes."""
+
+    def test_valid_region(self):
+        """Test that a region inside the frame is valid, as is no crop."""
+        assert get_region_error((10, 20, 100, 50), (1920, 1080)) is None
+        assert get_region_error(None, (1920, 1080)) is None
+
+    def test_empty_region(self):
+        """Test that a region must have a width and height."""
+        assert "positive" in get_region_error((0, 0, 0, 50), (1920, 1080))
+
+    def test_region_outside_frame(self):
+        """Test that a region must fit in the frame."""
+        error = get_region_error((1900, 0, 100, 50), (1920, 1080))
+        assert error == "Crop region must be inside the 1920x1080 frame."
+
+    def test_region_size(self):
+        """Test the frame size once cropped and rotated."""
+        assert region_size((1920, 1080), None, 0) == (1920, 1080)
+        assert region_size((1920, 1080), (0, 0, 800, 600), 0) == (800, 600)
+        assert region_size((1920, 1080), (0, 0, 800, 600), 270) == (600, 800)
+
+    def test_crop_and_rotate(self):
+        """Test that a frame is cropped, then turned clockwise."""
+        image = Image.new("RGB", (100, 50))
+        image.putpixel((10, 20), (255, 0, 0))
+        turned = crop_and_rotate(image, (10, 20, 30, 10), 90)
+        assert turned.size == (10, 30)
+        # The region's top left corner ends at the top right once turned
+        assert turned.getpixel((9, 0)) == (255, 0, 0)
+
+
+class TestRegionPicker:
+    """Test the keyframe thumbnail of the region picker."""
+
+    def test_draw_region(self):
+        """Test that the rest of the frame is dimmed."""
+        thumbnail = _jpeg((480, 270))
+        drawn = Image.open(
+            io.BytesIO(draw_region(thumbnail, (1920, 1080), (0, 0, 960, 540), 0))
+        )
+        assert drawn.size == (480, 270)
+        assert drawn.getpixel((100, 100))[0] > 150
+        assert drawn.getpixel((400, 200))[0] < 100
+
+    def test_draw_rotated(self):
+        """Test that the picker shows the frame turned like the GIF."""
+        drawn = draw_region(_jpeg((480, 270)), (1920, 1080), None, 90)
+        assert Image.open(io.BytesIO(drawn)).size == (270, 480)
+
+    @requires_ffmpeg
+    def test_extract_keyframe(self, synthetic_video):
+        """Test that the thumbnail keeps the frame's aspect ratio."""
+        thumbnail, size = extract_keyframe(str(synthetic_video))
+        assert size == SYNTHETIC_VIDEO_SIZE
+        assert Image.open(io.BytesIO(thumbnail)).size == (THUMBNAIL_WIDTH, 360)
+
+    @requires_ffmpeg
+    def test_extract_keyframe_displayed(self, rotated_video):
+        """Test that the picker shows, and sizes, the frame as it's displayed."""
+        thumbnail, size = extract_keyframe(str(rotated_video))
+        assert size == SYNTHETIC_VIDEO_SIZE[::-1]
+        assert Image.open(io.BytesIO(thumbnail)).size == (THUMBNAIL_WIDTH, 640)
+
+    @requires_ffmpeg
+    def test_extract_keyframe_invalid_file(self, tmp_path):
+        """Test that a file that isn't a video raises ValueError."""
+        invalid_file = tmp_path / "invalid.mp4"
+        invalid_file.write_bytes(b"not a video")
+        with pytest.raises(ValueError, match="Could not read a frame"):
+            extract_keyframe(str(invalid_file))
@@ -0,0 +1,135 @@
+import importlib
+import threading
+from pathlib import Path
+
+import pytest
+from taipy.gui import Gui
+
+from benchmarks.load_test import INITIAL_STATE, FakeState, _wait_long_callback
+
+SRC_DIR = Path(__file__).parents[1] / "src"
+
+
+@pytest.fixture
+def holds():
+    """Messages of the page holds, and None for each resume."""
+    return []
+
+
+@pytest.fixture
+def callbacks(tmp_path, monkeypatch, holds):
+    """
+    The video callbacks, imported from src/ like the app does, with their long
+    callbacks waited for, and page holds recorded
+    """
+    monkeypatch.syspath_prepend(SRC_DIR)
+    monkeypatch.setenv("TAIPY_TOOLS_STORE", str(tmp_path / "store.sqlite3"))
+    decorator_module = importlib.import_module("taipy_utilities.taipy_callback")
+    monkeypatch.setattr(decorator_module, "invoke_long_callback", _wait_long_callback)
+    monkeypatch.setattr(
+        decorator_module, "hold_control", lambda state, message: holds.append(message)
+    )
+    monkeypatch.setattr(
+        decorator_module, "resume_control", lambda state: holds.append(None)
+    )
+    monkeypatch.setattr(
+        importlib.import_module("algorithms.artifact_storage"),
+        "ARTIFACT_DIR",
+        str(tmp_path / "artifacts"),
+    )
+    monkeypatch.setattr(FakeState, "_gui", Gui.__new__(Gui))
+    return importlib.import_module("algorithms.video_to_gif_state_functions")
+
+
+@pytest.fixture
+def state(tmp_path):
+    """A session with a 2 s, 160x120 video selected."""
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"video")
+    variables = {
+        "content": str(video_path),
+        "content_path": video_path,
+        "file_name": "clip.mp4",
+        "video_is_selected": True,
+        "video_duration": 2.0,
+        "video_width": 160,
+        "video_height": 120,
+        "crop_width": 160,
+        "crop_height": 120,
+        "trim_mode": "keyframe",
+    }
+    # A session for each test: the admission controller limits each one's calls
+    return FakeState(tmp_path.name, INITIAL_STATE | variables)
+
+
+def _jobs():
+    store = importlib.import_module("algorithms.shared_store").get_shared_store()
+    return store.count_jobs(), store.count_running_jobs()
+
+
+class TestVideoCallbacks:
+    """Test that the video callbacks run on the thread pool, and always finish."""
+
+    def test_conversion_runs_on_pool(self, callbacks, holds, state, monkeypatch):
+        """Test that the conversion runs off the request thread, page held."""
+        threads = []
+
+        def convert(**kwargs):
+            threads.append(threading.current_thread().name)
+            return False
+
+        monkeypatch.setattr(callbacks, "video_to_gif", convert)
+        callbacks.convert_to_gif(state)
+        assert threads[0].startswith("callback")
+        assert holds == ["Generating GIF", None]
+        assert _jobs() == ({"failed": 1}, {})
+        assert ("e", "GIF conversion failed.") in state.notifications
+        assert not state.video_is_selected
+
+    @pytest.mark.parametrize(
+        ("callback", "converter", "message"),
+        [
+            ("convert_to_gif", "video_to_gif", "Generating GIF"),
+            ("trim_clip", "trim_video", "Trimming Clip"),
+        ],
+    )
+    def test_exception_finishes_job(
+        self, callbacks, holds, state, monkeypatch, callback, converter, message
+    ):
+        """Test that a crash still fails the job and releases the page."""
+
+        def crash(**kwargs):
+            raise RuntimeError("ffmpeg vanished")
+
+        monkeypatch.setattr(callbacks, converter, crash)
+        with pytest.raises(RuntimeError, match="ffmpeg vanished"):
+            getattr(callbacks, callback)(state)
+        assert holds == [message, None]
+        assert _jobs() == ({"failed": 1}, {})
+        assert ("e", "Unexpected error: ffmpeg vanished") in state.notifications
+
+    def test_batch_exception_finishes_job(self, callbacks, holds, state, monkeypatch):
+        """Test that a crashed batch fails its job and releases the page."""
+
+        def crash(**kwargs):
+            raise RuntimeError("pool broken")
+
+        monkeypatch.setattr(callbacks, "convert_batch_to_zip", crash)
+        state.batch_content = [state.content]
+        with pytest.raises(RuntimeError, match="pool broken"):
+            callbacks.convert_batch_to_gif(state)
+        assert holds == ["Generating GIFs", None]
+        assert _jobs() == ({"failed": 1}, {})
+
+    def test_dispatch_failure_releases_page(self, callbacks, holds, state, monkeypatch):
+        """Test that a callback that can't be dispatched doesn't leave the page held."""
+
+        def fail_dispatch(*args):
+            raise RuntimeError("no thread left")
+
+        decorator_module = importlib.import_module("taipy_utilities.taipy_callback")
+        monkeypatch.setattr(decorator_module, "invoke_long_callback", fail_dispatch)
+        with pytest.raises(RuntimeError, match="no thread left"):
+            callbacks.convert_to_gif(state)
+        assert holds == ["Generating GIF", None]
+        assert ("e", "Unexpected error: no thread left") in state.notifications
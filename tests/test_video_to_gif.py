@@ -9,6 +9,7 @@ from src.algorithms.video_to_gif_functions import (
     _create_dir_if_not_exist,
     _get_clip_info,
     _validate_input_file,
+    get_parameter_error,
     video_to_gif,
 )
 from src.algorithms.video_to_gif_get_duration import get_clip_duration
@@ -66,6 +67,13 @@ class TestGetClipDuration:
             with pytest.raises(ValueError, match="Could not get duration"):
                 get_clip_duration(str(sample_video_file))
 
+    def test_duration_is_cached(self, sample_video_file, mock_probe_data):
+        """Test that the same file is probed only once."""
+        with patch("ffmpeg.probe", return_value=mock_probe_data) as mock_probe:
+            get_clip_duration(str(sample_video_file))
+            assert get_clip_duration(str(sample_video_file)) == 10.5
+        mock_probe.assert_called_once()
+
 
 class TestValidateInputFile:
     """Test input file validation."""
@@ -149,6 +157,15 @@ class TestGetClipInfo:
             result = _get_clip_info(str(sample_video_file))
             assert result["size"] == (1920, 1080)
 
+    def test_size_is_displayed_size(self, sample_video_file, mock_probe_data):
+        """Test that a quarter turn display matrix swaps width and height."""
+        mock_probe_data["streams"][0]["side_data_list"] = [
+            {"side_data_type": "Display Matrix", "rotation": -90}
+        ]
+        with patch("ffmpeg.probe", return_value=mock_probe_data):
+            result = _get_clip_info(str(sample_video_file))
+            assert result["size"] == (1080, 1920)
+
     def test_raises_on_ffmpeg_error(self, sample_video_file):
         """Test error handling when ffprobe fails."""
         mock_error = ffmpeg.Error("ffprobe", "", b"error")
@@ -164,6 +181,37 @@ class TestGetClipInfo:
                 _get_clip_info(str(sample_video_file))
 
 
+class TestGetParameterError:
+    """Test clip parameter validation."""
+
+    def test_valid_parameters(self):
+        """Test that valid parameters return no error."""
+        assert get_parameter_error(start_time=2, duration=3, clip_duration=10) is None
+
+    def test_duration_too_long(self):
+        """Test error when duration is longer than the clip."""
+        result = get_parameter_error(start_time=0, duration=12, clip_duration=10)
+        assert "Duration shouldn't be longer" in result
+
+    def test_start_after_end(self):
+        """Test error when start time is after the clip ends."""
+        result = get_parameter_error(start_time=11, duration=1, clip_duration=10)
+        assert "Start Time shouldn't be after" in result
+
+    def test_start_plus_duration_too_long(self):
+        """Test error when start time + duration overflows the clip."""
+        result = get_parameter_error(start_time=8, duration=3, clip_duration=10)
+        assert "Duration + Start Time" in result
+
+    def test_no_duration(self):
+        """Test that no duration runs until the end of the clip."""
+        assert (
+            get_parameter_error(start_time=4, duration=None, clip_duration=10) is None
+        )
+        result = get_parameter_error(start_time=11, duration=None, clip_duration=10)
+        assert "Start Time shouldn't be after" in result
+
+
 class TestCleanupFile:
     """Test temporary file cleanup."""
 
@@ -216,6 +264,16 @@ class TestVideoToGif:
         result = video_to_gif(str(sample_video_file), str(output_gif_path))
         assert result is False
 
+    @patch("src.algorithms.video_to_gif_functions._validate_input_file")
+    def test_logs_failure(
+        self, mock_validate, sample_video_file, output_gif_path, caplog
+    ):
+        """Test that a failed conversion is logged, not only traced."""
+        mock_validate.side_effect = FileNotFoundError("File not found")
+
+        video_to_gif(str(sample_video_file), str(output_gif_path))
+        assert "FileNotFoundError: File not found" in caplog.text
+
     @patch("src.algorithms.video_to_gif_functions._cleanup_file")
     @patch("src.algorithms.video_to_gif_functions._create_gif")
     @patch("src.algorithms.video_to_gif_functions._generate_palette")
@@ -0,0 +1,135 @@
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from src.algorithms.video_to_gif_batch import (
+    _unique_arcname,
+    convert_batch_to_zip,
+    convert_one,
+)
+
+
+class TestUniqueArcname:
+    """Test names of the GIFs inside the ZIP file."""
+
+    def test_uses_video_stem(self):
+        """Test that the GIF is named after the video."""
+        assert _unique_arcname("/uploads/clip.mp4", set()) == "clip.gif"
+
+    def test_deduplicates_names(self):
+        """Test that videos with the same name don't overwrite each other."""
+        arcnames = set()
+        _unique_arcname("/a/clip.mp4", arcnames)
+        assert _unique_arcname("/b/clip.avi", arcnames) == "clip_1.gif"
+
+
+class TestConvertOne:
+    """Test per-file probe, validation and conversion."""
+
+    @patch("src.algorithms.video_to_gif_batch.video_to_gif", return_value=True)
+    @patch("src.algorithms.video_to_gif_batch.get_clip_duration", return_value=10.0)
+    def test_success(self, mock_duration, mock_convert):
+        """Test that a valid file returns no error."""
+        result = convert_one("in.mp4", "out.gif", 0, 5, 10, 1.0)
+        assert result == ("out.gif", None)
+
+    @patch("src.algorithms.video_to_gif_batch.video_to_gif", return_value=True)
+    @patch("src.algorithms.video_to_gif_batch.get_clip_duration", return_value=10.0)
+    def test_no_duration(self, mock_duration, mock_convert):
+        """Test that no duration converts until the end of the clip."""
+        assert convert_one("in.mp4", "out.gif", 2, None, 10, 1.0) == ("out.gif", None)
+        assert mock_convert.call_args.kwargs["duration"] is None
+
+    @patch("src.algorithms.video_to_gif_batch.video_to_gif")
+    @patch("src.algorithms.video_to_gif_batch.get_clip_duration", return_value=3.0)
+    def test_invalid_parameters_skip_conversion(self, mock_duration, mock_convert):
+        """Test that parameters are validated against this file's duration."""
+        _, error = convert_one("in.mp4", "out.gif", 0, 5, 10, 1.0)
+        assert "Duration shouldn't be longer" in error
+        mock_convert.assert_not_called()
+
+    @patch(
+        "src.algorithms.video_to_gif_batch.get_clip_duration",
+        side_effect=ValueError("Could not get duration"),
+    )
+    def test_probe_error(self, mock_duration):
+        """Test that probe errors are reported for the file."""
+        _, error = convert_one("in.mp4", "out.gif", 0, 5, 10, 1.0)
+        assert error == "Could not get duration"
+
+    @patch("src.algorithms.video_to_gif_batch.video_to_gif", return_value=False)
+    @patch("src.algorithms.video_to_gif_batch.get_clip_duration", return_value=10.0)
+    def test_conversion_error(self, mock_duration, mock_convert):
+        """Test that a failed conversion is reported for the file."""
+        _, error = convert_one("in.mp4", "out.gif", 0, 5, 10, 1.0)
+        assert error == "GIF conversion failed."
+
+
+class TestConvertBatchToZip:
+    """Integration tests for batch conversion."""
+
+    def test_creates_zip_with_gifs(self, synthetic_video, tmp_path):
+        """Test that every valid video ends up in the ZIP file."""
+        video_copy = tmp_path / "synthetic.mp4"
+        shutil.copy(synthetic_video, video_copy)
+        zip_path = tmp_path / "batch.zip"
+        results = convert_batch_to_zip(
+            [str(synthetic_video), str(video_copy)],
+            str(zip_path),
+            duration=1,
+            fps=5,
+            backend="pyav",
+            max_workers=2,
+        )
+        assert list(results.values()) == [None, None]
+        with zipfile.ZipFile(zip_path) as archive:
+            assert sorted(archive.namelist()) == ["synthetic.gif", "synthetic_1.gif"]
+
+    def test_reports_invalid_files(self, synthetic_video, tmp_path):
+        """Test that invalid files are skipped and reported."""
+        invalid_video = tmp_path / "invalid.mp4"
+        invalid_video.write_bytes(b"not a video")
+        zip_path = tmp_path / "batch.zip"
+        results = convert_batch_to_zip(
+            [str(synthetic_video), str(invalid_video)],
+            str(zip_path),
+            duration=1,
+            fps=5,
+            backend="pyav",
+            max_workers=2,
+        )
+        assert results[str(synthetic_video)] is None
+        assert results[str(invalid_video)] is not None
+        with zipfile.ZipFile(zip_path) as archive:
+            assert archive.namelist() == ["synthetic.gif"]
+
+    def test_worker_exception(self, synthetic_video, tmp_path):
+        """Test that a worker's exception fails its file, not the batch."""
+        crashing = str(tmp_path / "crashing.mp4")
+        contexts = []
+
+        def pool(max_workers, mp_context):
+            contexts.append(mp_context.get_start_method())
+            return ThreadPoolExecutor(max_workers)
+
+        def convert(input_path, output_path, *args):
+            if input_path == crashing:
+                raise TypeError("boom")
+            Path(output_path).write_bytes(b"GIF89a")
+            return output_path, None
+
+        zip_path = tmp_path / "batch.zip"
+        with (
+            patch("src.algorithms.video_to_gif_batch.ProcessPoolExecutor", pool),
+            patch("src.algorithms.video_to_gif_batch.convert_one", convert),
+        ):
+            results = convert_batch_to_zip(
+                [str(synthetic_video), crashing], str(zip_path), max_workers=2
+            )
+        # Never forked from the threaded server
+        assert contexts == ["spawn"]
+        assert results == {str(synthetic_video): None, crashing: "TypeError: boom"}
+        with zipfile.ZipFile(zip_path) as archive:
+            assert archive.namelist() == ["synthetic.gif"]
@@ -0,0 +1,82 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.algorithms.video_to_gif_functions import (
+    _create_gif,
+    _generate_palette,
+    video_to_gif,
+)
+from src.algorithms.video_to_gif_presets import GIF_PRESETS, get_preset
+
+
+def _compiled_args(mock_run):
+    return " ".join(mock_run.call_args.args[0].compile())
+
+
+def _finished_process(mock_run):
+    mock_run.return_value.communicate.return_value = (b"", b"frame=    1")
+    mock_run.return_value.returncode = 0
+
+
+class TestGetPreset:
+    """Test preset lookup."""
+
+    @pytest.mark.parametrize("preset_name", ["fast", "balanced", "best"])
+    def test_known_presets(self, preset_name):
+        """Test that every documented preset exists."""
+        assert get_preset(preset_name) is GIF_PRESETS[preset_name]
+
+    def test_unknown_preset(self):
+        """Test that an unknown preset raises ValueError."""
+        with pytest.raises(ValueError, match="Unsupported GIF preset"):
+            get_preset("ultra")
+
+    def test_presets_share_keys(self):
+        """Test that all presets define the same settings."""
+        keys = {frozenset(preset) for preset in GIF_PRESETS.values()}
+        assert len(keys) == 1
+
+
+class TestPresetFilterGraph:
+    """Test that presets reach the ffmpeg filter graph."""
+
+    @patch("src.algorithms.video_to_gif_functions.ffmpeg.run_async")
+    def test_palette_uses_preset(self, mock_run):
+        """Test scaler, palette size and stats mode in palettegen."""
+        _finished_process(mock_run)
+        palette_path = _generate_palette("in.mp4", 0, 1, 0.5, GIF_PRESETS["fast"])
+        palette_path.unlink()
+        args = _compiled_args(mock_run)
+        assert "flags=fast_bilinear" in args
+        assert "max_colors=64" in args
+        assert "stats_mode=diff" in args
+
+    @patch("src.algorithms.video_to_gif_functions.ffmpeg.run_async")
+    def test_gif_uses_preset(self, mock_run, tmp_path):
+        """Test dithering settings in paletteuse."""
+        _finished_process(mock_run)
+        output_path = str(tmp_path / "out.gif")
+        _create_gif(
+            "in.mp4", output_path, 0, 1, 10, 0.5, Path("p.png"), GIF_PRESETS["fast"]
+        )
+        args = _compiled_args(mock_run)
+        assert "dither=bayer" in args
+        assert "bayer_scale=5" in args
+
+    @patch("src.algorithms.video_to_gif_functions.ffmpeg.run_async")
+    def test_best_preset_keeps_original_settings(self, mock_run):
+        """Test that "best" is the original lanczos/256/full combination."""
+        _finished_process(mock_run)
+        palette_path = _generate_palette("in.mp4", 0, 1, 0.5, GIF_PRESETS["best"])
+        palette_path.unlink()
+        args = _compiled_args(mock_run)
+        assert "flags=lanczos" in args
+        assert "max_colors=256" in args
+        assert "stats_mode=full" in args
+
+    @patch("src.algorithms.video_to_gif_functions._validate_input_file")
+    def test_unknown_preset_fails_conversion(self, mock_validate, tmp_path):
+        """Test that an unknown preset makes the conversion fail."""
+        assert not video_to_gif("in.mp4", str(tmp_path / "out.gif"), preset="ultra")
@@ -0,0 +1,150 @@
+from unittest.mock import patch
+
+import ffmpeg
+import pytest
+
+from src.algorithms import video_trim_functions
+from src.algorithms.video_trim_functions import (
+    _first_streams,
+    _joined_parameters,
+    _next_keyframe,
+    trim_video,
+)
+from tests.conftest import requires_ffmpeg
+
+
+def _probe_duration(video_path):
+    return float(ffmpeg.probe(str(video_path))["format"]["duration"])
+
+
+def _encode_with_audio(output_path, **codecs):
+    """Encode a 4 s test pattern, a keyframe per second, with a tone"""
+    video = ffmpeg.input("testsrc=size=160x120:rate=25:duration=4", format="lavfi")
+    audio = ffmpeg.input("sine=frequency=440:sample_rate=44100:duration=4", f="lavfi")
+    ffmpeg.run(
+        ffmpeg.output(video, audio, str(output_path), g=25, **codecs),
+        overwrite_output=True,
+        quiet=True,
+    )
+    return output_path
+
+
+@pytest.fixture(scope="module")
+def video_with_audio(tmp_path_factory):
+    """An H.264 Main profile video with AAC audio."""
+    output_path = tmp_path_factory.mktemp("videos") / "with_audio.mp4"
+    return _encode_with_audio(
+        output_path,
+        vcodec="libx264",
+        pix_fmt="yuv420p",
+        acodec="aac",
+        **{"profile:v": "main", "level:v": "3.0"},
+    )
+
+
+class TestTrimVideo:
+    """Test trim-only export."""
+
+    def test_rejects_unsupported_mode(self, tmp_path):
+        """Test that an unknown mode makes the trim fail."""
+        input_path = tmp_path / "input.mp4"
+        input_path.touch()
+        assert not trim_video(str(input_path), str(tmp_path / "out.mp4"), mode="x")
+
+    def test_fails_on_missing_file(self, tmp_path):
+        """Test that a missing input makes the trim fail."""
+        input_path = tmp_path / "missing.mp4"
+        assert not trim_video(str(input_path), str(tmp_path / "out.mp4"))
+
+    @patch("src.algorithms.video_trim_functions._stream_copy")
+    def test_keyframe_mode_uses_stream_copy(self, mock_copy, tmp_path):
+        """Test that keyframe mode only stream copies."""
+        input_path = tmp_path / "input.mp4"
+        input_path.touch()
+        output_path = str(tmp_path / "out.mp4")
+        assert trim_video(str(input_path), output_path, 1, 2)
+        mock_copy.assert_called_once_with(str(input_path), output_path, 1, 2)
+
+
+@requires_ffmpeg
+class TestTrimVideoIntegration:
+    """Integration tests with real ffmpeg binaries."""
+
+    def test_keyframe_mode_creates_clip(self, synthetic_video, tmp_path):
+        """Test that a clip is created with stream copy."""
+        output_path = tmp_path / "clip.mp4"
+        assert trim_video(str(synthetic_video), str(output_path), 0, 1)
+        assert _probe_duration(output_path) == pytest.approx(1, abs=0.1)
+
+    @pytest.mark.parametrize("mode", ["keyframe", "smart"])
+    def test_trims_until_end_without_duration(self, synthetic_video, tmp_path, mode):
+        """Test that no duration cuts until the end of the video."""
+        output_path = tmp_path / "clip.mp4"
+        assert trim_video(str(synthetic_video), str(output_path), 0.5, None, mode)
+        assert _probe_duration(output_path) >= 1.4
+
+    def test_smart_mode_fails_on_audio_only(self, tmp_path):
+        """Test that smart mode fails on a file without a video stream."""
+        source = tmp_path / "tone.m4a"
+        ffmpeg.run(
+            ffmpeg.output(
+                ffmpeg.input("sine=frequency=440:duration=2", f="lavfi"), str(source)
+            ),
+            quiet=True,
+        )
+        assert not trim_video(str(source), str(tmp_path / "clip.m4a"), 0.5, 1, "smart")
+
+    def test_keyframe_mode_snaps_to_keyframe(self, synthetic_video, tmp_path):
+        """Test that the clip never starts after start_time."""
+        output_path = tmp_path / "clip.mp4"
+        trim_video(str(synthetic_video), str(output_path), 0.7, 1)
+        assert _probe_duration(output_path) >= 1
+
+    def test_smart_mode_is_frame_accurate(self, synthetic_video, tmp_path):
+        """Test that smart mode starts at start_time."""
+        output_path = tmp_path / "clip.mp4"
+        assert trim_video(str(synthetic_video), str(output_path), 0.7, 1, "smart")
+        assert _probe_duration(output_path) == pytest.approx(1, abs=0.15)
+
+    def test_next_keyframe_after_start(self, synthetic_video):
+        """Test that the next keyframe is inside the requested range."""
+        keyframe = _next_keyframe(str(synthetic_video), 0.1, 2)
+        assert keyframe is None or 0.1 <= keyframe < 2
+
+    def test_smart_mode_matches_source_streams(self, video_with_audio, tmp_path):
+        """Test that the re-encoded head is joined with the source's parameters."""
+        output_path = tmp_path / "clip.mp4"
+        with patch.object(
+            video_trim_functions,
+            "_stream_copy",
+            wraps=video_trim_functions._stream_copy,
+        ) as mock_copy:
+            assert trim_video(str(video_with_audio), str(output_path), 0.5, 2, "smart")
+        # Only the tail was stream copied: the head was joined to it
+        assert str(output_path) not in [call.args[1] for call in mock_copy.mock_calls]
+        source = _first_streams(ffmpeg.probe(str(video_with_audio)))
+        clip = _first_streams(ffmpeg.probe(str(output_path)))
+        assert _joined_parameters(clip) == _joined_parameters(source)
+        # The copied tail ends on a packet boundary, B-frames included
+        assert float(clip["video"]["duration"]) == pytest.approx(2, abs=0.3)
+        _, errors = ffmpeg.run(
+            ffmpeg.output(ffmpeg.input(str(output_path)), "-", format="null"),
+            capture_stderr=True,
+            cmd=["ffmpeg", "-v", "error"],
+        )
+        assert errors == b""
+
+    def test_smart_mode_falls_back_to_keyframe(self, tmp_path):
+        """Test that streams without a matching encoder are cut at a keyframe."""
+        source = _encode_with_audio(
+            tmp_path / "pcm.avi", vcodec="mpeg4", acodec="pcm_s16le"
+        )
+        output_path = tmp_path / "clip.avi"
+        with patch.object(
+            video_trim_functions,
+            "_stream_copy",
+            wraps=video_trim_functions._stream_copy,
+        ) as mock_copy:
+            assert trim_video(str(source), str(output_path), 0.5, 2, "smart")
+        mock_copy.assert_called_once_with(str(source), str(output_path), 0.5, 2)
+        assert _probe_duration(output_path) >= 2